@@ -0,0 +1,217 @@
+"""
+FlowMe v3 - Microbenchmarks de détection
+Corpus français synthétique reproductible et mesures de latence/débit des détecteurs
+
+Usage:
+    python benchmarks/bench_detection.py --output bench.json
+    python benchmarks/bench_detection.py --compare bench.json --max-regression 1.25
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.detection_cascade import DetectionCascade
+from core.lexicon import EMOTION_KEYWORDS, INTENSITY_MODIFIERS, NEGATIONS
+from core.state_clusters import ClusteredStateIndex
+from core.states_table import FLOWME_64_STATES
+from flowme_states_detection import EnhancedEmotionDetection
+
+# Longueur des messages (en mots) par catégorie
+MESSAGE_SIZES = {"short": (4, 12), "medium": (25, 60), "long": (150, 400)}
+
+FILLER_WORDS = [
+    "je", "me", "sens", "suis", "aujourd'hui", "vraiment", "depuis", "ce", "matin", "avec",
+    "mon", "travail", "la", "famille", "et", "mais", "parce", "que", "tout", "semble",
+    "un", "une", "de", "des", "le", "les", "dans", "pour", "sur", "quand", "encore",
+    "il", "elle", "nous", "on", "fait", "cette", "semaine", "soir", "chose", "moment",
+]
+
+
+def build_vocabulary() -> Dict[str, List[str]]:
+    """Mots-clés des deux détecteurs, modificateurs et négations"""
+    keywords = {word for categories in EMOTION_KEYWORDS.values() for words in categories.values() for word in words}
+    for state in FLOWME_64_STATES.values():
+        keywords.add(state["mot_cle"].lower())
+        keywords.update(word for word in state["declencheurs"].lower().split() if len(word) > 3)
+    return {
+        "keywords": sorted(keywords),
+        "modifiers": sorted(INTENSITY_MODIFIERS),
+        "negations": sorted(NEGATIONS),
+    }
+
+
+def generate_corpus(
+    seed: int = 42,
+    per_size: int = 500,
+    keyword_density: float = 0.15,
+    negation_rate: float = 0.05,
+    modifier_rate: float = 0.08,
+) -> Dict[str, List[str]]:
+    """Corpus synthétique déterministe : mêmes paramètres, mêmes messages"""
+    rng = random.Random(seed)
+    vocabulary = build_vocabulary()
+    corpus = {}
+
+    for size, (min_words, max_words) in MESSAGE_SIZES.items():
+        messages = []
+        for _ in range(per_size):
+            words = []
+            for _ in range(rng.randint(min_words, max_words)):
+                draw = rng.random()
+                if draw < negation_rate:
+                    words.append(rng.choice(vocabulary["negations"]))
+                elif draw < negation_rate + modifier_rate:
+                    words.append(rng.choice(vocabulary["modifiers"]))
+                elif draw < negation_rate + modifier_rate + keyword_density:
+                    words.append(rng.choice(vocabulary["keywords"]))
+                else:
+                    words.append(rng.choice(FILLER_WORDS))
+            message = " ".join(words)
+            messages.append(message[0].upper() + message[1:] + rng.choice([".", "!", "...", " ?"]))
+        corpus[size] = messages
+
+    return corpus
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(target: Callable[[str], Any], messages: List[str], repeat: int, warmup: int) -> Dict[str, float]:
+    """Latences par message (µs) et débit d'une cible sur une liste de messages"""
+    for message in messages[:warmup]:
+        target(message)
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            t0 = time.perf_counter()
+            target(message)
+            latencies.append((time.perf_counter() - t0) * 1e6)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "messages": len(latencies),
+        "p50_us": round(percentile(latencies, 0.50), 2),
+        "p99_us": round(percentile(latencies, 0.99), 2),
+        "mean_us": round(statistics.fmean(latencies), 2),
+        "max_us": round(latencies[-1], 2),
+        "throughput_msg_s": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def build_targets() -> Dict[str, Callable[[str], Any]]:
+    """Cibles mesurées, hors cache de détection pour mesurer le calcul lui-même"""
+    from core.states_detection import Enhanced64StatesDetection
+
+    # Les logs d'initialisation des détecteurs faussent les mesures
+    logging.getLogger().setLevel(logging.WARNING)
+    states_detector = Enhanced64StatesDetection("benchmark")
+    cascade = DetectionCascade(states_detector.score, states_detector.tfidf.score)
+    clusters = ClusteredStateIndex(states_detector.index, states_detector.states)
+    emotion_detector = EnhancedEmotionDetection(FLOWME_64_STATES)
+    return {
+        "64_states.detect_emotion": states_detector._detect_uncached,
+        "64_states.tfidf": states_detector.tfidf.detect_emotion,
+        "64_states.cascade": lambda text: cascade.detect(text)[0],
+        "64_states.hierarchical": clusters.score,
+        "emotions.detect_emotion": emotion_detector._detect_uncached,
+        "emotions.get_emotion_confidence": emotion_detector.get_emotion_confidence,
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    corpus = generate_corpus(args.seed, args.per_size, args.keyword_density, args.negation_rate, args.modifier_rate)
+    targets = build_targets()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, target in targets.items():
+        results[name] = {
+            size: measure(target, messages, args.repeat, args.warmup)
+            for size, messages in corpus.items()
+        }
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus": {
+                "seed": args.seed,
+                "per_size": args.per_size,
+                "keyword_density": args.keyword_density,
+                "negation_rate": args.negation_rate,
+                "modifier_rate": args.modifier_rate,
+                "sizes": MESSAGE_SIZES,
+            },
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Liste des régressions de p50/p99 au-delà du ratio toléré"""
+    regressions = []
+    for name, sizes in current["results"].items():
+        for size, metrics in sizes.items():
+            previous = baseline.get("results", {}).get(name, {}).get(size)
+            if not previous:
+                continue
+            for metric in ("p50_us", "p99_us"):
+                if previous[metric] > 0 and metrics[metric] / previous[metric] > max_regression:
+                    regressions.append(
+                        f"{name} [{size}] {metric}: {previous[metric]} -> {metrics[metric]} "
+                        f"(x{metrics[metric] / previous[metric]:.2f})"
+                    )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks des détecteurs FlowMe")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--per-size", type=int, default=500, help="Messages par catégorie de taille")
+    parser.add_argument("--keyword-density", type=float, default=0.15)
+    parser.add_argument("--negation-rate", type=float, default=0.05)
+    parser.add_argument("--modifier-rate", type=float, default=0.08)
+    parser.add_argument("--repeat", type=int, default=3, help="Passes sur le corpus")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--output", help="Fichier JSON de résultats (défaut: stdout)")
+    parser.add_argument("--compare", help="Résultats JSON de référence")
+    parser.add_argument("--max-regression", type=float, default=1.25, help="Ratio maximal toléré sur p50/p99")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"⚠️ Régression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+FlowMe v3 - Classification hors ligne
+Applique les détecteurs FlowMe à un flux NDJSON ou CSV sans passer par l'API web
+
+Usage:
+    python classify.py journal.ndjson --detector both --workers 8 > resultats.ndjson
+    cat export.csv | python classify.py --format csv --field texte
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("flowme.classify")
+
+# Détecteurs propres à chaque processus worker
+_worker_detectors: Dict[str, Any] = {}
+
+
+def _init_worker(detector: str):
+    """Construit une seule fois les détecteurs dans chaque worker (sans importer l'application web)"""
+    from core.states_detection import Enhanced64StatesDetection
+    from core.states_table import FLOWME_64_STATES
+    from flowme_states_detection import EnhancedEmotionDetection
+
+    logging.getLogger().setLevel(logging.WARNING)
+    if detector in ("64", "both"):
+        _worker_detectors["64"] = Enhanced64StatesDetection("classification_hors_ligne")
+    if detector in ("emotions", "both"):
+        _worker_detectors["emotions"] = EnhancedEmotionDetection(FLOWME_64_STATES)
+
+
+def _classify_chunk(chunk: List[Tuple[int, Any, str, Optional[str]]]) -> List[Dict[str, Any]]:
+    """Classe un lot de messages ; le détecteur 64 états est appliqué en mode matriciel"""
+    records = [{"index": index, "id": record_id} for index, record_id, _, _ in chunk]
+    # Lignes invalides : un enregistrement d'erreur à leur place, hors des détecteurs
+    for record, (_, _, _, error) in zip(records, chunk):
+        if error:
+            record["error"] = error
+    valid = [(record, text) for record, (_, _, text, error) in zip(records, chunk) if not error]
+    results = [record for record, _ in valid]
+    texts = [text for _, text in valid]
+
+    states_64 = _worker_detectors.get("64")
+    if states_64:
+        for result, detection in zip(results, states_64.detect_batch(texts, top_k=1)):
+            result["state_64"] = detection["detected_state"]
+
+    emotions = _worker_detectors.get("emotions")
+    if emotions:
+        for result, text in zip(results, texts):
+            result["emotion"] = emotions.detect_emotion(text)
+
+    return records
+
+
+def read_messages(
+    stream: Iterable[str], input_format: str, field: str, id_field: Optional[str]
+) -> Iterator[Tuple[int, Any, str, Optional[str]]]:
+    """
+    Générateur (index, identifiant, message, erreur) sur l'entrée, ligne par
+    ligne. Une ligne NDJSON vide ou invalide donne une erreur au lieu d'être
+    sautée : la sortie garde une ligne par ligne d'entrée.
+    """
+    if input_format == "csv":
+        for index, row in enumerate(csv.DictReader(stream)):
+            yield index, row.get(id_field) if id_field else None, row.get(field) or "", None
+        return
+
+    for index, line in enumerate(stream):
+        line = line.strip()
+        if not line:
+            yield index, None, "", "Ligne vide"
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Ligne {index + 1} invalide: {e}")
+            yield index, None, "", f"JSON invalide: {e}"
+            continue
+        if isinstance(record, dict):
+            yield index, record.get(id_field) if id_field else None, str(record.get(field) or ""), None
+        else:
+            yield index, None, str(record), None
+
+
+def chunked(
+    items: Iterator[Tuple[int, Any, str, Optional[str]]], size: int
+) -> Iterator[List[Tuple[int, Any, str, Optional[str]]]]:
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def classify_stream(
+    messages: Iterator[Tuple[int, Any, str, Optional[str]]],
+    detector: str = "both",
+    workers: Optional[int] = None,
+    chunk_size: int = 512,
+    max_pending: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Répartit les lots sur un pool de processus et restitue les résultats dans
+    l'ordre d'entrée. Le nombre de lots en vol est borné, la mémoire reste donc
+    constante quelle que soit la taille de l'entrée.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(detector,)) as pool:
+        pending = deque()
+        for chunk in chunked(messages, chunk_size):
+            pending.append(pool.submit(_classify_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Classification FlowMe hors ligne (NDJSON/CSV)")
+    parser.add_argument("input", nargs="?", default="-", help="Fichier d'entrée (défaut: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Fichier de sortie NDJSON (défaut: stdout)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="Format d'entrée (déduit de l'extension sinon)")
+    parser.add_argument("--field", default="message", help="Champ contenant le message")
+    parser.add_argument("--id-field", help="Champ identifiant recopié dans la sortie")
+    parser.add_argument("--detector", choices=["64", "emotions", "both"], default="both")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut: nombre de cœurs)")
+    parser.add_argument("--chunk-size", type=int, default=512, help="Messages par lot envoyé à un worker")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    input_format = args.format or ("csv" if args.input.endswith(".csv") else "ndjson")
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    count = 0
+    try:
+        messages = read_messages(source, input_format, args.field, args.id_field)
+        for result in classify_stream(messages, args.detector, args.workers, args.chunk_size):
+            target.write(json.dumps(result, ensure_ascii=False) + "\n")
+            count += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    logger.info(f"✅ {count} messages classés")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Automate Aho-Corasick pour la détection FlowMe
+Recherche simultanée de tous les motifs d'un lexique en une seule passe
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasickAutomaton:
+    """
+    Automate multi-motifs : le coût d'une recherche est linéaire en la
+    longueur du texte (plus le nombre d'occurrences), quelle que soit la
+    taille du lexique.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self.pattern_ids: Dict[str, int] = {}
+        # Transitions, liens d'échec et sorties (identifiants de motifs) par nœud
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[Tuple[int, ...]] = [()]
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _add(self, pattern: str):
+        if not pattern or pattern in self.pattern_ids:
+            return
+        pid = len(self.patterns)
+        self.pattern_ids[pattern] = pid
+        self.patterns.append(pattern)
+
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+            node = next_node
+        self._outputs[node] += (pid,)
+
+    def _link(self):
+        """Calcule les liens d'échec en largeur et fusionne les sorties"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] += self._outputs[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Génère (position de début, identifiant du motif) pour chaque occurrence"""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        patterns = self.patterns
+
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pid in outputs[node]:
+                yield position - len(patterns[pid]) + 1, pid
@@ -0,0 +1,269 @@
+"""
+Artefact compilé FlowMe (table d'états et lexiques)
+Étape de build optionnelle qui pré-compile les index de détection
+
+Mesuré sur les tables actuelles : ~30 ms pour construire les détecteurs depuis
+l'artefact contre ~70 ms sans (~120 ms avec FLOWME_FUZZY_LOOKUP=on), pour un
+fichier de ~1,8 Mo. Le gain est négligeable devant le démarrage de l'application,
+l'étape n'est donc pas dans le build Render ; sans artefact, tout est compilé au démarrage.
+
+Usage:
+    python -m core.artifact build [--output build/flowme_compiled.pkl]
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import pickle
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_MAGIC = b"FLOWME-ARTIFACT\n"
+DEFAULT_ARTIFACT_PATH = os.getenv(
+    "FLOWME_ARTIFACT_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "build", "flowme_compiled.pkl")
+)
+
+
+# Modules dont les classes sont sérialisées dans l'artefact (ou qui les construisent) :
+# leur code source fait partie de l'empreinte, un artefact construit avant une
+# modification du code est donc périmé au lieu de ramener d'anciens objets
+COMPILED_MODULES = (
+    "core.aho_corasick",
+    "core.batch_scorer",
+    "core.fuzzy_lexicon",
+    "core.message",
+    "core.scope_engine",
+    "core.state_index",
+    "core.tfidf_detector",
+    "flowme_states_detection",
+)
+
+_code_hash: Optional[str] = None
+
+
+def code_hash() -> str:
+    """Empreinte SHA-256 du code source des modules compilés (calculée une fois par processus)"""
+    global _code_hash
+    if _code_hash is None:
+        digest = hashlib.sha256()
+        for module in COMPILED_MODULES:
+            with open(importlib.util.find_spec(module).origin, "rb") as f:
+                digest.update(module.encode("utf-8") + b"\0" + f.read() + b"\0")
+        _code_hash = digest.hexdigest()
+    return _code_hash
+
+
+def source_hash(sources: Sequence[Any]) -> str:
+    """Empreinte SHA-256 des données sources d'une structure compilée et du code qui la construit"""
+    payload = json.dumps([code_hash(), list(sources)], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compile_states(states: Dict[str, Dict[str, Any]]) -> Tuple[Any, Any]:
+    """Index inversé et matrice de scoring des 64 états"""
+    from core.state_index import StateInvertedIndex
+    from core.batch_scorer import BatchStateScorer
+
+    index = StateInvertedIndex(states)
+    return index, BatchStateScorer(index)
+
+
+def compile_tfidf(states: Dict[str, Dict[str, Any]]) -> Any:
+    """Détecteur TF-IDF de n-grammes de caractères sur les 64 états"""
+    from core.tfidf_detector import NgramTfidfDetector
+
+    return NgramTfidfDetector(states)
+
+
+def tfidf_sources(states: Dict[str, Dict[str, Any]]) -> Tuple[Any, ...]:
+    from core.tfidf_detector import DEFAULT_NGRAM_RANGE, STOP_WORDS
+
+    return states, list(DEFAULT_NGRAM_RANGE), sorted(STOP_WORDS)
+
+
+# Les sources couvrent aussi les constantes et réglages d'environnement qui façonnent
+# les structures compilées : les modifier rend l'artefact périmé au lieu d'être ignoré
+
+def fuzzy_config(enabled: bool) -> Dict[str, Any]:
+    """Réglages de l'index de suppressions (sérialisé dans les structures compilées)"""
+    from core.fuzzy_lexicon import MAX_EDIT_DISTANCE, MIN_FUZZY_LENGTH, TWO_EDITS_LENGTH
+
+    return {
+        "enabled": enabled,
+        "max_distance": MAX_EDIT_DISTANCE,
+        "min_fuzzy_length": MIN_FUZZY_LENGTH,
+        "two_edits_length": TWO_EDITS_LENGTH
+    }
+
+
+def states_sources(states: Dict[str, Dict[str, Any]]) -> Tuple[Any, ...]:
+    from core.fuzzy_lexicon import FUZZY_MODE
+    from core.state_index import (
+        DECLENCHEUR_WEIGHT, FAMILLE_WEIGHT, MOT_CLE_WEIGHT, TENSION_WEIGHT, THEMATIC_RULES, THEMATIC_WEIGHT
+    )
+
+    weights = [MOT_CLE_WEIGHT, DECLENCHEUR_WEIGHT, FAMILLE_WEIGHT, TENSION_WEIGHT, THEMATIC_WEIGHT]
+    return states, weights, THEMATIC_RULES, fuzzy_config(FUZZY_MODE == "on")
+
+
+def emotion_sources(
+    emotion_keywords: Dict[str, Dict[str, Any]],
+    intensity_modifiers: Dict[str, float],
+    negations: Sequence[str],
+    fuzzy: bool
+) -> Tuple[Any, ...]:
+    from core.lexicon import CATEGORY_WEIGHTS
+
+    return emotion_keywords, intensity_modifiers, negations, CATEGORY_WEIGHTS, fuzzy_config(fuzzy)
+
+
+class CompiledArtifact:
+    """
+    Fichier d'artefact : un en-tête JSON (version de Python, empreinte du
+    contenu, empreintes des sources et du code) suivi des structures
+    compilées sérialisées. Toute incohérence rend l'artefact inutilisable et
+    les détecteurs recompilent à partir des sources.
+    """
+
+    def __init__(self, path: str = DEFAULT_ARTIFACT_PATH):
+        self.path = path
+        self.status = "non chargé"
+        self.load_time = 0.0
+        self._entries: Optional[Dict[str, Tuple[str, Any]]] = None
+        self.hits = 0
+        self.fallbacks = 0
+
+    def _load(self):
+        self._entries = {}
+        start = time.perf_counter()
+        try:
+            with open(self.path, "rb") as f:
+                if f.readline() != ARTIFACT_MAGIC:
+                    self.status = "format inconnu"
+                    return
+                header = json.loads(f.readline())
+                payload = f.read()
+        except FileNotFoundError:
+            self.status = "absent"
+            return
+        except (OSError, ValueError) as e:
+            self.status = f"illisible: {e}"
+            return
+
+        if header.get("python") != list(sys.version_info[:2]):
+            self.status = "version de Python différente"
+        elif hashlib.sha256(payload).hexdigest() != header.get("payload_sha256"):
+            self.status = "empreinte du contenu invalide"
+        else:
+            try:
+                self._entries = pickle.loads(payload)
+                self.status = "chargé"
+            except Exception as e:
+                self.status = f"désérialisation impossible: {e}"
+
+        self.load_time = time.perf_counter() - start
+        if self.status == "chargé":
+            logger.info(f"📦 Artefact compilé chargé en {self.load_time * 1000:.1f} ms: {self.path}")
+        else:
+            logger.warning(f"⚠️ Artefact compilé ignoré ({self.status}): {self.path}")
+
+    def get(self, name: str, expected_hash: str) -> Optional[Any]:
+        """Structure compilée si l'artefact contient une version à jour, sinon None"""
+        if self._entries is None:
+            self._load()
+
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != expected_hash:
+            if entry is not None:
+                logger.warning(f"⚠️ Artefact périmé pour '{name}' (sources ou code modifiés)")
+            self.fallbacks += 1
+            return None
+
+        self.hits += 1
+        return entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "status": self.status,
+            "load_time_ms": round(self.load_time * 1000, 2),
+            "hits": self.hits,
+            "fallbacks": self.fallbacks
+        }
+
+
+# Instance globale, chargée paresseusement au premier détecteur construit
+compiled_artifact = CompiledArtifact()
+
+
+def load_or_build(name: str, sources: Sequence[Any], builder: Callable[[], Any]) -> Any:
+    """Récupère une structure compilée de l'artefact, ou la reconstruit si absente ou périmée"""
+    compiled = compiled_artifact.get(name, source_hash(sources))
+    if compiled is None:
+        compiled = builder()
+    return compiled
+
+
+def build_entries() -> Dict[str, Tuple[str, Any]]:
+    """Compile toutes les structures de détection à partir des sources du dépôt"""
+    from core.fuzzy_lexicon import FUZZY_MODE
+    from core.lexicon import EMOTION_KEYWORDS, INTENSITY_MODIFIERS, NEGATIONS
+    from core.states_table import FLOWME_64_STATES
+    from flowme_states_detection import compile_emotion_lexicon
+
+    lexicon = (EMOTION_KEYWORDS, INTENSITY_MODIFIERS, NEGATIONS, FUZZY_MODE == "on")
+    return {
+        "states_64": (source_hash(states_sources(FLOWME_64_STATES)), compile_states(FLOWME_64_STATES)),
+        "states_tfidf": (source_hash(tfidf_sources(FLOWME_64_STATES)), compile_tfidf(FLOWME_64_STATES)),
+        "emotion_lexicon": (source_hash(emotion_sources(*lexicon)), compile_emotion_lexicon(*lexicon)),
+    }
+
+
+def build_artifact(path: str = DEFAULT_ARTIFACT_PATH) -> Dict[str, Any]:
+    """Écrit l'artefact compilé et retourne son en-tête"""
+    entries = build_entries()
+    payload = pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL)
+    header = {
+        "python": list(sys.version_info[:2]),
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "payload_sha256": hashlib.sha256(payload).hexdigest(),
+        "code_sha256": code_hash(),
+        "sources": {name: entry[0] for name, entry in entries.items()}
+    }
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(ARTIFACT_MAGIC)
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return header
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build de l'artefact compilé FlowMe")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--output", default=DEFAULT_ARTIFACT_PATH, help="Chemin de l'artefact")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+    header = build_artifact(args.output)
+    logger.info(
+        f"✅ Artefact compilé écrit en {(time.perf_counter() - start) * 1000:.1f} ms: "
+        f"{args.output} ({os.path.getsize(args.output)} octets, {len(header['sources'])} structures)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
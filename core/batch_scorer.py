@@ -0,0 +1,115 @@
+"""
+Scoring vectorisé des 64 états FlowMe
+Forme matricielle de l'index inversé pour classer des lots de messages
+"""
+
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from core.scoring import ScoreVector
+from core.state_index import StateInvertedIndex, THEMATIC_WEIGHT
+
+logger = logging.getLogger(__name__)
+
+
+class BatchStateScorer:
+    """
+    Matrice de poids (motifs x états) dérivée de l'index inversé.
+
+    Un lot de N messages est converti en matrice de présence des motifs
+    (N x motifs), puis scoré par un produit matriciel par tranche. Les règles
+    thématiques passent par une seconde matrice (motifs x règles) : une règle
+    est déclenchée dès qu'un de ses motifs est présent.
+
+    L'essentiel du coût est la recherche des motifs dans les mots : elle est
+    faite une seule fois par mot distinct du lot, les messages ne font ensuite
+    que des accès au dictionnaire des mots déjà vus.
+    """
+
+    def __init__(self, index: StateInvertedIndex, chunk_size: int = 2048):
+        self.index = index
+        self.state_names = index.state_names
+        self.chunk_size = chunk_size
+
+        n_patterns = len(index.patterns)
+        n_states = len(index.state_names)
+        n_rules = len(index.rule_states)
+
+        # float32 : produits matriciels BLAS, exacts pour ces petits entiers
+        self.weights = np.zeros((n_patterns, n_states), dtype=np.float32)
+        self.rule_triggers = np.zeros((n_patterns, n_rules), dtype=np.float32)
+        for pid in range(n_patterns):
+            for state_idx, weight in index.postings[pid]:
+                self.weights[pid, state_idx] = weight
+            for rule_idx in index.pattern_rules[pid]:
+                self.rule_triggers[pid, rule_idx] = 1
+
+        self.rule_bonus = np.zeros((n_rules, n_states), dtype=np.float32)
+        for rule_idx, state_indices in enumerate(index.rule_states):
+            self.rule_bonus[rule_idx, state_indices] = THEMATIC_WEIGHT
+
+        logger.info(f"🧮 Matrice de scoring construite: {n_patterns} motifs x {n_states} états")
+
+    def hit_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """Matrice (N x motifs) de présence des motifs dans chaque message (même sémantique que index.match)"""
+        match_token = self.index.match_token
+        phrase_patterns = self.index.phrase_patterns
+        # Motifs de chaque mot distinct du lot, cherchés une seule fois
+        word_hits: Dict[str, List[int]] = {}
+        rows: List[int] = []
+        columns: List[int] = []
+        for row, text in enumerate(texts):
+            folded = text.casefold()
+            pids = set()
+            for word in folded.split():
+                found = word_hits.get(word)
+                if found is None:
+                    found = word_hits[word] = match_token(word)
+                pids.update(found)
+            for phrase, pid in phrase_patterns:
+                if phrase in folded:
+                    pids.add(pid)
+            rows.extend([row] * len(pids))
+            columns.extend(pids)
+
+        hits = np.zeros((len(texts), len(self.index.patterns)), dtype=np.float32)
+        hits[rows, columns] = 1
+        return hits
+
+    def score_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """Matrice (N x 64) des scores, identique à StateInvertedIndex.score ligne par ligne"""
+        if not texts:
+            return np.zeros((0, len(self.state_names)), dtype=np.int32)
+
+        blocks = []
+        for offset in range(0, len(texts), self.chunk_size):
+            hits = self.hit_matrix(texts[offset:offset + self.chunk_size])
+            triggered = (hits @ self.rule_triggers > 0).astype(np.float32)
+            blocks.append((hits @ self.weights + triggered @ self.rule_bonus).astype(np.int32))
+        return np.vstack(blocks)
+
+    def score_vectors(self, texts: Sequence[str]) -> List[ScoreVector]:
+        """Un ScoreVector par message, à partir de la matrice de scores"""
+        labels = tuple(self.state_names)
+        return [ScoreVector(labels, tuple(int(score) for score in row)) for row in self.score_matrix(texts)]
+
+    def top_k(self, texts: Sequence[str], k: int = 3) -> List[List[Tuple[str, int]]]:
+        """
+        Top-k états (score > 0) par message, via un tri stable des lignes :
+        les égalités sont départagées par l'ordre de la table, comme detect_emotion.
+        """
+        scores = self.score_matrix(texts)
+        if scores.shape[0] == 0:
+            return []
+
+        k = max(1, min(k, scores.shape[1]))
+        ordered = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        top_scores = np.take_along_axis(scores, ordered, axis=1)
+
+        names = self.state_names
+        return [
+            [(names[state_idx], score) for state_idx, score in zip(row_states, row_scores) if score > 0]
+            for row_states, row_scores in zip(ordered.tolist(), top_scores.tolist())
+        ]
@@ -0,0 +1,84 @@
+"""
+Cache LRU des résultats de détection FlowMe
+Évite de recalculer la détection pour les messages répétés
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+from core.message import MessageLike, NormalizedMessage, as_message
+
+
+def fingerprint(*objects: Any) -> str:
+    """Empreinte courte et stable de structures JSON (table d'états, lexiques)"""
+    payload = json.dumps(objects, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class DetectionCache:
+    """
+    Cache LRU borné, partagé par les détecteurs.
+
+    La clé associe le message normalisé au jeton de version du détecteur :
+    un rechargement de la table d'états change la version, les anciennes
+    entrées ne sont plus atteintes et sortent du cache par éviction.
+    La clé est exactement la forme que scorent les détecteurs (texte
+    casefold, accents et espaces conservés) : un résultat en cache ne dépend
+    jamais de la variante du message arrivée en premier.
+    """
+
+    def __init__(self, max_size: int = 2048):
+        self.max_size = max_size
+        self._entries: "OrderedDict[tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(
+        self, message: MessageLike, version: str, compute: Callable[[NormalizedMessage], Any]
+    ) -> Any:
+        # La clé réutilise la forme casefold déjà calculée pour le message
+        message = as_message(message)
+        key = (version, message.folded)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = compute(message)
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Instance globale partagée par les détecteurs
+detection_cache = DetectionCache(int(os.getenv("DETECTION_CACHE_SIZE", "2048")))
@@ -0,0 +1,127 @@
+"""
+Détection en cascade des 64 états FlowMe
+Passe lexicale rapide d'abord, scorer TF-IDF seulement quand elle est incertaine
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+from core.message import MessageLike, as_message
+from core.scoring import ScoreVector
+
+# "on" active la cascade dans /chat (désactivée par défaut : mêmes résultats que la seule passe lexicale)
+CASCADE_MODE = os.getenv("FLOWME_CASCADE", "off")
+# Écart minimal entre le premier et le deuxième score lexical pour répondre sans escalade
+CASCADE_MIN_MARGIN = float(os.getenv("FLOWME_CASCADE_MIN_MARGIN", "2"))
+# Score lexical minimal pour répondre sans escalade
+CASCADE_MIN_SCORE = float(os.getenv("FLOWME_CASCADE_MIN_SCORE", "1"))
+# Similarité TF-IDF minimale pour remplacer le défaut d'un message sans aucun score lexical
+CASCADE_MIN_SIMILARITY = float(os.getenv("FLOWME_CASCADE_MIN_SIMILARITY", "0.15"))
+
+
+def _percentile(latencies: Deque[float], fraction: float) -> float:
+    if not latencies:
+        return 0.0
+    ordered = sorted(latencies)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 3)
+
+
+class DetectionCascade:
+    """
+    Deux étages :
+
+    1. passe lexicale (index inversé) : si le meilleur score atteint
+       `min_score` et dépasse le deuxième d'au moins `min_margin`, l'état est
+       retenu tel quel ;
+    2. sinon, escalade vers le scorer TF-IDF de n-grammes de caractères :
+       - égalité ou faible écart : l'état retenu est, parmi les candidats
+         lexicaux à moins de `min_margin` du meilleur, celui que le TF-IDF
+         score le plus haut ;
+       - aucun score lexical : l'état TF-IDF au lieu du défaut "Présence",
+         s'il atteint `min_similarity`.
+       Sinon le résultat lexical est gardé.
+
+    Le taux d'escalade et la latence de chaque étage sont mesurés sur les
+    détections servies (pas sur les recalculs du mode shadow).
+    """
+
+    def __init__(
+        self,
+        fast: Callable[[MessageLike], ScoreVector],
+        slow: Callable[[MessageLike], ScoreVector],
+        min_margin: float = CASCADE_MIN_MARGIN,
+        min_score: float = CASCADE_MIN_SCORE,
+        min_similarity: float = CASCADE_MIN_SIMILARITY
+    ):
+        self.fast = fast
+        self.slow = slow
+        self.min_margin = min_margin
+        self.min_score = min_score
+        self.min_similarity = min_similarity
+        self._lock = threading.Lock()
+        self.counts = {"messages": 0, "escalated": 0, "escalated_zero": 0, "escalation_changed": 0}
+        self.latencies: Dict[str, Deque[float]] = {"fast": deque(maxlen=2000), "slow": deque(maxlen=2000)}
+
+    def candidates(self, vector: ScoreVector) -> List[str]:
+        """États lexicaux à moins de `min_margin` du meilleur score"""
+        best = vector.max_score
+        return [label for label, score in zip(vector.labels, vector.scores) if score > 0 and best - score < self.min_margin]
+
+    def detect(self, text: MessageLike, record: bool = True) -> Tuple[str, str]:
+        """État retenu et étage qui l'a décidé ("fast" ou "slow") ; `record=False` n'alimente pas les mesures"""
+        message = as_message(text)
+
+        start = time.perf_counter()
+        vector = self.fast(message)
+        fast_latency = time.perf_counter() - start
+
+        best = vector.max_score
+        if best >= self.min_score and vector.margin >= self.min_margin:
+            if not record:
+                return vector.primary, "fast"
+            with self._lock:
+                self.counts["messages"] += 1
+                self.latencies["fast"].append(fast_latency)
+            return vector.primary, "fast"
+
+        start = time.perf_counter()
+        refined = self.slow(message)
+        slow_latency = time.perf_counter() - start
+
+        state = vector.primary
+        if refined.max_score > 0:
+            if best > 0:
+                scores = refined.as_dict()
+                # Ordre du détecteur lexical en cas d'égalité TF-IDF
+                state = max(self.candidates(vector), key=lambda label: scores.get(label, 0))
+            elif refined.max_score >= self.min_similarity:
+                state = refined.primary
+
+        if not record:
+            return state, "slow"
+        with self._lock:
+            self.counts["messages"] += 1
+            self.counts["escalated"] += 1
+            self.counts["escalated_zero"] += best <= 0
+            self.counts["escalation_changed"] += state != vector.primary
+            self.latencies["fast"].append(fast_latency)
+            self.latencies["slow"].append(slow_latency)
+        return state, "slow"
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            messages = self.counts["messages"]
+            return {
+                **self.counts,
+                "min_margin": self.min_margin,
+                "min_score": self.min_score,
+                "min_similarity": self.min_similarity,
+                "escalation_rate": round(self.counts["escalated"] / messages, 4) if messages else 0.0,
+                "fast_p50_ms": _percentile(self.latencies["fast"], 0.50),
+                "fast_p99_ms": _percentile(self.latencies["fast"], 0.99),
+                "slow_p50_ms": _percentile(self.latencies["slow"], 0.50),
+                "slow_p99_ms": _percentile(self.latencies["slow"], 0.99)
+            }
@@ -0,0 +1,126 @@
+"""
+Exécution hors boucle d'événements de la détection FlowMe
+Les messages longs sont détectés dans un pool borné, avec un délai maximal et un résultat de repli
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Taille (en caractères) à partir de laquelle la détection quitte la boucle d'événements
+OFFLOOP_MIN_CHARS = int(os.getenv("DETECTION_OFFLOOP_MIN_CHARS", "2000"))
+# Délai d'une détection hors boucle avant repli : temps réel écoulé (attente du pool et du GIL comprise),
+# pas temps CPU du calcul
+DETECTION_DEADLINE_MS = int(os.getenv("DETECTION_DEADLINE_MS", "150"))
+DETECTION_WORKERS = int(os.getenv("DETECTION_WORKERS", "2"))
+# Détections en attente au-delà desquelles le repli est immédiat
+DETECTION_MAX_PENDING = int(os.getenv("DETECTION_MAX_PENDING", "32"))
+
+
+class OffloopDetectionExecutor:
+    """
+    Les petits messages sont détectés directement (plus rapide qu'un
+    aller-retour vers un thread). Au-delà de `min_chars`, la détection part
+    dans un pool de threads borné et la requête l'attend au plus `deadline`
+    secondes : au-delà, elle repart avec le résultat de repli. Le délai est
+    mesuré en temps réel depuis la soumission : l'attente d'un worker libre
+    et du GIL en fait partie, c'est une borne de latence de la requête et
+    non un budget de temps CPU. Le calcul
+    n'est pas interrompu (un thread ne s'annule pas) et termine en
+    arrière-plan, ce qui remplit le cache de détection pour les envois
+    suivants du même message. Pool saturé : repli immédiat.
+    """
+
+    def __init__(
+        self,
+        min_chars: int = OFFLOOP_MIN_CHARS,
+        deadline_ms: int = DETECTION_DEADLINE_MS,
+        max_workers: int = DETECTION_WORKERS,
+        max_pending: int = DETECTION_MAX_PENDING
+    ):
+        self.min_chars = min_chars
+        self.deadline = deadline_ms / 1000
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="flowme-detect")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.counts = {"inline": 0, "offloop": 0, "fallback": 0, "saturated": 0}
+        self.offloop_latencies: Deque[float] = deque(maxlen=2000)
+
+    async def run(self, size: int, compute: Callable[[], T], fallback: Callable[[], T]) -> Tuple[T, str]:
+        """Résultat et chemin suivi : "inline", "offloop", "fallback" (délai dépassé) ou "saturated" """
+        if size < self.min_chars:
+            self.counts["inline"] += 1
+            return compute(), "inline"
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.counts["saturated"] += 1
+                saturated = True
+            else:
+                self._pending += 1
+                saturated = False
+        if saturated:
+            return fallback(), "saturated"
+
+        start = time.perf_counter()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, self._tracked, compute)
+        except RuntimeError:
+            # Pool arrêté (fin d'application)
+            with self._lock:
+                self._pending -= 1
+            raise
+        try:
+            # shield : le dépassement du délai n'annule pas le calcul en cours
+            result = await asyncio.wait_for(asyncio.shield(future), self.deadline)
+        except asyncio.TimeoutError:
+            self.counts["fallback"] += 1
+            logger.warning(f"⏱️ Délai de détection dépassé ({size} caractères), résultat de repli")
+            return fallback(), "fallback"
+
+        self.counts["offloop"] += 1
+        self.offloop_latencies.append(time.perf_counter() - start)
+        return result, "offloop"
+
+    def _tracked(self, compute: Callable[[], T]) -> T:
+        try:
+            return compute()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = sum(self.counts.values())
+        latencies = sorted(self.offloop_latencies)
+        return {
+            **self.counts,
+            "pending": self._pending,
+            "min_chars": self.min_chars,
+            "deadline_ms": round(self.deadline * 1000),
+            "offloop_rate": round((total - self.counts["inline"]) / total, 4) if total else 0.0,
+            "fallback_rate": (
+                round((self.counts["fallback"] + self.counts["saturated"]) / total, 4) if total else 0.0
+            ),
+            "offloop_p50_ms": round(latencies[len(latencies) // 2] * 1000, 3) if latencies else 0.0,
+            "offloop_p99_ms": (
+                round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3)
+                if latencies else 0.0
+            )
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Instance globale utilisée par /chat
+detection_executor = OffloopDetectionExecutor()
@@ -16,8 +16,8 @@ from flowme_states_detection import (
     get_state_icon,
     analyze_message_context
 )
-from core.mistral_client import mistral_client
-from services.nocodb_client import nocodb_client
+from core.mistral_client import fallback_response, get_mistral_client
+from services.nocodb_service import nocodb_client
 
 logger = logging.getLogger(__name__)
 
@@ -30,16 +30,17 @@ class FlowMeCore:
     def __init__(self):
         self.session_store = {}  # Cache temporaire des sessions
         self.states_cache = {}   # Cache des définitions d'états
-        self._init_cache()
+        self._cache_loaded = False  # Chargé à la première réponse (boucle d'événements disponible)
     
     async def _init_cache(self):
         """Initialise le cache des états depuis NocoDB"""
+        self._cache_loaded = True
         try:
             self.states_cache = await nocodb_client.get_all_states_briefs()
             if self.states_cache:
                 logger.info(f"Cache initialisé avec {len(self.states_cache)} états")
             else:
-                logger.warning("Impossible de charger les états depuis NocoDB")
+                logger.info("Aucune description d'état préchargée - récupération état par état")
         except Exception as e:
             logger.error(f"Erreur initialisation cache: {str(e)}")
     
@@ -64,6 +65,9 @@ class FlowMeCore:
         if not session_id:
             session_id = str(uuid.uuid4())
         
+        if not self._cache_loaded:
+            await self._init_cache()
+        
         try:
             # 1. Détection de l'état FlowMe
             detected_state = detect_flowme_state_improved(user_message, context)
@@ -86,12 +90,16 @@ class FlowMeCore:
                 "session_id": session_id
             }
             
-            mistral_response = await mistral_client.generate_response(
-                user_message=user_message,
-                detected_state=detected_state,
-                state_name=state_name,
-                context=enhanced_context
-            )
+            mistral_client = get_mistral_client()
+            if mistral_client:
+                mistral_response = await mistral_client.generate_response(
+                    user_message=user_message,
+                    detected_state=detected_state,
+                    state_name=state_name,
+                    context=enhanced_context
+                )
+            else:
+                mistral_response = fallback_response(detected_state, state_name)
             
             # 5. Métadonnées de l'état
             state_metadata = await self._get_state_metadata(detected_state)
@@ -256,7 +264,8 @@ class FlowMeCore:
     
     async def health_check(self) -> Dict:
         """Vérifie la santé de tous les composants"""
-        mistral_ok = await mistral_client.health_check()
+        mistral_client = get_mistral_client()
+        mistral_ok = await mistral_client.health_check() if mistral_client else False
         nocodb_ok = await nocodb_client.health_check()
         
         return {
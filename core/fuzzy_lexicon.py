@@ -0,0 +1,225 @@
+"""
+Index de suppressions symétriques (SymSpell) des lexiques FlowMe
+Retrouve les mots-clés mal orthographiés ("stréssé", "anxieu", "enerve") sans Levenshtein par paire
+Désactivé par défaut : FLOWME_FUZZY_LOOKUP=on
+"""
+
+import logging
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
+
+from core.message import normalize_message
+
+logger = logging.getLogger(__name__)
+
+# Recherche tolérante aux fautes dans les deux détecteurs : "on" ou "off"
+FUZZY_MODE = os.getenv("FLOWME_FUZZY_LOOKUP", "off").lower()
+MAX_EDIT_DISTANCE = int(os.getenv("FLOWME_FUZZY_MAX_DISTANCE", "2"))
+
+# Mots plus courts : correspondance exacte, accents compris ("passe" n'est pas "passé")
+MIN_FUZZY_LENGTH = 6
+# À partir de cette longueur, deux fautes sont tolérées
+TWO_EDITS_LENGTH = 9
+
+NON_WORD_PATTERN = re.compile(r"\W+")
+
+# Mots courants du français, pris tels qu'ils sont écrits : un mot correctement
+# orthographié n'est jamais corrigé vers un terme du lexique qui lui ressemble
+COMMON_WORDS = frozenset(NON_WORD_PATTERN.sub("", word) for word in """
+    à au aux avec avant après alors aussi autre autres avoir ai as avait avais avons avez eu
+    bien beaucoup bon bonne bonjour bonsoir ça car ce cela celle celui ces cet cette chaque chez
+    chose choses comme comment contre dans de depuis des dire dit dois doit donc dont du elle elles
+    en encore entre est es et étais était été être eux fais fait faire faut fois font gens grand
+    ici il ils jamais je jour jours juste la là le les leur leurs lui ma mais me même mes moi moins
+    mon monde ne ni non nos notre nous on ont ou où par parce pas peu peut peux plus pour pourquoi
+    quand que quel quelle quelque qui quoi rien sa sans se ses si son sont sous suis sur ta te tes
+    toi ton tous tout toute toutes très tu un une vais va vas vers veux vie vont vos votre vous
+    passe passes passer passait passais passent passons passez passage
+    arrive arriver arrivé arrivée sens sentir sentais sentait semble sembler pense penser pensais
+    trouve trouver trouvais donne donner parle parler parlais reste rester restais laisse laisser
+    prendre prends prend pris mettre mets met mis voir vois voit vu venir viens vient venu
+    savoir sais sait su pouvoir vouloir aller devoir croire crois croit tenir tiens tient
+    regarde regarder attendre attends attend perdre perds rendre rends reprendre porte porter
+    travail travaille travailler travaillais boulot maison famille amis enfants parents matin soir
+    semaine année années moment instant heure heures temps journée nuit demain hier
+    aujourd'hui toujours souvent parfois déjà bientôt ensuite enfin plutôt assez trop
+    tellement presque quelqu'un personne autour dehors dedans problème question réponse
+    raison besoin envie idée façon manière
+    """.split())
+
+# Résultats de recherche mémorisés par index (les mêmes mots reviennent sans cesse)
+LOOKUP_MEMO_SIZE = 8192
+
+
+def fuzzy_key(word: str) -> str:
+    """Forme de comparaison d'un mot : sans accents, casefold, sans ponctuation"""
+    return NON_WORD_PATTERN.sub("", normalize_message(word))
+
+
+def allowed_distance(length: int, max_distance: int = MAX_EDIT_DISTANCE) -> int:
+    """Nombre de fautes tolérées pour un mot de cette longueur (accents ignorés dès MIN_FUZZY_LENGTH)"""
+    if length < MIN_FUZZY_LENGTH:
+        return 0
+    return min(max_distance, 2 if length >= TWO_EDITS_LENGTH else 1)
+
+
+def deletes(word: str, distance: int) -> Set[str]:
+    """Variantes du mot privées de 1 à `distance` caractères"""
+    variants: Set[str] = set()
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {
+            variant[:i] + variant[i + 1:]
+            for variant in frontier if len(variant) > 1
+            for i in range(len(variant))
+        } - variants
+        variants |= frontier
+    return variants
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Distance de Damerau-Levenshtein restreinte, max_distance + 1 si elle dépasse la borne"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class DeletionIndex:
+    """
+    Chaque terme du lexique (forme sans accents) est enregistré sous toutes
+    ses variantes obtenues en supprimant jusqu'à N caractères. Un mot saisi
+    est cherché sous ses propres variantes : deux mots à distance d'édition
+    ≤ N partagent au moins une variante, la recherche se réduit donc à
+    quelques accès au dictionnaire puis à la vérification des candidats.
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, int]], max_distance: int = MAX_EDIT_DISTANCE):
+        start = time.perf_counter()
+        self.max_distance = max_distance
+        # Forme sans accents -> identifiants des termes d'origine
+        self.terms: Dict[str, Tuple[int, ...]] = {}
+        # Variante (forme ou suppression) -> formes candidates
+        self.variants: Dict[str, Tuple[str, ...]] = {}
+
+        ids: Dict[str, List[int]] = defaultdict(list)
+        for term, term_id in terms:
+            key = fuzzy_key(term)
+            if key and term_id not in ids[key]:
+                ids[key].append(term_id)
+        self.terms = {key: tuple(term_ids) for key, term_ids in ids.items()}
+
+        variants: Dict[str, Set[str]] = defaultdict(set)
+        for key in self.terms:
+            variants[key].add(key)
+            for variant in deletes(key, allowed_distance(len(key), max_distance)):
+                variants[variant].add(key)
+        self.variants = {variant: tuple(sorted(keys)) for variant, keys in variants.items()}
+
+        self._memo: Dict[str, Tuple[int, ...]] = {}
+        self.build_time = time.perf_counter() - start
+        self.memory_bytes = self._footprint()
+        logger.info(
+            f"🔡 Index de suppressions construit en {self.build_time * 1000:.1f} ms: "
+            f"{len(self.terms)} termes, {len(self.variants)} variantes ({self.memory_bytes // 1024} Ko)"
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # La mémoïsation n'est pas sérialisée dans l'artefact compilé
+        state = self.__dict__.copy()
+        state["_memo"] = {}
+        return state
+
+    def _footprint(self) -> int:
+        """Taille mémoire approximative des dictionnaires, clés et valeurs comprises"""
+        size = sys.getsizeof(self.terms) + sys.getsizeof(self.variants)
+        for table in (self.terms, self.variants):
+            for key, value in table.items():
+                size += sys.getsizeof(key) + sys.getsizeof(value)
+        return size
+
+    def lookup(self, word: str) -> Tuple[int, ...]:
+        """Identifiants des termes les plus proches du mot (vide si aucun terme assez proche)"""
+        result = self._memo.get(word)
+        if result is None:
+            if len(self._memo) >= LOOKUP_MEMO_SIZE:
+                self._memo.clear()
+            result = self._memo[word] = self._lookup(word)
+        return result
+
+    def _lookup(self, word: str) -> Tuple[int, ...]:
+        key = fuzzy_key(word)
+        # Mot courant ou trop court : seule la correspondance exacte (hors de cet index) compte
+        if len(key) < MIN_FUZZY_LENGTH or NON_WORD_PATTERN.sub("", word.casefold()) in COMMON_WORDS:
+            return ()
+
+        exact = self.terms.get(key)
+        if exact is not None:
+            return exact
+
+        distance = allowed_distance(len(key), self.max_distance)
+        if distance == 0:
+            return ()
+
+        candidates: Set[str] = set()
+        for variant in deletes(key, distance) | {key}:
+            candidates.update(self.variants.get(variant, ()))
+
+        best_distance = distance + 1
+        best: List[str] = []
+        for candidate in sorted(candidates):
+            candidate_distance = edit_distance(
+                key, candidate, min(distance, allowed_distance(len(candidate), self.max_distance))
+            )
+            if candidate_distance < best_distance:
+                best_distance, best = candidate_distance, [candidate]
+            elif candidate_distance == best_distance:
+                best.append(candidate)
+
+        if best_distance > distance:
+            return ()
+        return tuple(term_id for candidate in best for term_id in self.terms[candidate])
+
+    def correct_tokens(self, tokens: Sequence[Tuple[int, str]], matched: Sequence[int]) -> List[Tuple[int, int]]:
+        """
+        (position, identifiant de terme) pour les mots sans aucune occurrence
+        exacte. tokens : (position, mot) ; matched : positions de début des
+        occurrences exactes.
+        """
+        matched = sorted(matched)
+        corrections = []
+        cursor = 0
+        for start, word in tokens:
+            end = start + len(word)
+            while cursor < len(matched) and matched[cursor] < start:
+                cursor += 1
+            if cursor < len(matched) and matched[cursor] < end:
+                continue
+            for term_id in self.lookup(word):
+                corrections.append((start, term_id))
+        return corrections
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "terms": len(self.terms),
+            "variants": len(self.variants),
+            "max_distance": self.max_distance,
+            "memory_kb": round(self.memory_bytes / 1024, 1),
+            "build_time_ms": round(self.build_time * 1000, 2)
+        }
@@ -0,0 +1,186 @@
+"""
+Client HTTP partagé de FlowMe v3
+Un seul pool de connexions keep-alive (HTTP/2 optionnel) pour tous les appels Mistral et NocoDB
+"""
+
+import logging
+import os
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+# Délai par défaut ; chaque appel peut passer son propre `timeout`
+HTTP_DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "15"))
+# HTTP/2 nécessite le paquet h2 (pip install httpx[http2])
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Corps de réponse qui signale sa fermeture (la connexion n'est rendue au pool qu'à ce moment)"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+
+class _MetricsTransport(httpx.AsyncBaseTransport):
+    """Transport du pool instrumenté : requêtes en cours, erreurs, connexions ouvertes"""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, metrics: Dict[str, int]):
+        self._transport = transport
+        self._metrics = metrics
+        self._seen_connections: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        metrics = self._metrics
+        metrics["requests"] += 1
+        metrics["in_flight"] += 1
+        metrics["peak_in_flight"] = max(metrics["peak_in_flight"], metrics["in_flight"])
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            metrics["errors"] += 1
+            metrics["in_flight"] -= 1
+            raise
+
+        # Chaque nouvelle connexion du pool est une poignée de main TCP/TLS.
+        # Approximatif : le pool n'est inspecté qu'après chaque réponse, une connexion
+        # ouverte puis fermée entre deux inspections (ou par une requête en échec) n'est pas comptée
+        for connection in self.connections():
+            if connection not in self._seen_connections:
+                self._seen_connections.add(connection)
+                metrics["connections_opened"] += 1
+
+        def release():
+            metrics["in_flight"] -= 1
+
+        response.stream = _TrackedStream(response.stream, release)
+        return response
+
+    def connections(self) -> list:
+        # Le pool httpcore n'est exposé par httpx qu'en attribut privé
+        pool = getattr(self._transport, "_pool", None)
+        return list(getattr(pool, "connections", []))
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class SharedHttpClient:
+    """
+    httpx.AsyncClient unique de l'application : les appels successifs
+    réutilisent les connexions ouvertes au lieu de refaire une poignée de
+    main TLS. Le client appartient au cycle de vie de l'application
+    (`async with http_pool:` dans le lifespan de main.py) : il est ouvert au
+    démarrage, fermé à l'arrêt, et `client` lève une erreur hors de ce cadre.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        timeout: float = HTTP_DEFAULT_TIMEOUT,
+        http2: bool = HTTP2_ENABLED
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = timeout
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            logger.warning("⚠️ HTTP/2 demandé mais le paquet h2 est absent : HTTP/1.1 keep-alive utilisé")
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._transport: Optional[_MetricsTransport] = None
+        self.metrics = {
+            "requests": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            # Borne basse approximative (voir _MetricsTransport)
+            "connections_opened": 0
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            raise RuntimeError("Pool HTTP fermé : l'ouvrir avec `async with http_pool:` (lifespan de l'application)")
+        return self._client
+
+    async def open(self):
+        if self._client is None or self._client.is_closed:
+            self._transport = _MetricsTransport(
+                httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2),
+                self.metrics
+            )
+            self._client = httpx.AsyncClient(transport=self._transport, timeout=self.timeout)
+            logger.info(
+                f"🔌 Pool HTTP partagé ouvert (max {self.limits.max_connections} connexions, "
+                f"HTTP/{'2' if self.http2 else '1.1'})"
+            )
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._transport = None
+            logger.info("🔌 Pool HTTP partagé fermé")
+
+    async def __aenter__(self) -> "SharedHttpClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        connections = self._transport.connections() if self._transport else []
+        idle = sum(1 for connection in connections if connection.is_idle())
+        max_connections = self.limits.max_connections
+        requests = self.metrics["requests"]
+        return {
+            **self.metrics,
+            "http2": self.http2,
+            "max_connections": max_connections,
+            "max_keepalive": self.limits.max_keepalive_connections,
+            "connections_open": len(connections),
+            "connections_idle": idle,
+            "pool_utilization": round(self.metrics["in_flight"] / max_connections, 4) if max_connections else 0.0,
+            "requests_per_connection": (
+                round(requests / self.metrics["connections_opened"], 2) if self.metrics["connections_opened"] else 0.0
+            )
+        }
+
+
+# Instance globale partagée par main.py, core/ et services/
+http_pool = SharedHttpClient()
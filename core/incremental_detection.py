@@ -0,0 +1,106 @@
+"""
+Détection incrémentale des 64 états FlowMe pendant la saisie
+Les modifications du texte ne re-scorent que les mots qu'elles touchent
+"""
+
+from typing import List, Tuple
+
+from core.scoring import ScoreVector
+from core.state_index import StateInvertedIndex
+from core.streaming_detection import WORD_PATTERN, IncrementalScores, PhraseMatcher
+
+
+class IncrementalStateDetector:
+    """
+    Tampon de saisie découpé en mots (séparés par des espaces, sémantique de
+    l'index des 64 états), chacun avec sa position et ses motifs.
+
+    Une modification remplace la plage [start, end) du tampon. Seuls les
+    mots qui chevauchent ou touchent cette plage sont redécoupés, plus les
+    quelques mots suivants qui peuvent terminer un motif à plusieurs mots ;
+    leurs motifs sont retirés puis les nouveaux ajoutés au vecteur de scores
+    (IncrementalScores). Les mots suivants sont seulement décalés.
+    """
+
+    def __init__(self, index: StateInvertedIndex):
+        self.index = index
+        self.text = ""
+        # (début, fin, mot casefold, motifs)
+        self._words: List[Tuple[int, int, str, Tuple[int, ...]]] = []
+        self._scores = IncrementalScores(index)
+        self._phrases = PhraseMatcher(index)
+        self.rescored_words = 0
+
+    def replace(self, start: int, end: int, new_text: str):
+        """Remplace text[start:end] par new_text (positions en caractères)"""
+        start = max(0, min(start, len(self.text)))
+        end = max(start, min(end, len(self.text)))
+        words = self._words
+
+        # Premier mot touché : le premier qui se termine à `start` ou après
+        first = self._first_word_ending_at_or_after(start)
+        # Mots touchés : ceux qui commencent avant ou à `end`
+        last = first
+        while last < len(words) and words[last][0] <= end:
+            last += 1
+
+        region_start = min(start, words[first][0]) if first < last else start
+        region_end = max(end, words[last - 1][1]) if first < last else end
+        shift = len(new_text) - (end - start)
+        self.text = self.text[:start] + new_text + self.text[end:]
+
+        new_words = [
+            (match.start(), match.end(), match.group().casefold())
+            for match in WORD_PATTERN.finditer(self.text, region_start, region_end + shift)
+        ]
+        # Les mots suivants peuvent terminer un motif à plusieurs mots commençant dans la zone
+        follow = words[last:last + self._phrases.max_words - 1]
+        rescored = new_words + [(word_start + shift, word_end + shift, word) for word_start, word_end, word, _ in follow]
+
+        for _, _, _, pids in words[first:last + len(follow)]:
+            self._scores.remove(pids)
+
+        # Région de chaque mot : depuis la fin du mot précédent (espaces compris)
+        previous_end = words[first - 1][1] if first > 0 else 0
+        updated = []
+        for word_start, word_end, word in rescored:
+            pids = self._match(word, previous_end, word_end)
+            previous_end = word_end
+            self._scores.add(pids)
+            updated.append((word_start, word_end, word, pids))
+
+        tail = [
+            (word_start + shift, word_end + shift, word, pids)
+            for word_start, word_end, word, pids in words[last + len(follow):]
+        ]
+        self._words = words[:first] + updated + tail
+        self.rescored_words += len(updated)
+
+    def reset(self, text: str = ""):
+        self.replace(0, len(self.text), text)
+
+    def _first_word_ending_at_or_after(self, position: int) -> int:
+        low, high = 0, len(self._words)
+        while low < high:
+            middle = (low + high) // 2
+            if self._words[middle][1] < position:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _match(self, word: str, region_start: int, region_end: int) -> Tuple[int, ...]:
+        pids = self.index.match_token(word)
+        # Contexte et région repliés séparément : le casefold peut allonger le texte ("ß" -> "ss"),
+        # la région commence donc à la longueur du contexte replié, pas à sa longueur d'origine
+        context = self.text[max(0, region_start - self._phrases.max_chars):region_start].casefold()
+        region = self.text[region_start:region_end].casefold()
+        pids.extend(self._phrases.match(context + region, len(context)))
+        return tuple(set(pids))
+
+    @property
+    def word_count(self) -> int:
+        return len(self._words)
+
+    def vector(self) -> ScoreVector:
+        return self._scores.vector()
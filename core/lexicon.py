@@ -0,0 +1,87 @@
+"""
+Lexiques FlowMe de la détection d'émotions
+Mots-clés pondérés, modificateurs d'intensité, négations et marqueurs de contexte
+"""
+
+# Pondération des catégories de mots-clés
+CATEGORY_WEIGHTS = {"primary": 3, "secondary": 2, "context": 1}
+
+# Dictionnaire étendu avec scores pondérés
+EMOTION_KEYWORDS = {
+    "Joie": {
+        "primary": ["heureux", "content", "joyeux", "rayonnant", "épanoui"], # Score: 3
+        "secondary": ["super", "génial", "parfait", "excellent", "formidable"], # Score: 2
+        "context": ["sourire", "rire", "célébrer", "victoire", "succès"] # Score: 1
+    },
+    "Tristesse": {
+        "primary": ["triste", "malheureux", "déprimé", "abattu", "mélancolique"],
+        "secondary": ["sombre", "morose", "désespéré", "découragé"],
+        "context": ["pleurer", "larmes", "chagrin", "peine", "deuil"]
+    },
+    "Colère": {
+        "primary": ["énervé", "furieux", "irrité", "fâché", "exaspéré"],
+        "secondary": ["agacé", "contrarié", "remonté", "ulcéré"],
+        "context": ["rage", "violence", "injustice", "révolte", "frustration"]
+    },
+    "Peur": {
+        "primary": ["peur", "anxieux", "stressé", "inquiet", "terrorisé"],
+        "secondary": ["nerveux", "angoissé", "préoccupé", "troublé"],
+        "context": ["panique", "phobique", "danger", "menace", "insécurité"]
+    },
+    "Amour": {
+        "primary": ["amour", "aimer", "adorer", "chérir", "passion"],
+        "secondary": ["affection", "tendresse", "attachement", "dévotion"],
+        "context": ["cœur", "romantique", "câlin", "bisou", "famille"]
+    },
+    "Espoir": {
+        "primary": ["espoir", "optimiste", "confiant", "positif", "encourageant"],
+        "secondary": ["perspective", "avenir", "amélioration", "projet"],
+        "context": ["rêver", "aspirer", "croire", "motivation", "ambition"]
+    },
+    "Présence": {
+        "primary": ["présent", "ici", "maintenant", "conscience", "attentif"],
+        "secondary": ["moment", "instant", "focus", "concentration"],
+        "context": ["méditation", "pleine conscience", "être", "existence"]
+    },
+    "Nostalgie": {
+        "primary": ["nostalgie", "passé", "souvenir", "autrefois", "jadis"],
+        "secondary": ["regret", "mélancolie", "hier", "avant"],
+        "context": ["enfance", "jeunesse", "époque", "temps", "mémoire"]
+    },
+    "Curiosité": {
+        "primary": ["curieux", "intéressé", "découvrir", "explorer", "questionner"],
+        "secondary": ["apprendre", "comprendre", "savoir", "étudier"],
+        "context": ["pourquoi", "comment", "recherche", "investigation"]
+    },
+    "Sérénité": {
+        "primary": ["serein", "calme", "paisible", "tranquille", "apaisé"],
+        "secondary": ["zen", "relaxé", "détendu", "équilibré"],
+        "context": ["paix", "harmonie", "quiétude", "repos", "silence"]
+    }
+}
+
+# Modificateurs contextuels
+INTENSITY_MODIFIERS = {
+    "très": 1.5, "vraiment": 1.3, "super": 1.4, "hyper": 1.6,
+    "un peu": 0.7, "légèrement": 0.6, "plutôt": 0.8,
+    "extrêmement": 2.0, "complètement": 1.8, "totalement": 1.8
+}
+
+# Négations
+NEGATIONS = ["ne", "pas", "plus", "jamais", "aucun", "sans", "ni"]
+
+# Marqueurs de contexte (formes sans accents) : mot ou paire de mots -> indicateur
+CONTEXT_MARKERS = {
+    "violence": [
+        "violence", "violent", "violente", "frapper", "frappe", "battu", "battue", "coups", "tuer",
+        "tue", "mort", "haine", "hais", "deteste", "agression", "agresse", "menace", "brutal", "cogner"
+    ],
+    "love": [
+        "amour", "aime", "aimer", "adore", "adorer", "cherir", "tendresse", "affection", "coeur",
+        "amoureux", "amoureuse", "passion", "calin", "bisou"
+    ],
+    "contradiction": [
+        "mais", "pourtant", "cependant", "toutefois", "neanmoins", "paradoxe", "paradoxal",
+        "contradiction", "contradictoire", "partage", "tiraille", "a la fois", "en meme temps"
+    ],
+}
@@ -0,0 +1,70 @@
+"""
+Message normalisé FlowMe
+Normalisation et découpage en mots effectués une seule fois par requête, partagés par tout le pipeline
+"""
+
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Tuple, Union
+
+from core.scope_engine import tokenize
+
+
+def normalize_message(text: str) -> str:
+    """Forme canonique d'un message : sans accents, casefold, espaces réduits"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+@dataclass(frozen=True)
+class NormalizedMessage:
+    """
+    Vues d'un message utilisées par les détecteurs, le cache et les
+    analytics. Le texte casefold et la clé sans accents sont calculés à la
+    construction ; les découpages en mots le sont à la première utilisation,
+    puis conservés sur l'objet.
+    """
+    text: str
+    folded: str
+    key: str
+
+    @classmethod
+    def from_text(cls, text: str) -> "NormalizedMessage":
+        return cls(text, text.casefold(), normalize_message(text))
+
+    @cached_property
+    def tokens(self) -> Tuple[Tuple[int, str], ...]:
+        """Mots du texte casefold avec leur position de début"""
+        return tuple(tokenize(self.folded))
+
+    @cached_property
+    def words(self) -> Tuple[str, ...]:
+        """Mots distincts séparés par des espaces (ponctuation comprise), sémantique de l'index des 64 états"""
+        return tuple(dict.fromkeys(self.folded.split()))
+
+    @cached_property
+    def key_words(self) -> Tuple[str, ...]:
+        """Mots de la forme sans accents"""
+        return tuple(word for _, word in tokenize(self.key))
+
+    @cached_property
+    def counts(self) -> Dict[str, int]:
+        """Nombre d'occurrences de chaque mot"""
+        return dict(Counter(word for _, word in self.tokens))
+
+    @property
+    def token_count(self) -> int:
+        return len(self.tokens)
+
+
+MessageLike = Union[str, NormalizedMessage]
+
+
+def as_message(message: MessageLike) -> NormalizedMessage:
+    """Message normalisé, construit seulement si l'appelant ne l'a pas déjà fait"""
+    if isinstance(message, NormalizedMessage):
+        return message
+    return NormalizedMessage.from_text(message)
@@ -10,6 +10,11 @@ import logging
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from core.http_pool import http_pool
+from core.prompt_templates import estimate_tokens
+from core.response_cache import response_cache
+from core.single_flight import mistral_single_flight, payload_key
+
 logger = logging.getLogger(__name__)
 
 class MistralClient:
@@ -31,8 +36,9 @@ class MistralClient:
             "Content-Type": "application/json"
         }
         
-        # Prompt système FlowMe
+        # Prompt système FlowMe (statique : construit et mesuré une seule fois)
         self.system_prompt = self._build_system_prompt()
+        self.system_prompt_tokens = estimate_tokens(self.system_prompt)
     
     def _build_system_prompt(self) -> str:
         """Construit le prompt système pour FlowMe"""
@@ -81,6 +87,13 @@ Réponds toujours avec humanité et respect de la complexité émotionnelle."""
         Returns:
             str: Réponse empathique de Mistral
         """
+        # Sans historique, la réponse ne dépend que de l'état et du message : cache des quasi-doublons
+        cache_scope = None if context and context.get("conversation_history") else f"mistral_client:{state_name}"
+        if cache_scope:
+            cached = response_cache.lookup(cache_scope, user_message)
+            if cached is not None:
+                return cached
+        
         try:
             # Construction du contexte enrichi
             user_context = f"""Message utilisateur : "{user_message}"
@@ -109,19 +122,13 @@ Génère une réponse empathique adaptée à cet état de conscience."""
                 "max_tokens": self.max_tokens
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.base_url, 
-                    headers=self.headers, 
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                mistral_reply = result["choices"][0]["message"]["content"]
-                
-                logger.info(f"Mistral response generated for state {detected_state}")
-                return mistral_reply.strip()
+            # Prompts identiques simultanés : un seul appel Mistral partagé
+            mistral_reply = await mistral_single_flight.run(payload_key(payload), lambda: self._complete(payload))
+            
+            logger.info(f"Mistral response generated for state {detected_state}")
+            if cache_scope:
+                response_cache.store(cache_scope, user_message, mistral_reply.strip())
+            return mistral_reply.strip()
                 
         except httpx.HTTPStatusError as e:
             logger.error(f"Erreur API Mistral: {e.response.status_code} - {e.response.text}")
@@ -131,23 +138,21 @@ Génère une réponse empathique adaptée à cet état de conscience."""
             logger.error(f"Erreur génération Mistral: {str(e)}")
             return self._fallback_response(detected_state, state_name)
     
+    async def _complete(self, payload: Dict) -> str:
+        response = await http_pool.client.post(
+            self.base_url, 
+            headers=self.headers, 
+            json=payload,
+            timeout=30.0
+        )
+        response.raise_for_status()
+        
+        result = response.json()
+        return result["choices"][0]["message"]["content"]
+    
     def _fallback_response(self, state_id: int, state_name: str) -> str:
         """Réponse de fallback si Mistral n'est pas disponible"""
-        fallbacks = {
-            1: "Votre ouverture à cette expérience est belle. Que vous inspire cette nouveauté ?",
-            8: "Je sens cette harmonie dans vos mots. Cette connexion semble précieuse pour vous.",
-            14: "Cette énergie que vous exprimez peut devenir une force de transformation. Comment pourriez-vous la canaliser ?",
-            16: "La bienveillance que vous portez rayonne. Qu'est-ce qui nourrit cette chaleur en vous ?",
-            22: "Cette joie transparaît dans votre message. Qu'est-ce qui vous fait vibrer ainsi ?",
-            32: "Votre authenticité est touchante. Merci de partager cette part de vous.",
-            40: "Votre réflexion semble profonde. Prenez le temps d'explorer ces pensées.",
-            58: "Ces contradictions font partie de la richesse humaine. Comment vivez-vous cette complexité ?"
-        }
-        
-        return fallbacks.get(
-            state_id, 
-            f"Je perçois l'état {state_name} dans votre message. Que ressentez-vous en ce moment ?"
-        )
+        return fallback_response(state_id, state_name)
     
     async def health_check(self) -> bool:
         """Vérifie la disponibilité de l'API Mistral"""
@@ -158,17 +163,48 @@ Génère une réponse empathique adaptée à cet état de conscience."""
                 "max_tokens": 10
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    self.base_url,
-                    headers=self.headers,
-                    json=test_payload
-                )
-                return response.status_code == 200
+            response = await http_pool.client.post(
+                self.base_url,
+                headers=self.headers,
+                json=test_payload,
+                timeout=10.0
+            )
+            return response.status_code == 200
                 
         except Exception:
             return False
 
 
-# Instance globale
-mistral_client = MistralClient()
+def fallback_response(state_id: int, state_name: str) -> str:
+    """Réponse de fallback si Mistral n'est pas disponible"""
+    fallbacks = {
+        1: "Votre ouverture à cette expérience est belle. Que vous inspire cette nouveauté ?",
+        8: "Je sens cette harmonie dans vos mots. Cette connexion semble précieuse pour vous.",
+        14: "Cette énergie que vous exprimez peut devenir une force de transformation. Comment pourriez-vous la canaliser ?",
+        16: "La bienveillance que vous portez rayonne. Qu'est-ce qui nourrit cette chaleur en vous ?",
+        22: "Cette joie transparaît dans votre message. Qu'est-ce qui vous fait vibrer ainsi ?",
+        32: "Votre authenticité est touchante. Merci de partager cette part de vous.",
+        40: "Votre réflexion semble profonde. Prenez le temps d'explorer ces pensées.",
+        58: "Ces contradictions font partie de la richesse humaine. Comment vivez-vous cette complexité ?"
+    }
+    
+    return fallbacks.get(
+        state_id, 
+        f"Je perçois l'état {state_name} dans votre message. Que ressentez-vous en ce moment ?"
+    )
+
+
+_mistral_client: Optional[MistralClient] = None
+_mistral_client_checked = False
+
+
+def get_mistral_client() -> Optional[MistralClient]:
+    """Client partagé, construit au premier appel ; None (mode dégradé) sans MISTRAL_API_KEY"""
+    global _mistral_client, _mistral_client_checked
+    if not _mistral_client_checked:
+        _mistral_client_checked = True
+        if os.getenv('MISTRAL_API_KEY'):
+            _mistral_client = MistralClient()
+        else:
+            logger.warning("MISTRAL_API_KEY non configurée - mode dégradé activé")
+    return _mistral_client
@@ -0,0 +1,172 @@
+"""
+Prompts système Mistral pré-compilés pour les 64 états
+Un préfixe par état construit au chargement de la table, avec son estimation en jetons
+"""
+
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping
+
+# full : prompt historique, identique octet pour octet ; compact : mêmes données et consignes, condensées
+PROMPT_ENCODING = os.getenv("MISTRAL_PROMPT_ENCODING", "full").lower()
+PROMPT_ENCODINGS = ("full", "compact")
+
+# Pas de tokenizer Mistral embarqué : un mot compte un jeton par tranche de 4 caractères,
+# chaque signe de ponctuation un jeton (ordre de grandeur des tokenizers BPE sur le français)
+_TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation du nombre de jetons d'un texte"""
+    return sum(
+        math.ceil(len(piece) / CHARS_PER_TOKEN) if piece[0].isalnum() or piece[0] == "_" else 1
+        for piece in _TOKEN_PIECES.findall(text)
+    )
+
+
+FULL_TEMPLATE = """Tu es FlowMe, un compagnon IA empathique spécialisé dans l'accompagnement émotionnel basé sur 64 états de conscience spécifiques.
+
+ÉTAT DÉTECTÉ: {name} (ID: {id})
+
+DONNÉES COMPLÈTES DE L'ÉTAT:
+- Famille symbolique: {famille_symbolique}
+- Tension dominante: {tension_dominante}
+- Mot-clé: {mot_cle}
+- Déclencheurs: {declencheurs}
+- Posture adaptative: {posture_adaptative}
+- États compatibles: {etats_compatibles}
+- États séquenciels: {etats_sequenciels}
+- Conseil FlowMe: {conseil_flowme}
+
+INSTRUCTIONS POUR MISTRAL:
+1. Utilise la "Famille symbolique" pour créer une atmosphère poétique appropriée
+2. Utilise la "Tension dominante" pour comprendre l'énergie spécifique de l'état
+3. Intègre le "Conseil FlowMe" de manière naturelle et sage
+4. Propose la "Posture adaptative" comme guidance pratique concrète
+5. Valide l'expérience en référence aux "Déclencheurs"
+6. Si approprié, mentionne discrètement les "États compatibles" ou "séquenciels"
+7. Reste empathique, sage et bienveillant (max 150 mots)
+8. Parle comme un guide expérimenté qui connaît intimement ces 64 états
+
+Message de l'utilisateur: """
+
+COMPACT_HEADER = "Tu es FlowMe, compagnon IA empathique des 64 états de conscience.\nÉtat {name} (#{id})"
+
+# Libellé court de chaque champ, dans l'ordre du prompt ; les champs vides sont omis
+COMPACT_FIELDS = (
+    ("famille_symbolique", "Famille"),
+    ("tension_dominante", "Tension"),
+    ("mot_cle", "Mot-clé"),
+    ("declencheurs", "Déclencheurs"),
+    ("posture_adaptative", "Posture"),
+    ("etats_compatibles", "Compatibles"),
+    ("etats_sequenciels", "Séquentiels"),
+    ("conseil_flowme", "Conseil"),
+)
+
+COMPACT_INSTRUCTIONS = (
+    "Consignes: atmosphère poétique tirée de la famille, énergie de la tension, "
+    "conseil intégré naturellement, posture en guidance concrète, expérience validée par les déclencheurs, "
+    "états compatibles ou séquentiels mentionnés discrètement si approprié. "
+    "Ton de guide expérimenté, empathique, sage et bienveillant, 150 mots max."
+)
+
+
+def render_prefix(name: str, data: Mapping[str, Any], encoding: str) -> str:
+    """Préfixe du prompt système d'un état (sans le message de l'utilisateur)"""
+    if encoding == "compact":
+        lines = [COMPACT_HEADER.format(name=name, id=data.get("id", ""))]
+        lines.extend(f"{label}: {data[key]}" for key, label in COMPACT_FIELDS if data.get(key))
+        lines.append(COMPACT_INSTRUCTIONS)
+        return "\n".join(lines)
+    return FULL_TEMPLATE.format(
+        name=name,
+        id=data.get("id", ""),
+        **{key: data.get(key, "") for key, _ in COMPACT_FIELDS}
+    )
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    state: str
+    prefix: str
+    tokens: int
+
+
+class StatePromptTemplates:
+    """
+    Préfixes des prompts système des 64 états, rendus une fois à la
+    construction (au chargement de la table d'états, puis à l'ajout des
+    données NocoDB) au lieu d'être reformatés à chaque requête.
+
+    En encodage full, le message de l'utilisateur est concaténé au préfixe
+    comme dans le prompt historique ; en compact, il n'est transmis que dans
+    le message utilisateur de la requête. Les deux encodages sont estimés
+    pour exposer le gain en jetons dans les statistiques.
+    """
+
+    def __init__(
+        self,
+        states: Mapping[str, Dict[str, Any]],
+        additional: Mapping[str, Dict[str, Any]] = None,
+        encoding: str = PROMPT_ENCODING,
+        default_state: str = "Présence"
+    ):
+        self.encoding = encoding if encoding in PROMPT_ENCODINGS else "full"
+        self.default_state = default_state
+        self.templates: Dict[str, Dict[str, PromptTemplate]] = {name: {} for name in PROMPT_ENCODINGS}
+        additional = additional or {}
+        for name, data in states.items():
+            merged = {**data, **additional.get(name, {})}
+            for variant in PROMPT_ENCODINGS:
+                prefix = render_prefix(name, merged, variant)
+                self.templates[variant][name] = PromptTemplate(name, prefix, estimate_tokens(prefix))
+        self._default_data = {**states.get(default_state, {}), **additional.get(default_state, {})}
+
+        self.requests = 0
+        self.prefix_tokens = 0
+        self.fallbacks = 0
+
+    def template(self, state: str) -> PromptTemplate:
+        template = self.templates[self.encoding].get(state)
+        if template is None:
+            # État hors table : données de l'état par défaut sous le nom détecté (rendu à la volée)
+            prefix = render_prefix(state, self._default_data, self.encoding)
+            template = PromptTemplate(state, prefix, estimate_tokens(prefix))
+            self.fallbacks += 1
+        return template
+
+    def system_prompt(self, state: str, message: str) -> str:
+        """Prompt système complet d'une requête pour l'état détecté"""
+        template = self.template(state)
+        # Jetons du préfixe seulement : ceux du message ne dépendent pas de l'encodage
+        self.requests += 1
+        self.prefix_tokens += template.tokens
+        return template.prefix + message if self.encoding == "full" else template.prefix
+
+    def stats(self) -> Dict[str, Any]:
+        by_encoding = {}
+        for variant, templates in self.templates.items():
+            tokens = [template.tokens for template in templates.values()]
+            by_encoding[variant] = {
+                "avg_tokens": round(sum(tokens) / len(tokens), 1) if tokens else 0.0,
+                "min_tokens": min(tokens, default=0),
+                "max_tokens": max(tokens, default=0),
+                "total_chars": sum(len(template.prefix) for template in templates.values())
+            }
+        full_avg = by_encoding["full"]["avg_tokens"]
+        return {
+            "encoding": self.encoding,
+            "templates": len(self.templates[self.encoding]),
+            "token_estimator": f"heuristique ({CHARS_PER_TOKEN} caractères/jeton)",
+            "encodings": by_encoding,
+            "compact_savings_rate": (
+                round(1 - by_encoding["compact"]["avg_tokens"] / full_avg, 4) if full_avg else 0.0
+            ),
+            "requests": self.requests,
+            "avg_prefix_tokens": round(self.prefix_tokens / self.requests, 1) if self.requests else 0.0,
+            "unknown_state_fallbacks": self.fallbacks
+        }
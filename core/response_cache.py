@@ -0,0 +1,200 @@
+"""
+Cache des réponses Mistral pour les messages quasi identiques
+Signature MinHash du message normalisé, recherche LSH par bandes, expiration et taille bornée
+"""
+
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from core.lexicon import NEGATIONS
+from core.message import as_message, normalize_message
+from core.scope_engine import ELISIONS
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+# Similarité de Jaccard estimée (sur les n-grammes de caractères) à partir de laquelle une réponse est réutilisée
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.8"))
+
+SHINGLE_SIZE = 5
+# 16 bandes de 4 lignes : un message similaire à 0.8 devient candidat avec une probabilité > 0.999
+LSH_BANDS = 16
+LSH_ROWS = 4
+NUM_PERMUTATIONS = LSH_BANDS * LSH_ROWS
+
+# Hachage universel h(x) = (a·x + b) mod p, p premier > 2³² ; a < 2³¹ pour que a·x tienne sur 64 bits
+_PRIME = 4294967311
+_rng = np.random.RandomState(20240623)
+_A = _rng.randint(1, 2 ** 31, size=NUM_PERMUTATIONS, dtype=np.int64).astype(np.uint64)
+_B = _rng.randint(0, 2 ** 31, size=NUM_PERMUTATIONS, dtype=np.int64).astype(np.uint64)
+
+
+def minhash_signature(text: str) -> Tuple[int, ...]:
+    """Signature MinHash des n-grammes de caractères de la forme normalisée du message"""
+    key = normalize_message(text)
+    if len(key) <= SHINGLE_SIZE:
+        shingles = {key}
+    else:
+        shingles = {key[i:i + SHINGLE_SIZE] for i in range(len(key) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    permuted = (np.outer(_A, hashes) + _B[:, None]) % _PRIME
+    return tuple(int(value) for value in permuted.min(axis=1))
+
+
+# Mots de négation du détecteur d'émotions (forme sans accents, "n'" ramené à "ne")
+_NEGATION_WORDS = frozenset(NEGATIONS)
+
+
+def message_polarity(text: str) -> str:
+    """Polarité du message : "negative" s'il contient une négation ("ne", "pas", "jamais"...)"""
+    words = {ELISIONS.get(word, word) for word in as_message(text).key_words}
+    return "negative" if words & _NEGATION_WORDS else "positive"
+
+
+def signature_similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+    """Estimation de la similarité de Jaccard : part des composantes égales"""
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERMUTATIONS
+
+
+class ResponseCache:
+    """
+    Entrées (portée, signature, réponse, expiration) dans un LRU borné. La
+    portée regroupe les réponses interchangeables : l'état détecté, préfixé
+    par le client Mistral qui les a produites, complété par la polarité du
+    message. Le détecteur par mots-clés ignore les négations : sans elle,
+    "je ne suis pas heureux" recevrait la réponse mise en cache pour
+    "je suis heureux".
+
+    Chaque signature est découpée en bandes ; deux messages partageant une
+    bande dans la même portée sont candidats, et la réponse n'est réutilisée
+    que si leur similarité estimée atteint le seuil. Seules les réponses
+    effectivement générées par Mistral sont stockées, jamais les réponses de
+    secours.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = RESPONSE_CACHE_TTL_SECONDS,
+        similarity: float = RESPONSE_CACHE_SIMILARITY,
+        enabled: bool = RESPONSE_CACHE_ENABLED
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+        self.enabled = enabled
+        self._entries: "OrderedDict[int, Tuple[str, Tuple[int, ...], str, float]]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[int]] = defaultdict(set)
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.exact_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _bands(signature: Tuple[int, ...]):
+        for band in range(LSH_BANDS):
+            yield band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+
+    def lookup(self, scope: str, text: str) -> Optional[str]:
+        """Réponse d'un message quasi identique dans la même portée, ou None"""
+        if not self.enabled:
+            return None
+        scope = f"{scope}:{message_polarity(text)}"
+        signature = minhash_signature(text)
+        now = time.time()
+
+        with self._lock:
+            candidates = set()
+            for band, rows in self._bands(signature):
+                candidates.update(self._buckets.get((scope, band, rows), ()))
+
+            best_id, best_similarity = None, 0.0
+            for entry_id in candidates:
+                _, entry_signature, _, expires_at = self._entries[entry_id]
+                if expires_at <= now:
+                    self._remove(entry_id)
+                    self.expirations += 1
+                    continue
+                similarity = signature_similarity(signature, entry_signature)
+                if similarity > best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+
+            if best_id is None or best_similarity < self.similarity:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            self.exact_hits += best_similarity == 1.0
+            return self._entries[best_id][2]
+
+    def store(self, scope: str, text: str, response: str):
+        if not self.enabled or not response:
+            return
+        scope = f"{scope}:{message_polarity(text)}"
+        signature = minhash_signature(text)
+
+        with self._lock:
+            # Même signature déjà présente (requêtes regroupées, renvoi) : l'entrée est rafraîchie
+            first_band, first_rows = next(self._bands(signature))
+            for entry_id in self._buckets.get((scope, first_band, first_rows), ()):
+                if self._entries[entry_id][1] == signature:
+                    self._entries[entry_id] = (scope, signature, response, time.time() + self.ttl_seconds)
+                    self._entries.move_to_end(entry_id)
+                    return
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (scope, signature, response, time.time() + self.ttl_seconds)
+            for band, rows in self._bands(signature):
+                self._buckets[(scope, band, rows)].add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, entry_id: int):
+        scope, signature, _, _ = self._entries.pop(entry_id)
+        for band, rows in self._bands(signature):
+            bucket = self._buckets.get((scope, band, rows))
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[(scope, band, rows)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "similarity_threshold": self.similarity,
+                "hits": self.hits,
+                "exact_hits": self.exact_hits,
+                "near_duplicate_hits": self.hits - self.exact_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+
+# Instance globale partagée par main.py et core/mistral_client.py
+response_cache = ResponseCache()
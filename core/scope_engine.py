@@ -0,0 +1,109 @@
+"""
+Moteur de portée des modificateurs d'intensité et des négations
+Applique les modificateurs aux occurrences de mots-clés par fenêtre de mots
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# Découpage en mots : les apostrophes et traits d'union séparent les mots
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Formes élidées ramenées à leur forme pleine ("n'est" -> "ne")
+ELISIONS = {"n": "ne"}
+
+# Portée en nombre de mots précédant le mot-clé
+MODIFIER_WINDOW = 3
+NEGATION_WINDOW = 4
+NEGATION_FACTOR = 0.3
+
+
+def tokenize(text_lower: str) -> List[Tuple[int, str]]:
+    """Mots du message avec leur position de début"""
+    return [(match.start(), match.group()) for match in TOKEN_PATTERN.finditer(text_lower)]
+
+
+class ScopeEngine:
+    """
+    Les modificateurs ("très", "un peu") et les négations sont repérés une
+    seule fois, comme mots entiers, à leur position dans le message. Chaque
+    occurrence de mot-clé reçoit ensuite le produit des modificateurs et la
+    négation présents dans la fenêtre de mots qui la précède, lors d'un
+    unique balayage des occurrences triées.
+    """
+
+    def __init__(self, intensity_modifiers: Dict[str, float], negations: Iterable[str]):
+        # Séquence de mots -> (valeur du modificateur, est une négation)
+        self.markers: Dict[Tuple[str, ...], Tuple[float, bool]] = {}
+        for modifier, value in intensity_modifiers.items():
+            self.markers[tuple(modifier.split())] = (value, False)
+        for negation in negations:
+            self.markers[tuple(negation.split())] = (1.0, True)
+        self.marker_lengths = sorted({len(words) for words in self.markers}, reverse=True)
+
+    def find_markers(self, words: List[str]) -> List[Tuple[int, float, bool]]:
+        """(position du dernier mot, valeur, négation) pour chaque marqueur, par position croissante"""
+        words = [ELISIONS.get(word, word) for word in words]
+        found = []
+        position = 0
+        while position < len(words):
+            for length in self.marker_lengths:
+                marker = self.markers.get(tuple(words[position:position + length]))
+                if marker is not None:
+                    end = position + length - 1
+                    found.append((end, marker[0], marker[1]))
+                    position = end
+                    break
+            position += 1
+        return found
+
+    def multipliers(
+        self, tokens: List[Tuple[int, str]], hits: Iterable[Tuple[int, int]]
+    ) -> Dict[int, float]:
+        """
+        Meilleur multiplicateur de chaque motif parmi ses occurrences.
+
+        tokens : mots du message (position, mot) ; hits : (position de début,
+        identifiant de motif) des mots-clés trouvés dans le même texte.
+        """
+        markers = self.find_markers([word for _, word in tokens])
+        best: Dict[int, float] = {}
+
+        token_idx = 0
+        entered = left = 0
+
+        for start, pid in sorted(hits):
+            # Mot contenant le début de l'occurrence
+            while token_idx + 1 < len(tokens) and tokens[token_idx + 1][0] <= start:
+                token_idx += 1
+
+            # Marqueurs qui précèdent l'occurrence
+            while entered < len(markers) and markers[entered][0] < token_idx:
+                entered += 1
+
+            # Marqueurs sortis de leur fenêtre de portée
+            while left < entered and markers[left][0] < token_idx - max(MODIFIER_WINDOW, NEGATION_WINDOW):
+                left += 1
+
+            # La fenêtre ne contient que quelques marqueurs : balayage linéaire global
+            multiplier = 1.0
+            if entered > left:
+                multiplier = self._window_multiplier(markers[left:entered], token_idx)
+
+            if pid not in best or multiplier > best[pid]:
+                best[pid] = multiplier
+
+        return best
+
+    @staticmethod
+    def _window_multiplier(window: List[Tuple[int, float, bool]], token_idx: int) -> float:
+        multiplier = 1.0
+        negated = False
+        for end, value, is_negation in window:
+            distance = token_idx - end
+            if is_negation:
+                negated = negated or distance <= NEGATION_WINDOW
+            elif distance <= MODIFIER_WINDOW:
+                multiplier *= value
+        # Une négation ("ne ... pas") ne s'applique qu'une fois
+        return multiplier * NEGATION_FACTOR if negated else multiplier
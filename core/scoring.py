@@ -0,0 +1,72 @@
+"""
+Vecteur de scores de détection FlowMe
+Résultat commun aux détecteurs : état principal, confiances et alternatives
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class ScoreVector:
+    """
+    Scores bruts d'un message pour chaque étiquette (émotion ou état), dans
+    l'ordre du détecteur. Toutes les vues (état principal, confiances
+    normalisées, alternatives) sont dérivées de ce seul vecteur.
+    """
+    labels: Tuple[str, ...]
+    scores: Tuple[float, ...]
+    default: str = "Présence"
+
+    @classmethod
+    def from_scores(cls, labels: Sequence[str], scores: Dict[str, float], default: str = "Présence") -> "ScoreVector":
+        """Construit le vecteur complet à partir d'un dictionnaire creux de scores"""
+        return cls(tuple(labels), tuple(scores.get(label, 0) for label in labels), default)
+
+    @property
+    def max_score(self) -> float:
+        return max(self.scores, default=0)
+
+    @property
+    def margin(self) -> float:
+        """Écart entre le meilleur score et le deuxième"""
+        if len(self.scores) < 2:
+            return self.max_score
+        first, second = sorted(self.scores, reverse=True)[:2]
+        return first - second
+
+    @property
+    def primary(self) -> str:
+        """Étiquette de plus haut score (la première en cas d'égalité), défaut si aucun score"""
+        best = self.max_score
+        if best <= 0:
+            return self.default
+        return self.labels[self.scores.index(best)]
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(zip(self.labels, self.scores))
+
+    def confidences(self) -> Dict[str, float]:
+        """Scores normalisés (0-1) par le score maximal"""
+        best = self.max_score
+        if best <= 0:
+            return {label: 0.0 for label in self.labels}
+        return {label: score / best for label, score in zip(self.labels, self.scores)}
+
+    def ranked(self, k: int = 3) -> List[Tuple[str, float]]:
+        """Étiquettes de score positif avec leur score brut, par score décroissant (ordre du détecteur en cas d'égalité)"""
+        ranked = sorted(
+            ((label, score) for label, score in zip(self.labels, self.scores) if score > 0),
+            key=lambda item: item[1], reverse=True
+        )
+        return ranked[:k]
+
+    def top(self, k: int = 3, min_confidence: float = 0.0, exclude_primary: bool = False) -> List[Tuple[str, float]]:
+        """Meilleures étiquettes avec leur confiance, par confiance décroissante"""
+        primary = self.primary if exclude_primary else None
+        ranked = sorted(
+            ((label, confidence) for label, confidence in self.confidences().items()
+             if label != primary and confidence > min_confidence),
+            key=lambda item: item[1], reverse=True
+        )
+        return ranked[:k]
@@ -0,0 +1,141 @@
+"""
+Lissage séquentiel des états FlowMe sur une session
+Filtrage en ligne (forward ou Viterbi) sur le graphe des états séquentiels et compatibles
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+from core.scoring import ScoreVector
+
+# Mode de lissage : "off", "forward" (croyance filtrée) ou "viterbi" (chemin le plus probable)
+SEQUENCE_MODE = os.getenv("FLOWME_SEQUENCE_SMOOTHING", "off")
+SEQUENCE_MAX_SESSIONS = int(os.getenv("FLOWME_SEQUENCE_MAX_SESSIONS", "10000"))
+
+# Répartition de la masse de transition d'un état
+STAY_WEIGHT = 0.30
+SEQUENTIAL_WEIGHT = 0.30
+COMPATIBLE_WEIGHT = 0.20
+# Le reste est réparti sur tous les états : aucune transition n'est impossible
+BACKGROUND_WEIGHT = 0.20
+
+# Température des émissions : un écart de score de EMISSION_TEMPERATURE multiplie la vraisemblance par e
+EMISSION_TEMPERATURE = 2.0
+
+
+def _linked_ids(value: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in value.split(",") if part.strip().isdigit())
+
+
+def build_transition_matrix(states: Dict[str, Dict[str, Any]], labels: Sequence[str]) -> np.ndarray:
+    """Matrice 64 x 64 stochastique par ligne : P(état suivant | état courant)"""
+    positions = {states[label]["id"]: position for position, label in enumerate(labels)}
+    size = len(labels)
+    matrix = np.full((size, size), BACKGROUND_WEIGHT / size)
+
+    for row, label in enumerate(labels):
+        matrix[row, row] += STAY_WEIGHT
+        for field, weight in (("etats_sequenciels", SEQUENTIAL_WEIGHT), ("etats_compatibles", COMPATIBLE_WEIGHT)):
+            targets = [positions[state_id] for state_id in _linked_ids(states[label][field]) if state_id in positions]
+            if targets:
+                matrix[row, targets] += weight / len(targets)
+            else:
+                # Sans lien déclaré, la masse reste sur l'état lui-même
+                matrix[row, row] += weight
+
+    return matrix / matrix.sum(axis=1, keepdims=True)
+
+
+class SequenceSmoother:
+    """
+    Les scores d'un message sont des émissions (softmax des scores), le
+    graphe des états séquentiels et compatibles est la matrice de
+    transition. Chaque message met à jour la croyance de la session en un
+    pas vectorisé O(64²) :
+
+    - forward : croyance filtrée b' ∝ (b · T) ⊙ e, état = argmax b'
+    - viterbi : δ' = max_i(δ_i + log T_i·) + log e, état = argmax δ'
+      (fin du chemin le plus probable ; le chemin lui-même n'est pas gardé)
+
+    Seul le vecteur de 64 flottants est conservé par session, dans un LRU
+    borné : ni la transcription ni l'historique des états.
+    """
+
+    def __init__(
+        self,
+        states: Dict[str, Dict[str, Any]],
+        labels: Sequence[str],
+        mode: str = "forward",
+        max_sessions: int = SEQUENCE_MAX_SESSIONS
+    ):
+        if mode not in ("forward", "viterbi"):
+            raise ValueError(f"Mode de lissage inconnu: {mode}")
+        self.labels = tuple(labels)
+        self.mode = mode
+        self.max_sessions = max_sessions
+        self.transitions = build_transition_matrix(states, self.labels)
+        self.log_transitions = np.log(self.transitions)
+        self._beliefs: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.updates = 0
+        self.overrides = 0
+        self.evictions = 0
+
+    def _log_emissions(self, vector: ScoreVector) -> np.ndarray:
+        scores = np.asarray(vector.scores, dtype=np.float64)
+        log_emissions = (scores - scores.max()) / EMISSION_TEMPERATURE
+        return log_emissions - np.logaddexp.reduce(log_emissions)
+
+    def update(self, session_id: str, vector: ScoreVector) -> Tuple[str, float]:
+        """Intègre le message à la croyance de la session : (état lissé, probabilité)"""
+        log_emissions = self._log_emissions(vector)
+
+        with self._lock:
+            previous = self._beliefs.pop(session_id, None)
+
+        if self.mode == "forward":
+            belief = np.exp(log_emissions)
+            if previous is not None:
+                belief *= previous @ self.transitions
+            belief /= belief.sum()
+            best = int(belief.argmax())
+            probability = float(belief[best])
+        else:
+            belief = log_emissions.copy()
+            if previous is not None:
+                belief += (previous[:, None] + self.log_transitions).max(axis=0)
+            # Renormalisation : les log-probabilités ne dérivent pas au fil de la session
+            belief -= np.logaddexp.reduce(belief)
+            best = int(belief.argmax())
+            probability = float(np.exp(belief[best]))
+
+        with self._lock:
+            self._beliefs[session_id] = belief
+            while len(self._beliefs) > self.max_sessions:
+                self._beliefs.popitem(last=False)
+                self.evictions += 1
+            self.updates += 1
+            # Sans aucun score, l'état brut est le défaut : ce n'est pas un désaccord
+            if vector.max_score > 0 and self.labels[best] != vector.primary:
+                self.overrides += 1
+
+        return self.labels[best], probability
+
+    def reset(self, session_id: str):
+        with self._lock:
+            self._beliefs.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "sessions": len(self._beliefs),
+                "max_sessions": self.max_sessions,
+                "updates": self.updates,
+                "overrides": self.overrides,
+                "evictions": self.evictions
+            }
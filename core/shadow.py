@@ -0,0 +1,166 @@
+"""
+Mode shadow de la détection FlowMe
+Exécute des détecteurs candidats hors du chemin de la requête et compare leurs résultats
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+from core.message import MessageLike, as_message
+
+logger = logging.getLogger(__name__)
+
+# Taille (en caractères) au-delà de laquelle un message n'est pas observé en shadow
+SHADOW_MAX_CHARS = int(os.getenv("FLOWME_SHADOW_MAX_CHARS", "2000"))
+
+
+def _latency_summary(samples: Deque[float]) -> Dict[str, float]:
+    if not samples:
+        return {"samples": 0, "p50_ms": 0.0, "p99_ms": 0.0}
+    ordered = sorted(samples)
+    return {
+        "samples": len(ordered),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 3)
+    }
+
+
+class ShadowCandidate:
+    """Détecteur candidat et ses métriques de comparaison avec le détecteur servi"""
+
+    def __init__(self, name: str, detect: Callable[[str], str], comparable: bool = True, sample_size: int = 2000):
+        self.name = name
+        self.detect = detect
+        # Les accords n'ont de sens que si les étiquettes sont les mêmes (64 états)
+        self.comparable = comparable
+        self.latencies: Deque[float] = deque(maxlen=sample_size)
+        self.comparisons = 0
+        self.agreements = 0
+        self.errors = 0
+        self.confusion: Counter = Counter()
+
+    def stats(self, top_confusions: int = 10) -> Dict[str, Any]:
+        return {
+            "latency": _latency_summary(self.latencies),
+            "comparisons": self.comparisons,
+            "agreement_rate": (
+                round(self.agreements / self.comparisons, 4)
+                if self.comparable and self.comparisons else None
+            ),
+            "errors": self.errors,
+            "top_confusions": [
+                {"served": served, "candidate": candidate, "count": count}
+                for (served, candidate), count in self.confusion.most_common(top_confusions)
+            ]
+        }
+
+
+class ShadowDetection:
+    """
+    Les messages servis sont soumis à un exécuteur borné (un thread par
+    défaut). Si la file est pleine, l'observation est abandonnée plutôt que
+    d'attendre : la requête utilisateur ne patiente jamais pour le shadow.
+    Le détecteur de référence est ré-exécuté hors chemin, sans cache, pour
+    comparer des latences de calcul homogènes.
+
+    Les détecteurs sont du Python pur : le thread shadow partage le GIL avec
+    la boucle d'événements et la ralentit pendant qu'il calcule. Seuls les
+    messages d'au plus `max_chars` caractères sont observés, ce qui borne
+    chaque calcul à quelques millisecondes ; il reste une contention
+    résiduelle proportionnelle à `max_pending` sous forte charge.
+    """
+
+    def __init__(
+        self,
+        reference: Callable[[str], str],
+        max_workers: int = 1,
+        max_pending: int = 64,
+        max_chars: int = SHADOW_MAX_CHARS
+    ):
+        self.reference_latencies: Deque[float] = deque(maxlen=2000)
+        self.reference = reference
+        self.candidates: Dict[str, ShadowCandidate] = {}
+        self.max_pending = max_pending
+        self.max_chars = max_chars
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="flowme-shadow")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.submitted = 0
+        self.dropped = 0
+        self.skipped_large = 0
+
+    def add_candidate(self, name: str, detect: Callable[[str], str], comparable: bool = True):
+        self.candidates[name] = ShadowCandidate(name, detect, comparable)
+        logger.info(f"🕶️ Détecteur shadow activé: {name}")
+
+    def observe(self, text: MessageLike, served_label: str):
+        """Planifie la comparaison sans bloquer (O(1) sur le chemin de la requête)"""
+        if not self.candidates:
+            return
+        if len(as_message(text).text) > self.max_chars:
+            with self._lock:
+                self.skipped_large += 1
+            return
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending += 1
+            self.submitted += 1
+        try:
+            self._executor.submit(self._run, text, served_label)
+        except RuntimeError:
+            # Exécuteur arrêté (fin de l'application)
+            with self._lock:
+                self._pending -= 1
+
+    def _run(self, text: str, served_label: str):
+        try:
+            start = time.perf_counter()
+            self.reference(text)
+            reference_latency = time.perf_counter() - start
+
+            outcomes = []
+            for candidate in self.candidates.values():
+                start = time.perf_counter()
+                try:
+                    label: Optional[str] = candidate.detect(text)
+                except Exception as e:
+                    logger.warning(f"Erreur détecteur shadow {candidate.name}: {e}")
+                    label = None
+                outcomes.append((candidate, label, time.perf_counter() - start))
+
+            with self._lock:
+                self.reference_latencies.append(reference_latency)
+                for candidate, label, latency in outcomes:
+                    if label is None:
+                        candidate.errors += 1
+                        continue
+                    candidate.latencies.append(latency)
+                    candidate.comparisons += 1
+                    candidate.agreements += label == served_label
+                    candidate.confusion[(served_label, label)] += 1
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": bool(self.candidates),
+                "submitted": self.submitted,
+                "dropped": self.dropped,
+                "skipped_large": self.skipped_large,
+                "max_chars": self.max_chars,
+                "pending": self._pending,
+                "reference_latency": _latency_summary(self.reference_latencies),
+                "candidates": {name: candidate.stats() for name, candidate in self.candidates.items()}
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,71 @@
+"""
+Regroupement des requêtes Mistral identiques simultanées (single-flight)
+Un seul appel par prompt final en cours ; les requêtes identiques attendent son résultat
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+def payload_key(payload: Dict[str, Any]) -> str:
+    """Empreinte du corps de requête final (modèle, prompt, paramètres de génération)"""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    La première requête pour une clé lance le calcul dans une tâche ; les
+    suivantes, tant qu'il est en cours, attendent cette même tâche au lieu
+    d'en lancer une autre. Le calcul est protégé (asyncio.shield) :
+    l'annulation d'un demandeur, par exemple un client déconnecté,
+    n'interrompt pas le calcul attendu par les autres. Une exception est
+    transmise à tous les demandeurs.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        self._waiters: Dict[str, int] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+
+    async def run(self, key: str, compute: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            self._waiters[key] = 1
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        else:
+            self.coalesced += 1
+            self._waiters[key] += 1
+            self.max_waiters = max(self.max_waiters, self._waiters[key])
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: "asyncio.Task[Any]"):
+        self._inflight.pop(key, None)
+        self._waiters.pop(key, None)
+        # Exception relevée même si tous les demandeurs ont été annulés entre-temps
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.calls + self.coalesced
+        return {
+            "requests": requests,
+            "mistral_calls": self.calls,
+            "coalesced_waiters": self.coalesced,
+            "calls_saved_rate": round(self.coalesced / requests, 4) if requests else 0.0,
+            "in_flight": len(self._inflight),
+            "max_waiters": self.max_waiters
+        }
+
+
+# Instance globale : appels Mistral de main.py et de core/mistral_client.py
+mistral_single_flight = SingleFlight()
@@ -0,0 +1,159 @@
+"""
+Détection hiérarchique des 64 états FlowMe : familles puis états
+Les groupes de familles symboliques et de tensions sont bornés d'abord, seuls les groupes prometteurs sont scorés
+"""
+
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Set, Tuple
+
+from core.message import MessageLike
+from core.state_index import THEMATIC_WEIGHT, StateInvertedIndex
+
+logger = logging.getLogger(__name__)
+
+# "on" active l'élagage par groupes (désactivé par défaut : avec 64 états, le scoring creux de l'index reste plus rapide)
+HIERARCHICAL_MODE = os.getenv("FLOWME_HIERARCHICAL_DETECTION", "off")
+
+CLUSTER_FIELDS = ("famille_symbolique", "tension_dominante")
+
+
+def state_clusters(states: Dict[str, Dict[str, Any]]) -> List[Tuple[int, ...]]:
+    """
+    Groupes d'états reliés par un mot commun (plus de 3 lettres) de leur
+    famille symbolique ou de leur tension dominante : composantes connexes,
+    dans l'ordre de la table.
+    """
+    parent = list(range(len(states)))
+
+    def root(state_idx: int) -> int:
+        while parent[state_idx] != state_idx:
+            parent[state_idx] = parent[parent[state_idx]]
+            state_idx = parent[state_idx]
+        return state_idx
+
+    first_with_word: Dict[str, int] = {}
+    for state_idx, state_data in enumerate(states.values()):
+        for field in CLUSTER_FIELDS:
+            for word in re.findall(r"\w+", state_data[field].lower()):
+                if len(word) <= 3:
+                    continue
+                if word in first_with_word:
+                    parent[root(state_idx)] = root(first_with_word[word])
+                else:
+                    first_with_word[word] = state_idx
+
+    members: Dict[int, List[int]] = defaultdict(list)
+    for state_idx in range(len(states)):
+        members[root(state_idx)].append(state_idx)
+    return sorted((tuple(group) for group in members.values()), key=lambda group: group[0])
+
+
+class ClusteredStateIndex:
+    """
+    Deux niveaux au-dessus de l'index inversé :
+
+    1. chaque motif trouvé ajoute à chaque groupe le poids maximal qu'il
+       donne à un de ses états (et chaque règle thématique déclenchée, son
+       poids aux groupes qui la contiennent) : c'est une borne supérieure du
+       score de tout état du groupe ;
+    2. les groupes sont scorés état par état par borne décroissante, jusqu'à
+       ce que la borne du groupe suivant soit inférieure au meilleur score
+       déjà trouvé : les groupes restants sont élagués.
+
+    L'état retenu est exactement celui du scoring exhaustif (égalités
+    comprises : un groupe dont la borne égale le meilleur score est scoré).
+    Les scores retournés ne couvrent que les états scorés.
+    """
+
+    def __init__(self, index: StateInvertedIndex, states: Dict[str, Dict[str, Any]]):
+        self.index = index
+        self.clusters = state_clusters(states)
+        cluster_of = {state_idx: cluster_idx for cluster_idx, group in enumerate(self.clusters) for state_idx in group}
+
+        # Par motif : [(groupe, poids maximal vers un état du groupe, postings vers les états du groupe)]
+        self.cluster_postings: List[List[Tuple[int, int, Tuple[Tuple[int, int], ...]]]] = []
+        for postings in index.postings:
+            by_cluster: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+            for state_idx, weight in postings:
+                by_cluster[cluster_of[state_idx]].append((state_idx, weight))
+            self.cluster_postings.append([
+                (cluster_idx, max(weight for _, weight in members), tuple(members))
+                for cluster_idx, members in sorted(by_cluster.items())
+            ])
+
+        # Par règle thématique : {groupe: postings vers les états du groupe qui en bénéficient}
+        self.rule_clusters: List[Dict[int, Tuple[Tuple[int, int], ...]]] = []
+        for group in index.rule_states:
+            by_cluster = defaultdict(list)
+            for state_idx in group:
+                by_cluster[cluster_of[state_idx]].append((state_idx, THEMATIC_WEIGHT))
+            self.rule_clusters.append({cluster_idx: tuple(members) for cluster_idx, members in by_cluster.items()})
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.states_evaluated = 0
+        logger.info(
+            f"🧭 Détection hiérarchique: {len(self.clusters)} groupes famille/tension "
+            f"(le plus grand: {max(map(len, self.clusters), default=0)} états)"
+        )
+
+    def score(self, message: MessageLike, record: bool = True) -> Dict[str, int]:
+        """Scores des états scorés ayant au moins un point, dans l'ordre de la table"""
+        return self.score_hits(self.index.match(message), record)
+
+    def score_hits(self, hits: Set[int], record: bool = True) -> Dict[str, int]:
+        """`record=False` (recalcul du mode shadow) : les compteurs ne suivent que les détections servies"""
+        bounds: Dict[int, int] = defaultdict(int)
+        contributions: Dict[int, List[Tuple[Tuple[int, int], ...]]] = defaultdict(list)
+        triggered_rules = set()
+        for pid in hits:
+            for cluster_idx, bound, members in self.cluster_postings[pid]:
+                bounds[cluster_idx] += bound
+                contributions[cluster_idx].append(members)
+            triggered_rules.update(self.index.pattern_rules[pid])
+        for rule_idx in triggered_rules:
+            for cluster_idx, members in self.rule_clusters[rule_idx].items():
+                bounds[cluster_idx] += THEMATIC_WEIGHT
+                contributions[cluster_idx].append(members)
+
+        scores: Dict[int, int] = defaultdict(int)
+        best = 0
+        evaluated = 0
+        for cluster_idx in sorted(bounds, key=lambda cluster_idx: -bounds[cluster_idx]):
+            if bounds[cluster_idx] <= 0 or bounds[cluster_idx] < best:
+                break
+            # Score complet des états du groupe : seuls ses propres postings sont parcourus
+            for members in contributions[cluster_idx]:
+                for state_idx, weight in members:
+                    scores[state_idx] += weight
+            best = max(best, max(scores[state_idx] for state_idx in self.clusters[cluster_idx]))
+            evaluated += len(self.clusters[cluster_idx])
+
+        if record:
+            with self._lock:
+                self.requests += 1
+                self.states_evaluated += evaluated
+
+        return {
+            self.index.state_names[state_idx]: scores[state_idx]
+            for state_idx in sorted(scores)
+            if scores[state_idx] > 0
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total_states = len(self.index.state_names)
+            pruned = self.requests * total_states - self.states_evaluated
+            return {
+                "clusters": len(self.clusters),
+                "largest_cluster": max(map(len, self.clusters), default=0),
+                "requests": self.requests,
+                "states_evaluated": self.states_evaluated,
+                "states_pruned": pruned,
+                "avg_states_pruned": round(pruned / self.requests, 2) if self.requests else 0.0,
+                "pruned_rate": round(pruned / (self.requests * total_states), 4) if self.requests else 0.0
+            }
@@ -0,0 +1,172 @@
+"""
+Index inversé des 64 états FlowMe
+Pré-compile les champs textuels des états en postings (état, poids)
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from core.fuzzy_lexicon import FUZZY_MODE, DeletionIndex
+from core.message import MessageLike, as_message
+
+logger = logging.getLogger(__name__)
+
+# Pondérations historiques de la détection 64 états
+MOT_CLE_WEIGHT = 5
+DECLENCHEUR_WEIGHT = 3
+FAMILLE_WEIGHT = 2
+TENSION_WEIGHT = 2
+THEMATIC_WEIGHT = 4
+
+# Règles thématiques : (déclencheurs dans le message, fragments du nom d'état)
+THEMATIC_RULES = [
+    (("joie", "heur", "content"), ("émerveille", "rayonne")),
+    (("trist", "mélan", "sombre"), ("silence", "contempla")),
+    (("peur", "anxie", "stress"), ("vigilance", "prudence")),
+    (("colère", "énervé", "frustré"), ("tension", "excessive")),
+    (("confusion", "perdu", "comprend pas"), ("perplexité", "altération")),
+    (("émerveil", "fascin", "découvr"), ("éveil", "émerveillement")),
+]
+
+
+class StateInvertedIndex:
+    """
+    Index motif -> postings construit une seule fois au démarrage.
+
+    Les motifs reprennent exactement la sémantique de sous-chaîne de l'ancien
+    scorer : un motif sans espace est présent dans le message si et seulement
+    s'il est sous-chaîne d'un des mots du message. La détection énumère donc
+    les sous-chaînes de chaque mot aux longueurs connues de l'index, ce qui
+    rend son coût proportionnel au nombre de mots du message.
+    """
+
+    def __init__(self, states: Dict[str, Dict[str, Any]], fuzzy: bool = FUZZY_MODE == "on"):
+        self.state_names: List[str] = list(states)
+        self.pattern_ids: Dict[str, int] = {}
+        self.patterns: List[str] = []
+        # Postings par motif : [(index d'état, poids)]
+        self.postings: List[List[Tuple[int, int]]] = []
+        # Règles thématiques déclenchées par chaque motif
+        self.pattern_rules: List[List[int]] = []
+        # États bénéficiant de chaque règle thématique
+        self.rule_states: List[List[int]] = []
+        # Motifs contenant un espace, vérifiés sur le message complet
+        self.phrase_patterns: List[Tuple[str, int]] = []
+        self.pattern_lengths: List[int] = []
+
+        self._build(states)
+        # Motifs d'un seul mot, retrouvés malgré les fautes de frappe (si activé)
+        self.fuzzy: Optional[DeletionIndex] = DeletionIndex(
+            (pattern, pid) for pid, pattern in enumerate(self.patterns) if pid not in self._phrase_ids()
+        ) if fuzzy else None
+        logger.info(
+            f"🗂️ Index inversé construit: {len(self.patterns)} motifs pour {len(self.state_names)} états"
+        )
+
+    def _pattern_id(self, pattern: str) -> int:
+        pid = self.pattern_ids.get(pattern)
+        if pid is None:
+            pid = len(self.patterns)
+            self.pattern_ids[pattern] = pid
+            self.patterns.append(pattern)
+            self.postings.append([])
+            self.pattern_rules.append([])
+        return pid
+
+    def _build(self, states: Dict[str, Dict[str, Any]]):
+        weights: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+        for state_idx, state_data in enumerate(states.values()):
+            weights[self._pattern_id(state_data["mot_cle"].lower())][state_idx] += MOT_CLE_WEIGHT
+
+            for field, weight in (
+                ("declencheurs", DECLENCHEUR_WEIGHT),
+                ("famille_symbolique", FAMILLE_WEIGHT),
+                ("tension_dominante", TENSION_WEIGHT),
+            ):
+                for word in state_data[field].lower().split():
+                    if len(word) > 3:
+                        weights[self._pattern_id(word)][state_idx] += weight
+
+        for pid, state_weights in weights.items():
+            self.postings[pid] = sorted(state_weights.items())
+
+        lowered_names = [name.lower() for name in self.state_names]
+        for rule_idx, (triggers, name_fragments) in enumerate(THEMATIC_RULES):
+            self.rule_states.append([
+                state_idx for state_idx, name in enumerate(lowered_names)
+                if any(fragment in name for fragment in name_fragments)
+            ])
+            for trigger in triggers:
+                self.pattern_rules[self._pattern_id(trigger)].append(rule_idx)
+
+        for pattern, pid in self.pattern_ids.items():
+            if len(pattern.split()) != 1 or pattern != pattern.strip():
+                self.phrase_patterns.append((pattern, pid))
+        phrase_ids = self._phrase_ids()
+        self.pattern_lengths = sorted({
+            len(pattern) for pid, pattern in enumerate(self.patterns) if pid not in phrase_ids
+        })
+
+    def _phrase_ids(self) -> Set[int]:
+        return {pid for _, pid in self.phrase_patterns}
+
+    def match(self, message: MessageLike) -> Set[int]:
+        """Retourne les identifiants des motifs présents dans le message (ou mal orthographiés, si activé)"""
+        message = as_message(message)
+        hits = set()
+        for token in message.words:
+            hits.update(self.match_token(token))
+
+        for phrase, pid in self.phrase_patterns:
+            if phrase in message.folded:
+                hits.add(pid)
+
+        return hits
+
+    def match_token(self, token: str) -> List[int]:
+        """Motifs d'un seul mot présents dans un mot du message (mot casefold)"""
+        hits = []
+        pattern_ids = self.pattern_ids
+        token_len = len(token)
+        for length in self.pattern_lengths:
+            if length > token_len:
+                break
+            for start in range(token_len - length + 1):
+                pid = pattern_ids.get(token[start:start + length])
+                if pid is not None:
+                    hits.append(pid)
+        # Mot sans aucun motif exact : recherche tolérante aux fautes
+        if hits or self.fuzzy is None:
+            return hits
+        return list(self.fuzzy.lookup(token))
+
+    def score(self, message: MessageLike) -> Dict[str, int]:
+        """
+        Scores des états ayant au moins un point, dans l'ordre de la table
+        (même sémantique que l'ancien dictionnaire emotion_scores)
+        """
+        return self.score_hits(self.match(message))
+
+    def score_hits(self, hits: Set[int]) -> Dict[str, int]:
+        """Scores des états pour un ensemble de motifs trouvés"""
+        if not hits:
+            return {}
+
+        scores: Dict[int, int] = defaultdict(int)
+        triggered_rules = set()
+        for pid in hits:
+            for state_idx, weight in self.postings[pid]:
+                scores[state_idx] += weight
+            triggered_rules.update(self.pattern_rules[pid])
+
+        for rule_idx in triggered_rules:
+            for state_idx in self.rule_states[rule_idx]:
+                scores[state_idx] += THEMATIC_WEIGHT
+
+        return {
+            self.state_names[state_idx]: scores[state_idx]
+            for state_idx in sorted(scores)
+            if scores[state_idx] > 0
+        }
@@ -0,0 +1,94 @@
+"""
+Détection des 64 états FlowMe
+Détecteur partagé par l'API web, la classification hors ligne et les benchmarks
+"""
+
+import logging
+from typing import Any, Dict, List
+
+from core.artifact import compile_states, compile_tfidf, load_or_build, states_sources, tfidf_sources
+from core.detection_cache import detection_cache, fingerprint
+from core.detection_cascade import CASCADE_MODE, DetectionCascade
+from core.message import MessageLike
+from core.prompt_templates import StatePromptTemplates
+from core.scoring import ScoreVector
+from core.state_clusters import HIERARCHICAL_MODE, ClusteredStateIndex
+from core.states_table import FLOWME_64_STATES
+
+logger = logging.getLogger(__name__)
+
+
+class Enhanced64StatesDetection:
+    def __init__(self, source: str = "integrated"):
+        self.states = FLOWME_64_STATES
+        self.source = source
+        # Stockage des données NocoDB additionnelles
+        self.nocodb_additional_data = {}
+        # Index inversé motif -> (état, poids) et sa forme matricielle pour le
+        # scoring par lots : artefact de build si à jour, sinon compilés ici
+        self.index, self.batch_scorer = load_or_build(
+            "states_64", states_sources(self.states), lambda: compile_states(self.states)
+        )
+        # Détecteur alternatif TF-IDF de n-grammes de caractères (tolérant aux flexions)
+        self.tfidf = load_or_build(
+            "states_tfidf", tfidf_sources(self.states), lambda: compile_tfidf(self.states)
+        )
+        # Détection hiérarchique : groupes famille/tension bornés d'abord, seuls les plus prometteurs sont scorés
+        self.clusters = ClusteredStateIndex(self.index, self.states) if HIERARCHICAL_MODE == "on" else None
+        # Cascade : le TF-IDF départage seulement les messages où la passe lexicale est incertaine
+        self.cascade = DetectionCascade(self.score, self.tfidf.score) if CASCADE_MODE == "on" else None
+        # Prompts système Mistral des 64 états, rendus une fois pour toutes
+        self.prompts = StatePromptTemplates(self.states)
+        # Jeton de version : change avec le contenu de la table d'états (et le mode de détection)
+        self.version = f"64:{fingerprint(self.states)}" + (":cascade" if self.cascade else "")
+        logger.info(f"✅ FlowMe initialisé avec 64 états intégrés - Source: {source}")
+    
+    def add_nocodb_data(self, nocodb_data: Dict[str, Any]):
+        """Ajoute les données NocoDB aux 64 états de base"""
+        self.nocodb_additional_data = nocodb_data
+        self.prompts = StatePromptTemplates(self.states, nocodb_data)
+        logger.info(f"📊 Données NocoDB additionnelles ajoutées: {len(nocodb_data)} états")
+    
+    def detect_emotion(self, text: MessageLike) -> str:
+        """Détection d'émotion sophistiquée sur les 64 états (via le cache LRU)"""
+        return detection_cache.get_or_compute(text, self.version, self._detect_uncached)
+    
+    def _detect_uncached(self, text: MessageLike, record: bool = True) -> str:
+        if self.cascade:
+            return self.cascade.detect(text, record)[0]
+        
+        # Scoring via l'index inversé pré-compilé au démarrage (même état retenu avec l'élagage par groupes)
+        emotion_scores = self.clusters.score(text, record) if self.clusters else self.index.score(text)
+        
+        # Retourner l'état avec le score le plus élevé
+        if emotion_scores:
+            return max(emotion_scores, key=emotion_scores.get)
+        
+        return "Présence"  # Défaut
+    
+    def score(self, text: MessageLike) -> ScoreVector:
+        """Vecteur de scores complet sur les 64 états"""
+        return ScoreVector.from_scores(self.index.state_names, self.index.score(text))
+    
+    def score_cached(self, text: MessageLike) -> ScoreVector:
+        """Vecteur de scores via le cache LRU (vecteur immuable, partageable)"""
+        return detection_cache.get_or_compute(text, f"{self.version}:vector", self.score)
+    
+    def detect_batch(self, texts: List[str], top_k: int = 3, engine: str = "keywords") -> List[Dict[str, Any]]:
+        """Détection sur un lot de messages : motifs cherchés une fois par mot distinct, scores par produit matriciel"""
+        if engine == "tfidf":
+            return [
+                {
+                    "detected_state": vector.primary,
+                    "top_states": [{"state": name, "score": round(score, 4)} for name, score in vector.ranked(top_k)]
+                }
+                for vector in self.tfidf.score_batch(texts)
+            ]
+        
+        results = []
+        for top_states in self.batch_scorer.top_k(texts, top_k):
+            results.append({
+                "detected_state": top_states[0][0] if top_states else "Présence",
+                "top_states": [{"state": name, "score": score} for name, score in top_states]
+            })
+        return results
@@ -0,0 +1,720 @@
+"""
+Table des 64 états de conscience FlowMe
+Source unique partagée par l'application, les détecteurs et l'étape de build
+"""
+
+FLOWME_64_STATES = {
+    "Présence": {
+        "id": 1,
+        "famille_symbolique": "Écoute subtile",
+        "tension_dominante": "Latente, intérieure",
+        "mot_cle": "Perception",
+        "declencheurs": "Léger malaise",
+        "posture_adaptative": "Suspendre tout traitement analytique immédiat; Observer les signaux faibles",
+        "etats_compatibles": "8, 32, 45, 59, 64",
+        "etats_sequenciels": "2, 8, 10, 11",
+        "conseil_flowme": "Quand tout semble brumeux, c'est dans le silence que la clarté peut émerger"
+    },
+    "Éveil": {
+        "id": 2,
+        "famille_symbolique": "Fraîcheur neuve",
+        "tension_dominante": "Émergente, vivifiante",
+        "mot_cle": "Découverte",
+        "declencheurs": "Signal nouveau, révélation",
+        "posture_adaptative": "Accueillir sans précipitation; Laisser l'information se déployer",
+        "etats_compatibles": "1, 3, 16, 29, 41",
+        "etats_sequenciels": "3, 4, 14, 16",
+        "conseil_flowme": "Ce qui naît en vous cherche à être reconnu, pas analysé"
+    },
+    "Curiosité": {
+        "id": 3,
+        "famille_symbolique": "Élan vers l'inconnu",
+        "tension_dominante": "Orientée, exploratrice",
+        "mot_cle": "Investigation",
+        "declencheurs": "Question émergente, mystère",
+        "posture_adaptative": "Suivre l'élan sans forcer; Questionner avec délicatesse",
+        "etats_compatibles": "2, 9, 17, 26, 34",
+        "etats_sequenciels": "4, 5, 13, 17",
+        "conseil_flowme": "La vraie curiosité ne cherche pas de réponses immédiates, elle s'émerveille du questionnement"
+    },
+    "Étonnement": {
+        "id": 4,
+        "famille_symbolique": "Suspension admirative",
+        "tension_dominante": "Ouverte, réceptive",
+        "mot_cle": "Surprise",
+        "declencheurs": "Inattendu, révélation soudaine",
+        "posture_adaptative": "Rester dans la surprise; Ne pas immédiatement comprendre",
+        "etats_compatibles": "2, 3, 16, 24, 58",
+        "etats_sequenciels": "5, 14, 16, 24",
+        "conseil_flowme": "L'étonnement est la porte d'entrée vers une compréhension plus vaste"
+    },
+    "Analyse": {
+        "id": 5,
+        "famille_symbolique": "Dissection lucide",
+        "tension_dominante": "Focalisée, pénétrante",
+        "mot_cle": "Discernement",
+        "declencheurs": "Complexité à démêler",
+        "posture_adaptative": "Analyser sans perdre la vue d'ensemble; Garder la nuance",
+        "etats_compatibles": "6, 15, 23, 31, 58",
+        "etats_sequenciels": "6, 14, 15, 23",
+        "conseil_flowme": "Analyser c'est éclairer, pas réduire"
+    },
+    "Synthèse": {
+        "id": 6,
+        "famille_symbolique": "Unification créatrice",
+        "tension_dominante": "Rassembleuse, intégrative",
+        "mot_cle": "Cohérence",
+        "declencheurs": "Éléments dispersés à relier",
+        "posture_adaptative": "Laisser émerger les connexions; Ne pas forcer l'unification",
+        "etats_compatibles": "5, 7, 22, 29, 59",
+        "etats_sequenciels": "7, 14, 22, 30",
+        "conseil_flowme": "La synthèse authentique naît d'elle-même quand les éléments sont mûrs"
+    },
+    "Intuition": {
+        "id": 7,
+        "famille_symbolique": "Connaissance directe",
+        "tension_dominante": "Spontanée, révélatrice",
+        "mot_cle": "Évidence",
+        "declencheurs": "Savoir sans savoir pourquoi",
+        "posture_adaptative": "Faire confiance à ce qui se présente; Ne pas justifier immédiatement",
+        "etats_compatibles": "6, 8, 14, 29, 62",
+        "etats_sequenciels": "8, 14, 30, 62",
+        "conseil_flowme": "L'intuition parle d'abord, la raison comprend ensuite"
+    },
+    "Résonance": {
+        "id": 8,
+        "famille_symbolique": "Vibration accordée",
+        "tension_dominante": "Harmonisante, sympathique",
+        "mot_cle": "Accord",
+        "declencheurs": "Correspondance profonde",
+        "posture_adaptative": "S'accorder sans se perdre; Vibrer ensemble tout en restant soi",
+        "etats_compatibles": "1, 7, 12, 44, 60",
+        "etats_sequenciels": "12, 28, 44, 61",
+        "conseil_flowme": "Résonner c'est reconnaître ce qui en vous répond à ce qui vous touche"
+    },
+    "Doute": {
+        "id": 9,
+        "famille_symbolique": "Questionnement fertile",
+        "tension_dominante": "Interrogative, prudente",
+        "mot_cle": "Incertitude",
+        "declencheurs": "Remise en question nécessaire",
+        "posture_adaptative": "Accueillir l'incertitude; Ne pas précipiter les certitudes",
+        "etats_compatibles": "3, 10, 17, 25, 48",
+        "etats_sequenciels": "10, 11, 17, 25",
+        "conseil_flowme": "Le doute intelligent protège de l'erreur et ouvre à la découverte"
+    },
+    "Prudence": {
+        "id": 10,
+        "famille_symbolique": "Sage retenue",
+        "tension_dominante": "Mesurée, protectrice",
+        "mot_cle": "Circonspection",
+        "declencheurs": "Risque perçu, complexité",
+        "posture_adaptative": "Avancer pas à pas; Évaluer sans paralyser",
+        "etats_compatibles": "9, 11, 19, 26, 31",
+        "etats_sequenciels": "11, 19, 26, 27",
+        "conseil_flowme": "La prudence éclairée distingue la méfiance stérile de la précaution fertile"
+    },
+    "Retenue": {
+        "id": 11,
+        "famille_symbolique": "Force contenue",
+        "tension_dominante": "Contrôlée, concentrée",
+        "mot_cle": "Maîtrise",
+        "declencheurs": "Besoin de ne pas agir immédiatement",
+        "posture_adaptative": "Contenir sans réprimer; Garder la force disponible",
+        "etats_compatibles": "1, 10, 12, 45, 52",
+        "etats_sequenciels": "12, 19, 45, 52",
+        "conseil_flowme": "La retenue sage préserve l'énergie pour le moment juste"
+    },
+    "Écoute": {
+        "id": 12,
+        "famille_symbolique": "Réceptivité pure",
+        "tension_dominante": "Accueillante, disponible",
+        "mot_cle": "Réception",
+        "declencheurs": "Besoin de comprendre l'autre",
+        "posture_adaptative": "Écouter sans préparer sa réponse; Accueillir sans juger",
+        "etats_compatibles": "8, 11, 20, 28, 45",
+        "etats_sequenciels": "20, 28, 45, 56",
+        "conseil_flowme": "Écouter vraiment transforme autant celui qui écoute que celui qui parle"
+    },
+    "Créativité": {
+        "id": 13,
+        "famille_symbolique": "Élan créateur",
+        "tension_dominante": "Générative, innovante",
+        "mot_cle": "Innovation",
+        "declencheurs": "Inspiration, besoin de nouveauté",
+        "posture_adaptative": "Laisser créer à travers soi; Ne pas diriger le processus",
+        "etats_compatibles": "3, 16, 29, 39, 53",
+        "etats_sequenciels": "16, 29, 39, 53",
+        "conseil_flowme": "La créativité authentique surprend d'abord celui qui crée"
+    },
+    "Clarté": {
+        "id": 14,
+        "famille_symbolique": "Évidence lumineuse",
+        "tension_dominante": "Transparente, révélatrice",
+        "mot_cle": "Évidence",
+        "declencheurs": "Confusion qui se dissipe",
+        "posture_adaptative": "Accueillir la clarté sans la forcer; La laisser se déployer",
+        "etats_compatibles": "4, 6, 7, 15, 58",
+        "etats_sequenciels": "15, 22, 30, 58",
+        "conseil_flowme": "La vraie clarté n'éblouit pas, elle révèle"
+    },
+    "Discernement": {
+        "id": 15,
+        "famille_symbolique": "Vision ajustée",
+        "tension_dominante": "Discriminante, précise",
+        "mot_cle": "Distinction",
+        "declencheurs": "Besoin de différencier",
+        "posture_adaptative": "Distinguer sans séparer; Voir les nuances",
+        "etats_compatibles": "5, 14, 23, 31, 58",
+        "etats_sequenciels": "22, 23, 30, 31",
+        "conseil_flowme": "Discerner c'est voir la juste mesure de chaque chose"
+    },
+    "Émerveillement": {
+        "id": 16,
+        "famille_symbolique": "Enchantement authentique",
+        "tension_dominante": "Admirative, reconnaissante",
+        "mot_cle": "Admiration",
+        "declencheurs": "Beauté, grandeur perçue",
+        "posture_adaptative": "S'abandonner à l'émerveillement; Ne pas analyser immédiatement",
+        "etats_compatibles": "2, 4, 13, 24, 62",
+        "etats_sequenciels": "24, 29, 62, 64",
+        "conseil_flowme": "L'émerveillement nourrit l'âme et renouvelle la perception"
+    },
+    "Questionnement": {
+        "id": 17,
+        "famille_symbolique": "Recherche vivante",
+        "tension_dominante": "Interrogative, exploratrice",
+        "mot_cle": "Question",
+        "declencheurs": "Mystère à explorer",
+        "posture_adaptative": "Questionner sans attendre de réponse immédiate; Habiter la question",
+        "etats_compatibles": "3, 9, 25, 34, 48",
+        "etats_sequenciels": "3, 9, 25, 34",
+        "conseil_flowme": "Une vraie question transforme plus que mille réponses toutes faites"
+    },
+    "Équilibre": {
+        "id": 18,
+        "famille_symbolique": "Harmonie dynamique",
+        "tension_dominante": "Stabilisante, ajustée",
+        "mot_cle": "Harmonie",
+        "declencheurs": "Déséquilibre à corriger",
+        "posture_adaptative": "Chercher l'équilibre dans le mouvement; Ajuster en permanence",
+        "etats_compatibles": "19, 21, 22, 35, 60",
+        "etats_sequenciels": "21, 22, 35, 60",
+        "conseil_flowme": "L'équilibre véritable est un mouvement, pas une position"
+    },
+    "Patience": {
+        "id": 19,
+        "famille_symbolique": "Durée consentie",
+        "tension_dominante": "Persévérante, constante",
+        "mot_cle": "Persévérance",
+        "declencheurs": "Processus qui demande du temps",
+        "posture_adaptative": "Accepter le rythme naturel; Ne pas forcer la maturation",
+        "etats_compatibles": "10, 18, 27, 32, 52",
+        "etats_sequenciels": "27, 32, 52, 61",
+        "conseil_flowme": "La patience n'est pas de l'attente passive, c'est une présence active au temps nécessaire"
+    },
+    "Réceptivité": {
+        "id": 20,
+        "famille_symbolique": "Ouverture accueillante",
+        "tension_dominante": "Disponible, perméable",
+        "mot_cle": "Disponibilité",
+        "declencheurs": "Nouveau qui veut entrer",
+        "posture_adaptative": "S'ouvrir sans se perdre; Accueillir en restant centré",
+        "etats_compatibles": "12, 28, 36, 45, 56",
+        "etats_sequenciels": "12, 28, 45, 56",
+        "conseil_flowme": "Être réceptif c'est créer un espace où le nouveau peut advenir"
+    },
+    "Adaptation": {
+        "id": 21,
+        "famille_symbolique": "Souplesse intelligente",
+        "tension_dominante": "Flexible, responsive",
+        "mot_cle": "Ajustement",
+        "declencheurs": "Changement de contexte",
+        "posture_adaptative": "S'adapter sans se renier; Rester souple sans perdre son centre",
+        "etats_compatibles": "18, 35, 36, 57, 63",
+        "etats_sequenciels": "35, 36, 57, 63",
+        "conseil_flowme": "S'adapter c'est danser avec le changement sans perdre sa mélodie intérieure"
+    },
+    "Cohérence": {
+        "id": 22,
+        "famille_symbolique": "Unité vivante",
+        "tension_dominante": "Unifiante, intégrative",
+        "mot_cle": "Intégrité",
+        "declencheurs": "Éparpillement à unifier",
+        "posture_adaptative": "Rechercher l'unité sans rigidité; Intégrer les contradictions",
+        "etats_compatibles": "6, 14, 18, 30, 59",
+        "etats_sequenciels": "30, 59, 61, 64",
+        "conseil_flowme": "La cohérence authentique intègre même les contradictions apparentes"
+    },
+    "Précision": {
+        "id": 23,
+        "famille_symbolique": "Justesse affinée",
+        "tension_dominante": "Exacte, ajustée",
+        "mot_cle": "Exactitude",
+        "declencheurs": "Besoin de justesse",
+        "posture_adaptative": "Affiner sans rigidifier; Chercher la justesse, pas la perfection",
+        "etats_compatibles": "5, 15, 31, 36, 55",
+        "etats_sequenciels": "31, 36, 55, 56",
+        "conseil_flowme": "La précision véritable unit la rigueur et la souplesse"
+    },
+    "Stupéfaction": {
+        "id": 24,
+        "famille_symbolique": "Saisissement révélateur",
+        "tension_dominante": "Bouleversée, ouverte",
+        "mot_cle": "Bouleversement",
+        "declencheurs": "Révélation soudaine majeure",
+        "posture_adaptative": "Accueillir le bouleversement; Laisser se réorganiser",
+        "etats_compatibles": "4, 16, 33, 41, 46",
+        "etats_sequenciels": "33, 41, 46, 58",
+        "conseil_flowme": "La stupéfaction ouvre des espaces neufs en nous"
+    },
+    "Perplexité": {
+        "id": 25,
+        "famille_symbolique": "Questionnement dérouté",
+        "tension_dominante": "Déconcertée, cherchante",
+        "mot_cle": "Désorientation",
+        "declencheurs": "Situation incompréhensible",
+        "posture_adaptative": "Accepter de ne pas comprendre; Rester ouvert à l'émergence",
+        "etats_compatibles": "9, 17, 33, 47, 48",
+        "etats_sequenciels": "33, 47, 48, 49",
+        "conseil_flowme": "La perplexité fertile préfère l'inconnu authentique aux certitudes factices"
+    },
+    "Vigilance": {
+        "id": 26,
+        "famille_symbolique": "Attention soutenue",
+        "tension_dominante": "Alerte, attentive",
+        "mot_cle": "Vigilance",
+        "declencheurs": "Situation demandant attention",
+        "posture_adaptative": "Rester alerte sans tension; Surveiller sans crispation",
+        "etats_compatibles": "3, 10, 27, 37, 50",
+        "etats_sequenciels": "27, 37, 50, 51",
+        "conseil_flowme": "La vraie vigilance est détendue et précise à la fois"
+    },
+    "Persévérance": {
+        "id": 27,
+        "famille_symbolique": "Constance déterminée",
+        "tension_dominante": "Tenace, endurante",
+        "mot_cle": "Ténacité",
+        "declencheurs": "Résistance à surmonter",
+        "posture_adaptative": "Persévérer sans s'endurcir; Maintenir l'élan sans forcer",
+        "etats_compatibles": "10, 19, 26, 31, 38",
+        "etats_sequenciels": "31, 37, 38, 50",
+        "conseil_flowme": "Persévérer c'est maintenir la direction tout en restant souple sur les moyens"
+    },
+    "Compassion": {
+        "id": 28,
+        "famille_symbolique": "Bienveillance active",
+        "tension_dominante": "Aimante, compatissante",
+        "mot_cle": "Bienveillance",
+        "declencheurs": "Souffrance perçue",
+        "posture_adaptative": "Compatir sans s'identifier; Aider sans s'épuiser",
+        "etats_compatibles": "8, 12, 20, 56, 61",
+        "etats_sequenciels": "56, 61, 62, 64",
+        "conseil_flowme": "La compassion authentique guérit autant celui qui la donne que celui qui la reçoit"
+    },
+    "Inspiration": {
+        "id": 29,
+        "famille_symbolique": "Souffle créateur",
+        "tension_dominante": "Inspirée, porteuse",
+        "mot_cle": "Inspiration",
+        "declencheurs": "Élan créateur qui monte",
+        "posture_adaptative": "Laisser l'inspiration agir; Ne pas la diriger",
+        "etats_compatibles": "2, 6, 7, 13, 16",
+        "etats_sequenciels": "13, 39, 53, 62",
+        "conseil_flowme": "L'inspiration vraie traverse celui qui la reçoit pour toucher le monde"
+    },
+    "Sagesse": {
+        "id": 30,
+        "famille_symbolique": "Compréhension mûrie",
+        "tension_dominante": "Sage, intégrée",
+        "mot_cle": "Sagesse",
+        "declencheurs": "Intégration d'expériences multiples",
+        "posture_adaptative": "Partager sans imposer; Éclairer sans éblouir",
+        "etats_compatibles": "6, 14, 15, 22, 61",
+        "etats_sequenciels": "61, 62, 63, 64",
+        "conseil_flowme": "La sagesse se reconnaît à sa simplicité et à sa justesse"
+    },
+    "Rigueur": {
+        "id": 31,
+        "famille_symbolique": "Exigence féconde",
+        "tension_dominante": "Exigeante, structurante",
+        "mot_cle": "Exigence",
+        "declencheurs": "Besoin de structure et précision",
+        "posture_adaptative": "Être rigoureux sans être rigide; Structurer sans enfermer",
+        "etats_compatibles": "5, 10, 15, 23, 27",
+        "etats_sequenciels": "23, 36, 38, 55",
+        "conseil_flowme": "La rigueur authentique libère en donnant une forme juste"
+    },
+    "Contemplation": {
+        "id": 32,
+        "famille_symbolique": "Regard profond",
+        "tension_dominante": "Contemplative, absorbée",
+        "mot_cle": "Contemplation",
+        "declencheurs": "Beauté ou mystère à contempler",
+        "posture_adaptative": "Se laisser absorber sans se perdre; Contempler sans posséder",
+        "etats_compatibles": "1, 19, 45, 52, 61",
+        "etats_sequenciels": "45, 52, 61, 64",
+        "conseil_flowme": "Contempler c'est laisser être ce qui est dans toute sa richesse"
+    },
+    "Altération des repères": {
+        "id": 33,
+        "famille_symbolique": "Déstabilisation nécessaire",
+        "tension_dominante": "Désorientée, flottante",
+        "mot_cle": "Déstabilisation",
+        "declencheurs": "Perte de références habituelles",
+        "posture_adaptative": "Accepter la désorientation; Ne pas se raccrocher aux anciens repères",
+        "etats_compatibles": "24, 25, 34, 47, 49",
+        "etats_sequenciels": "34, 47, 49, 52",
+        "conseil_flowme": "Perdre ses repères peut être le prélude à en découvrir de plus vastes"
+    },
+    "Perception élargie": {
+        "id": 34,
+        "famille_symbolique": "Vision expansée",
+        "tension_dominante": "Élargie, panoramique",
+        "mot_cle": "Expansion",
+        "declencheurs": "Ouverture perceptuelle soudaine",
+        "posture_adaptative": "Accueillir l'élargissement; Ne pas se perdre dans l'immensité",
+        "etats_compatibles": "3, 17, 33, 39, 41",
+        "etats_sequenciels": "39, 41, 42, 58",
+        "conseil_flowme": "Une perception élargie demande un centre stable pour ne pas se disperser"
+    },
+    "Ajustement souple": {
+        "id": 35,
+        "famille_symbolique": "Adaptation fluide",
+        "tension_dominante": "Souple, adaptative",
+        "mot_cle": "Fluidité",
+        "declencheurs": "Nécessité d'adaptation fine",
+        "posture_adaptative": "S'ajuster en permanence; Rester fluide sans perdre la direction",
+        "etats_compatibles": "18, 21, 36, 57, 63",
+        "etats_sequenciels": "36, 57, 63, 64",
+        "conseil_flowme": "L'ajustement souple unit la fermeté de l'intention et la souplesse des moyens"
+    },
+    "Présence ajustée": {
+        "id": 36,
+        "famille_symbolique": "Présence calibrée",
+        "tension_dominante": "Ajustée, précise",
+        "mot_cle": "Calibrage",
+        "declencheurs": "Besoin de présence juste",
+        "posture_adaptative": "Calibrer sa présence; Ni trop ni trop peu",
+        "etats_compatibles": "20, 23, 31, 35, 55",
+        "etats_sequenciels": "55, 56, 59, 63",
+        "conseil_flowme": "La présence ajustée donne exactement ce qui est nécessaire"
+    },
+    "Volonté excessive": {
+        "id": 37,
+        "famille_symbolique": "Force mal dirigée",
+        "tension_dominante": "Tendue, forcée",
+        "mot_cle": "Excès",
+        "declencheurs": "Résistance qui durcit la volonté",
+        "posture_adaptative": "Reconnaître l'excès; Relâcher progressivement la tension",
+        "etats_compatibles": "26, 27, 38, 50, 51",
+        "etats_sequenciels": "38, 50, 51, 52",
+        "conseil_flowme": "Quand la volonté devient excessive, c'est qu'elle a perdu sa justesse"
+    },
+    "Rigidité fonctionnelle": {
+        "id": 38,
+        "famille_symbolique": "Structure durcie",
+        "tension_dominante": "Rigide, crispée",
+        "mot_cle": "Rigidité",
+        "declencheurs": "Peur du changement",
+        "posture_adaptative": "Reconnaître la rigidité; Introduire de la souplesse graduellement",
+        "etats_compatibles": "27, 31, 37, 50, 51",
+        "etats_sequenciels": "50, 51, 52, 53",
+        "conseil_flowme": "La rigidité protège momentanément mais limite l'évolution"
+    },
+    "Vol d'altitude": {
+        "id": 39,
+        "famille_symbolique": "Élévation panoramique",
+        "tension_dominante": "Élevée, surplombante",
+        "mot_cle": "Élévation",
+        "declencheurs": "Besoin de perspective globale",
+        "posture_adaptative": "Prendre de la hauteur sans perdre le contact; Observer sans juger",
+        "etats_compatibles": "13, 29, 34, 40, 42",
+        "etats_sequenciels": "40, 42, 43, 58",
+        "conseil_flowme": "Prendre de l'altitude permet de voir les connexions invisibles depuis le sol"
+    },
+    "Retour porteur": {
+        "id": 40,
+        "famille_symbolique": "Redescente enrichie",
+        "tension_dominante": "Descendante, porteuse",
+        "mot_cle": "Retour",
+        "declencheurs": "Retour après élévation",
+        "posture_adaptative": "Redescendre en gardant l'acquis; Intégrer l'expérience d'altitude",
+        "etats_compatibles": "39, 42, 43, 56, 63",
+        "etats_sequenciels": "43, 56, 63, 64",
+        "conseil_flowme": "Le retour authentique ramène les trésors de l'altitude dans la vie ordinaire"
+    },
+    "Éveil d'empreinte": {
+        "id": 41,
+        "famille_symbolique": "Réveil de mémoire",
+        "tension_dominante": "Éveillante, révélatrice",
+        "mot_cle": "Éveil",
+        "declencheurs": "Résonance avec une empreinte ancienne",
+        "posture_adaptative": "Accueillir ce qui s'éveille; Ne pas forcer la mémoire",
+        "etats_compatibles": "2, 24, 34, 48, 49",
+        "etats_sequenciels": "42, 48, 49, 58",
+        "conseil_flowme": "Certains éveils révèlent ce qui était déjà là, endormi"
+    },
+    "Précipitation du sens": {
+        "id": 42,
+        "famille_symbolique": "Cristallisation rapide",
+        "tension_dominante": "Précipitante, condensante",
+        "mot_cle": "Cristallisation",
+        "declencheurs": "Compréhension soudaine",
+        "posture_adaptative": "Laisser se cristalliser; Ne pas forcer la formulation",
+        "etats_compatibles": "34, 39, 40, 43, 58",
+        "etats_sequenciels": "43, 44, 58, 59",
+        "conseil_flowme": "Quand le sens précipite, c'est que la solution était déjà présente"
+    },
+    "Retombée harmonique": {
+        "id": 43,
+        "famille_symbolique": "Résonance apaisée",
+        "tension_dominante": "Apaisante, harmonisante",
+        "mot_cle": "Harmonie",
+        "declencheurs": "Résolution d'une tension",
+        "posture_adaptative": "Accueillir l'apaisement; Laisser l'harmonie s'installer",
+        "etats_compatibles": "40, 42, 44, 60, 61",
+        "etats_sequenciels": "44, 60, 61, 64",
+        "conseil_flowme": "Après l'intensité, la retombée harmonique permet l'intégration"
+    },
+    "Geste résonant": {
+        "id": 44,
+        "famille_symbolique": "Action accordée",
+        "tension_dominante": "Accordée, juste",
+        "mot_cle": "Justesse",
+        "declencheurs": "Moment d'action juste",
+        "posture_adaptative": "Agir dans la justesse; Laisser le geste naître de l'accord",
+        "etats_compatibles": "8, 42, 43, 55, 56",
+        "etats_sequenciels": "55, 56, 59, 63",
+        "conseil_flowme": "Le geste résonant unit parfaitement l'intention et l'action"
+    },
+    "Disponibilité nue": {
+        "id": 45,
+        "famille_symbolique": "Ouverture totale",
+        "tension_dominante": "Nue, disponible",
+        "mot_cle": "Disponibilité",
+        "declencheurs": "Lâcher-prise total",
+        "posture_adaptative": "Être disponible sans attente; S'ouvrir sans se perdre",
+        "etats_compatibles": "1, 11, 12, 20, 32",
+        "etats_sequenciels": "52, 56, 61, 64",
+        "conseil_flowme": "La disponibilité nue est l'état le plus réceptif et le plus créateur"
+    },
+    "Choc d'ombre": {
+        "id": 46,
+        "famille_symbolique": "Révélation brutale",
+        "tension_dominante": "Choquante, révélatrice",
+        "mot_cle": "Révélation",
+        "declencheurs": "Découverte de ce qui était caché",
+        "posture_adaptative": "Accueillir le choc; Ne pas fuir ce qui se révèle",
+        "etats_compatibles": "24, 47, 49, 51, 53",
+        "etats_sequenciels": "47, 49, 51, 53",
+        "conseil_flowme": "Le choc d'ombre révèle ce que la lumière seule ne peut montrer"
+    },
+    "Dérive intérieure": {
+        "id": 47,
+        "famille_symbolique": "Errance interne",
+        "tension_dominante": "Dérivante, flottante",
+        "mot_cle": "Dérive",
+        "declencheurs": "Perte de direction interne",
+        "posture_adaptative": "Accepter la dérive; Faire confiance au courant profond",
+        "etats_compatibles": "25, 33, 46, 48, 49",
+        "etats_sequenciels": "48, 49, 52, 53",
+        "conseil_flowme": "Parfois il faut dériver pour découvrir des rivages inconnus"
+    },
+    "Remontée de mémoire ancienne": {
+        "id": 48,
+        "famille_symbolique": "Résurgence du passé",
+        "tension_dominante": "Remontante, révélatrice",
+        "mot_cle": "Mémoire",
+        "declencheurs": "Réactivation d'une mémoire profonde",
+        "posture_adaptative": "Accueillir ce qui remonte; Ne pas rejuger le passé",
+        "etats_compatibles": "9, 17, 25, 41, 47",
+        "etats_sequenciels": "41, 49, 52, 58",
+        "conseil_flowme": "Ce qui remonte du passé vient éclairer le présent"
+    },
+    "Résurgence incontrôlée": {
+        "id": 49,
+        "famille_symbolique": "Émergence chaotique",
+        "tension_dominante": "Incontrôlée, débordante",
+        "mot_cle": "Chaos",
+        "declencheurs": "Débordement émotionnel ou mental",
+        "posture_adaptative": "Ne pas lutter contre le chaos; Attendre que ça se pose",
+        "etats_compatibles": "25, 33, 41, 46, 47",
+        "etats_sequenciels": "50, 51, 52, 53",
+        "conseil_flowme": "Même le chaos porte en lui les germes d'un nouvel ordre"
+    },
+    "Saturation et perte d'adhérence": {
+        "id": 50,
+        "famille_symbolique": "Surcharge critique",
+        "tension_dominante": "Saturée, glissante",
+        "mot_cle": "Saturation",
+        "declencheurs": "Dépassement des capacités",
+        "posture_adaptative": "Reconnaître la saturation; Alléger progressivement",
+        "etats_compatibles": "26, 37, 38, 49, 51",
+        "etats_sequenciels": "51, 52, 53, 54",
+        "conseil_flowme": "La saturation signale qu'il est temps de simplifier et d'alléger"
+    },
+    "Fracture identitaire": {
+        "id": 51,
+        "famille_symbolique": "Rupture intérieure",
+        "tension_dominante": "Fracturée, divisée",
+        "mot_cle": "Fracture",
+        "declencheurs": "Contradiction interne majeure",
+        "posture_adaptative": "Accepter la fracture; Ne pas forcer l'unité prématurément",
+        "etats_compatibles": "37, 38, 46, 49, 50",
+        "etats_sequenciels": "52, 53, 54, 55",
+        "conseil_flowme": "Parfois il faut se briser pour se reconstruire plus authentiquement"
+    },
+    "Silence matriciel": {
+        "id": 52,
+        "famille_symbolique": "Silence créateur",
+        "tension_dominante": "Silencieuse, matricielle",
+        "mot_cle": "Silence",
+        "declencheurs": "Besoin de silence profond",
+        "posture_adaptative": "Habiter le silence; Laisser naître de la vacuité",
+        "etats_compatibles": "11, 19, 32, 45, 47",
+        "etats_sequenciels": "53, 54, 55, 61",
+        "conseil_flowme": "Le silence matriciel est le ventre où naissent les nouvelles formes"
+    },
+    "Tension du renouveau": {
+        "id": 53,
+        "famille_symbolique": "Poussée créatrice",
+        "tension_dominante": "Tendue, créatrice",
+        "mot_cle": "Renouveau",
+        "declencheurs": "Élan de renouvellement",
+        "posture_adaptative": "Accompagner la poussée; Ne pas précipiter la naissance",
+        "etats_compatibles": "13, 29, 46, 49, 52",
+        "etats_sequenciels": "54, 55, 56, 62",
+        "conseil_flowme": "Le renouveau authentique naît de la destruction créatrice de l'ancien"
+    },
+    "Première inclinaison": {
+        "id": 54,
+        "famille_symbolique": "Mouvement naissant",
+        "tension_dominante": "Naissante, orientée",
+        "mot_cle": "Orientation",
+        "declencheurs": "Première direction qui se dessine",
+        "posture_adaptative": "Suivre l'inclinaison; Ne pas forcer la direction",
+        "etats_compatibles": "50, 51, 52, 53, 55",
+        "etats_sequenciels": "55, 56, 57, 63",
+        "conseil_flowme": "La première inclinaison indique la direction naturelle du renouveau"
+    },
+    "Geste ténu": {
+        "id": 55,
+        "famille_symbolique": "Action délicate",
+        "tension_dominante": "Ténue, précise",
+        "mot_cle": "Délicatesse",
+        "declencheurs": "Situation demandant finesse",
+        "posture_adaptative": "Agir avec délicatesse; Doser finement l'intervention",
+        "etats_compatibles": "23, 36, 44, 52, 54",
+        "etats_sequenciels": "56, 57, 59, 63",
+        "conseil_flowme": "Les gestes les plus ténus peuvent avoir les effets les plus profonds"
+    },
+    "Reprise accordée": {
+        "id": 56,
+        "famille_symbolique": "Recommencement harmonieux",
+        "tension_dominante": "Accordée, renouvelée",
+        "mot_cle": "Reprise",
+        "declencheurs": "Nouveau départ possible",
+        "posture_adaptative": "Reprendre en gardant l'acquis; Recommencer autrement",
+        "etats_compatibles": "20, 28, 40, 44, 55",
+        "etats_sequenciels": "57, 59, 63, 64",
+        "conseil_flowme": "La reprise accordée unit l'expérience passée et l'élan nouveau"
+    },
+    "Dualité vivante": {
+        "id": 57,
+        "famille_symbolique": "Opposition créatrice",
+        "tension_dominante": "Duelle, créatrice",
+        "mot_cle": "Polarité",
+        "declencheurs": "Tensions opposées à intégrer",
+        "posture_adaptative": "Tenir les deux pôles; Ne pas choisir prématurément",
+        "etats_compatibles": "21, 35, 54, 55, 58",
+        "etats_sequenciels": "58, 59, 60, 63",
+        "conseil_flowme": "La dualité vivante génère une dynamique créatrice"
+    },
+    "Clarté paradoxale": {
+        "id": 58,
+        "famille_symbolique": "Évidence contradictoire",
+        "tension_dominante": "Claire, paradoxale",
+        "mot_cle": "Paradoxe",
+        "declencheurs": "Vérité paradoxale qui se révèle",
+        "posture_adaptative": "Accepter le paradoxe; Ne pas forcer la logique",
+        "etats_compatibles": "4, 14, 34, 42, 57",
+        "etats_sequenciels": "59, 60, 61, 64",
+        "conseil_flowme": "La clarté paradoxale révèle que la vérité dépasse souvent la logique"
+    },
+    "Inclusion active": {
+        "id": 59,
+        "famille_symbolique": "Intégration dynamique",
+        "tension_dominante": "Inclusive, active",
+        "mot_cle": "Inclusion",
+        "declencheurs": "Besoin d'intégrer tous les éléments",
+        "posture_adaptative": "Inclure sans diluer; Intégrer en gardant les spécificités",
+        "etats_compatibles": "1, 6, 22, 36, 56",
+        "etats_sequenciels": "60, 61, 63, 64",
+        "conseil_flowme": "L'inclusion active crée une unité qui respecte la diversité"
+    },
+    "Rythme paradoxal": {
+        "id": 60,
+        "famille_symbolique": "Tempo complexe",
+        "tension_dominante": "Rythmée, paradoxale",
+        "mot_cle": "Rythme",
+        "declencheurs": "Synchronisation complexe nécessaire",
+        "posture_adaptative": "Suivre le rythme paradoxal; Accepter les tempos contradictoires",
+        "etats_compatibles": "8, 18, 43, 57, 58",
+        "etats_sequenciels": "61, 62, 63, 64",
+        "conseil_flowme": "Le rythme paradoxal unit les contraires dans une danse unique"
+    },
+    "Plénitude tranquille": {
+        "id": 61,
+        "famille_symbolique": "Accomplissement serein",
+        "tension_dominante": "Pleine, tranquille",
+        "mot_cle": "Plénitude",
+        "declencheurs": "Sentiment d'accomplissement",
+        "posture_adaptative": "Habiter la plénitude; Goûter sans s'attacher",
+        "etats_compatibles": "19, 28, 30, 32, 43",
+        "etats_sequenciels": "62, 63, 64, 1",
+        "conseil_flowme": "La plénitude tranquille est un repos dans l'être"
+    },
+    "Rayonnement discret": {
+        "id": 62,
+        "famille_symbolique": "Influence subtile",
+        "tension_dominante": "Rayonnante, discrète",
+        "mot_cle": "Rayonnement",
+        "declencheurs": "Qualité qui veut se partager",
+        "posture_adaptative": "Rayonner sans ostentation; Influencer par l'être",
+        "etats_compatibles": "7, 16, 28, 29, 30",
+        "etats_sequenciels": "63, 64, 1, 2",
+        "conseil_flowme": "Le rayonnement discret touche sans forcer"
+    },
+    "Passage vivant": {
+        "id": 63,
+        "famille_symbolique": "Transition créatrice",
+        "tension_dominante": "Transitoire, créatrice",
+        "mot_cle": "Passage",
+        "declencheurs": "Moment de transition",
+        "posture_adaptative": "Habiter le passage; Ne pas précipiter l'arrivée",
+        "etats_compatibles": "21, 35, 40, 56, 60",
+        "etats_sequenciels": "64, 1, 2, 3",
+        "conseil_flowme": "Le passage vivant transforme en reliant"
+    },
+    "Porte ouverte": {
+        "id": 64,
+        "famille_symbolique": "Ouverture totale",
+        "tension_dominante": "Ouverte, accueillante",
+        "mot_cle": "Ouverture",
+        "declencheurs": "Disponibilité complète",
+        "posture_adaptative": "Être une porte ouverte; Accueillir tout ce qui vient",
+        "etats_compatibles": "1, 16, 22, 28, 30",
+        "etats_sequenciels": "1, 2, 3, 16",
+        "conseil_flowme": "Être porte ouverte, c'est offrir un passage entre les mondes"
+    }
+}
+
+# Présentation des états (couleur, icône) par identifiant : seuls les styles
+# documentés (docs/API.md) sont listés, les autres états prennent le style par défaut
+FLOWME_STATE_STYLES = {
+    8: ("#87CEEB", "🎵"),
+}
+
+# Style par défaut (identifiant inconnu)
+DEFAULT_STATE_STYLE = ("#708090", "🤔")
@@ -0,0 +1,206 @@
+"""
+Détection en flux des 64 états FlowMe pour les textes longs (journaux de plusieurs pages)
+Scores incrémentaux sur une fenêtre glissante de mots, trajectoire d'états par segment
+"""
+
+import os
+import re
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterable, List, Set, Tuple
+
+from core.scoring import ScoreVector
+from core.state_index import StateInvertedIndex, THEMATIC_WEIGHT
+
+STREAM_WINDOW_WORDS = int(os.getenv("STREAM_WINDOW_WORDS", "200"))
+STREAM_SEGMENT_WORDS = int(os.getenv("STREAM_SEGMENT_WORDS", "100"))
+
+# Mots séparés par des espaces (ponctuation comprise), sémantique de l'index des 64 états
+WORD_PATTERN = re.compile(r"\S+")
+
+
+class PhraseMatcher:
+    """
+    Motifs à plusieurs mots avec la sémantique de StateInvertedIndex.match :
+    sous-chaîne du texte casefold, ponctuation et espaces compris. Le texte
+    est examiné par régions successives (un mot et l'espace qui le précède) :
+    une occurrence est attribuée à la région où elle se termine, donc
+    comptée une seule fois.
+    """
+
+    def __init__(self, index: StateInvertedIndex):
+        self.phrases = list(index.phrase_patterns)
+        # Caractères de contexte à garder avant une région
+        self.max_chars = max((len(phrase) for phrase, _ in self.phrases), default=1)
+        # Mots (séparés par des espaces) que peut couvrir une occurrence
+        self.max_words = max((len(phrase.split()) for phrase, _ in self.phrases), default=1)
+
+    def match(self, text: str, region_start: int) -> List[int]:
+        """Motifs dont une occurrence dans `text` se termine après la position `region_start`"""
+        return [
+            pid for phrase, pid in self.phrases
+            if text.find(phrase, max(0, region_start - len(phrase) + 1)) != -1
+        ]
+
+
+class IncrementalScores:
+    """
+    Scores des 64 états d'un multiensemble de motifs, mis à jour à chaque
+    ajout ou retrait. Un motif ne compte qu'une fois, comme dans
+    StateInvertedIndex.score : ses poids ne sont ajoutés (ou retirés) que
+    lorsque son nombre d'occurrences passe de 0 à 1 (ou de 1 à 0). Les règles
+    thématiques suivent la même logique.
+    """
+
+    def __init__(self, index: StateInvertedIndex):
+        self.index = index
+        self.labels = tuple(index.state_names)
+        self._pattern_counts: Counter = Counter()
+        self._rule_counts: Counter = Counter()
+        self._scores = [0] * len(self.labels)
+
+    def add(self, pids: Iterable[int]):
+        for pid in pids:
+            self._pattern_counts[pid] += 1
+            if self._pattern_counts[pid] > 1:
+                continue
+            for state_idx, weight in self.index.postings[pid]:
+                self._scores[state_idx] += weight
+            for rule_idx in self.index.pattern_rules[pid]:
+                self._rule_counts[rule_idx] += 1
+                if self._rule_counts[rule_idx] == 1:
+                    for state_idx in self.index.rule_states[rule_idx]:
+                        self._scores[state_idx] += THEMATIC_WEIGHT
+
+    def remove(self, pids: Iterable[int]):
+        for pid in pids:
+            self._pattern_counts[pid] -= 1
+            if self._pattern_counts[pid] > 0:
+                continue
+            del self._pattern_counts[pid]
+            for state_idx, weight in self.index.postings[pid]:
+                self._scores[state_idx] -= weight
+            for rule_idx in self.index.pattern_rules[pid]:
+                self._rule_counts[rule_idx] -= 1
+                if self._rule_counts[rule_idx] == 0:
+                    del self._rule_counts[rule_idx]
+                    for state_idx in self.index.rule_states[rule_idx]:
+                        self._scores[state_idx] -= THEMATIC_WEIGHT
+
+    def vector(self) -> ScoreVector:
+        return ScoreVector(self.labels, tuple(self._scores))
+
+
+class StreamingStateDetector:
+    """
+    Le texte arrive par morceaux quelconques ; seuls les mots complets sont
+    traités (le dernier mot, éventuellement coupé, attend le morceau suivant).
+
+    Chaque mot entre dans une fenêtre glissante avec ses motifs. Le vecteur
+    de scores de la fenêtre (IncrementalScores) est mis à jour à l'entrée et
+    à la sortie de chaque mot. Tous les `segment_words` mots, l'état de la
+    fenêtre est émis comme segment.
+
+    La mémoire est bornée par la fenêtre et par la taille du lexique (motifs
+    vus dans tout le document, pour l'état global), pas par le document.
+    """
+
+    def __init__(
+        self,
+        index: StateInvertedIndex,
+        window_words: int = STREAM_WINDOW_WORDS,
+        segment_words: int = STREAM_SEGMENT_WORDS
+    ):
+        self.index = index
+        self.window_words = window_words
+        self.segment_words = segment_words
+        self.labels = tuple(index.state_names)
+
+        # Motifs à plusieurs mots, vérifiés sur la fin du texte déjà lu à l'arrivée de chaque mot
+        self._phrases = PhraseMatcher(index)
+
+        # Texte non consommé (espaces puis mot éventuellement coupé) et contexte des motifs à plusieurs mots
+        self._carry = ""
+        self._tail = ""
+        self._window: Deque[Tuple[int, ...]] = deque()
+        self._scores = IncrementalScores(index)
+        self._seen: Set[int] = set()
+        self.words = 0
+        self.segments = 0
+        self._segment_start = 0
+        self.trajectory_counts: Counter = Counter()
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consomme un morceau de texte, retourne les segments terminés"""
+        text = self._carry + chunk.casefold()
+        words = list(WORD_PATTERN.finditer(text))
+        # Le dernier mot peut continuer dans le morceau suivant
+        if words and not text[-1:].isspace():
+            words.pop()
+        segments = []
+        consumed = 0
+        for match in words:
+            segments.extend(self._push(text[consumed:match.start()], match.group()))
+            consumed = match.end()
+        # Espaces en attente : seuls les derniers caractères servent encore aux motifs à plusieurs mots
+        self._carry = text[consumed:]
+        if self._carry.isspace():
+            self._carry = self._carry[-self._phrases.max_chars:]
+        return segments
+
+    def finish(self) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Termine le flux : derniers segments et résumé du document"""
+        match = WORD_PATTERN.search(self._carry)
+        segments = self._push(self._carry[:match.start()], match.group()) if match else []
+        self._carry = ""
+        if self.words > self._segment_start:
+            segments.append(self._emit())
+        return segments, self.summary()
+
+    def _push(self, separator: str, word: str) -> List[Dict[str, Any]]:
+        pids = self.index.match_token(word)
+        text = self._tail + separator + word
+        pids.extend(self._phrases.match(text, len(self._tail)))
+        self._tail = text[-self._phrases.max_chars:]
+        pids = tuple(set(pids))
+
+        self._window.append(pids)
+        self._scores.add(pids)
+        self._seen.update(pids)
+        if len(self._window) > self.window_words:
+            self._scores.remove(self._window.popleft())
+
+        self.words += 1
+        if self.words - self._segment_start >= self.segment_words:
+            return [self._emit()]
+        return []
+
+    def window_vector(self) -> ScoreVector:
+        """Scores de la fenêtre courante"""
+        return self._scores.vector()
+
+    def _emit(self) -> Dict[str, Any]:
+        vector = self.window_vector()
+        segment = {
+            "segment": self.segments,
+            "start_word": self._segment_start,
+            "end_word": self.words,
+            "state": vector.primary,
+            "score": vector.max_score,
+            "top_states": [{"state": name, "score": score} for name, score in vector.ranked(3)]
+        }
+        self.trajectory_counts[vector.primary] += 1
+        self.segments += 1
+        self._segment_start = self.words
+        return segment
+
+    def summary(self) -> Dict[str, Any]:
+        """État global (tous les motifs vus, même sémantique que la détection d'un message) et répartition des segments"""
+        overall = ScoreVector.from_scores(self.labels, self.index.score_hits(self._seen))
+        return {
+            "overall_state": overall.primary,
+            "overall_top_states": [{"state": name, "score": score} for name, score in overall.ranked(3)],
+            "total_words": self.words,
+            "total_segments": self.segments,
+            "segment_states": dict(self.trajectory_counts.most_common())
+        }
+
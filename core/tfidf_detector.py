@@ -0,0 +1,160 @@
+"""
+Détecteur TF-IDF de n-grammes de caractères sur les 64 états FlowMe
+Similarité cosinus creuse en NumPy, tolérante aux flexions ("stressée", "découvrir")
+"""
+
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from core.message import MessageLike, as_message
+from core.scoring import ScoreVector
+
+logger = logging.getLogger(__name__)
+
+# Champs textuels décrivant un état (le nom de l'état est ajouté)
+STATE_TEXT_FIELDS = (
+    "famille_symbolique", "tension_dominante", "mot_cle", "declencheurs",
+    "posture_adaptative", "conseil_flowme"
+)
+
+DEFAULT_NGRAM_RANGE = (3, 5)
+
+# Mots grammaticaux ignorés (forme sans accents), sinon ils dominent les petits messages
+STOP_WORDS = frozenset("""
+    a au aux avec c ce ces cette d dans de des du elle en est et etre il ils j je l la le les
+    leur lui m ma me mes moi mon n ne nous on ou par pas pour qu que qui s sa se ses son sur
+    t ta te tes toi ton tu un une vous y
+""".split())
+
+
+def char_ngrams(text: MessageLike, ngram_range: Tuple[int, int]) -> Counter:
+    """N-grammes de caractères par mot (forme sans accents), bornés par des espaces (" mot ")"""
+    counts: Counter = Counter()
+    min_n, max_n = ngram_range
+    for word in as_message(text).key_words:
+        if word in STOP_WORDS:
+            continue
+        padded = f" {word} "
+        for n in range(min_n, max_n + 1):
+            for start in range(len(padded) - n + 1):
+                counts[padded[start:start + n]] += 1
+    return counts
+
+
+class NgramTfidfDetector:
+    """
+    Chaque état est un document (nom + champs textuels). Les vecteurs TF-IDF
+    des états sont normalisés L2 et rangés en matrice (vocabulaire x 64) : un
+    message ne touche que les lignes de ses n-grammes connus, la similarité
+    cosinus est un produit entre ces quelques lignes et les poids du message.
+    """
+
+    # N-grammes par bloc de scoring par lots : 16384 x 64 float32 = 4 Mo de contributions
+    chunk_ngrams = 16384
+
+    def __init__(
+        self,
+        states: Dict[str, Dict[str, Any]],
+        ngram_range: Tuple[int, int] = DEFAULT_NGRAM_RANGE,
+        min_similarity: float = 0.08,
+        default: str = "Présence"
+    ):
+        self.state_names = tuple(states)
+        self.ngram_range = ngram_range
+        self.min_similarity = min_similarity
+        self.default = default
+
+        documents = [
+            char_ngrams(" ".join([name] + [str(data.get(field, "")) for field in STATE_TEXT_FIELDS]), ngram_range)
+            for name, data in states.items()
+        ]
+
+        self.vocabulary: Dict[str, int] = {}
+        for document in documents:
+            for ngram in document:
+                self.vocabulary.setdefault(ngram, len(self.vocabulary))
+
+        n_docs = len(documents)
+        document_frequency = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for document in documents:
+            document_frequency[[self.vocabulary[ngram] for ngram in document]] += 1
+        self.idf = (np.log((1 + n_docs) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        matrix = np.zeros((len(self.vocabulary), n_docs), dtype=np.float32)
+        for state_idx, document in enumerate(documents):
+            columns = np.fromiter((self.vocabulary[ngram] for ngram in document), dtype=np.int64)
+            counts = np.fromiter(document.values(), dtype=np.float32)
+            matrix[columns, state_idx] = counts * self.idf[columns]
+        norms = np.linalg.norm(matrix, axis=0)
+        self.weights = matrix / np.where(norms > 0, norms, 1)
+
+        logger.info(
+            f"🔤 Détecteur TF-IDF construit: {len(self.vocabulary)} n-grammes x {n_docs} états "
+            f"({self.weights.nbytes // 1024} Ko)"
+        )
+
+    def _query(self, text: MessageLike) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices et poids TF-IDF normalisés des n-grammes connus du message"""
+        counts = char_ngrams(text, self.ngram_range)
+        pairs = [(self.vocabulary[ngram], count) for ngram, count in counts.items() if ngram in self.vocabulary]
+        if not pairs:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        indices = np.fromiter((index for index, _ in pairs), dtype=np.int64, count=len(pairs))
+        values = np.fromiter((count for _, count in pairs), dtype=np.float32, count=len(pairs)) * self.idf[indices]
+        return indices, values / np.linalg.norm(values)
+
+    def similarities(self, text: MessageLike) -> np.ndarray:
+        """Similarité cosinus du message avec chacun des 64 états"""
+        indices, values = self._query(text)
+        if indices.size == 0:
+            return np.zeros(len(self.state_names), dtype=np.float32)
+        return values @ self.weights[indices]
+
+    def similarity_matrix(self, texts: Sequence[MessageLike]) -> np.ndarray:
+        """Similarités (N x 64) d'un lot : matrice creuse des requêtes x matrice des états, par blocs"""
+        result = np.zeros((len(texts), len(self.state_names)), dtype=np.float32)
+        rows, indices, values = [], [], []
+        pending = 0
+        for row, text in enumerate(texts):
+            query_indices, query_values = self._query(text)
+            if query_indices.size == 0:
+                continue
+            rows.append(np.full(query_indices.size, row, dtype=np.int64))
+            indices.append(query_indices)
+            values.append(query_values)
+            pending += query_indices.size
+            # Bloc borné en n-grammes : la matrice intermédiaire (n-grammes x 64) reste de taille fixe
+            if pending >= self.chunk_ngrams:
+                self._accumulate(result, rows, indices, values)
+                rows, indices, values = [], [], []
+                pending = 0
+        if pending:
+            self._accumulate(result, rows, indices, values)
+        return result
+
+    def _accumulate(self, result: np.ndarray, rows: List[np.ndarray], indices: List[np.ndarray], values: List[np.ndarray]):
+        rows = np.concatenate(rows)
+        indices = np.concatenate(indices)
+        values = np.concatenate(values)
+        contributions = values[:, None] * self.weights[indices]
+        # Les n-grammes sont groupés par message : somme par segment de lignes
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        result[rows[starts]] = np.add.reduceat(contributions, starts, axis=0)
+
+    def _vector(self, similarities: np.ndarray) -> ScoreVector:
+        # Sous le seuil de similarité, aucun état n'est retenu (défaut "Présence")
+        kept = np.where(similarities >= self.min_similarity, similarities, 0)
+        return ScoreVector(self.state_names, tuple(float(value) for value in kept), self.default)
+
+    def score(self, text: MessageLike) -> ScoreVector:
+        return self._vector(self.similarities(text))
+
+    def score_batch(self, texts: Sequence[MessageLike]) -> List[ScoreVector]:
+        return [self._vector(row) for row in self.similarity_matrix(texts)]
+
+    def detect_emotion(self, text: MessageLike) -> str:
+        return self.score(text).primary
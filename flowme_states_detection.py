@@ -1,147 +1,110 @@
+import logging
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+
+from core.aho_corasick import AhoCorasickAutomaton
+from core.artifact import compile_states, emotion_sources, load_or_build, states_sources
+from core.detection_cache import detection_cache, fingerprint
+from core.fuzzy_lexicon import FUZZY_MODE, DeletionIndex
+from core.lexicon import CATEGORY_WEIGHTS, CONTEXT_MARKERS, EMOTION_KEYWORDS, INTENSITY_MODIFIERS, NEGATIONS
+from core.message import MessageLike, NormalizedMessage, as_message, normalize_message
+from core.scope_engine import ScopeEngine
+from core.scoring import ScoreVector
+from core.states_table import DEFAULT_STATE_STYLE, FLOWME_64_STATES, FLOWME_STATE_STYLES
+
+logger = logging.getLogger(__name__)
+
+# Seuils du niveau d'intensité (produit des modificateurs et des points d'exclamation)
+STRONG_INTENSITY = 1.4
+WEAK_INTENSITY = 0.85
+
+
+def compile_emotion_lexicon(
+    emotion_keywords: Dict[str, Dict[str, List[str]]],
+    intensity_modifiers: Dict[str, float],
+    negations: List[str],
+    fuzzy: bool = FUZZY_MODE == "on"
+) -> Tuple[AhoCorasickAutomaton, Dict[str, List[Tuple[int, int]]], ScopeEngine, Optional[DeletionIndex]]:
+    """Compile les mots-clés dans un automate (et un index tolérant aux fautes si activé) et les modificateurs dans le moteur de portée"""
+    automaton = AhoCorasickAutomaton(
+        word for categories in emotion_keywords.values()
+        for words in categories.values() for word in words
+    )
+    ids = automaton.pattern_ids
+    
+    # Par émotion : (motif, poids) dans l'ordre du lexique
+    keyword_postings = {
+        emotion: [
+            (ids[word], CATEGORY_WEIGHTS[category])
+            for category, words in categories.items()
+            for word in words
+        ]
+        for emotion, categories in emotion_keywords.items()
+    }
+    fuzzy_index = DeletionIndex((word, pid) for word, pid in ids.items() if " " not in word) if fuzzy else None
+    return automaton, keyword_postings, ScopeEngine(intensity_modifiers, negations), fuzzy_index
+
+
 class EnhancedEmotionDetection:
-    def __init__(self, states_data: Dict[str, Any]):
+    def __init__(self, states_data: Dict[str, Any], fuzzy: bool = FUZZY_MODE == "on"):
         self.states = states_data
+        self.fuzzy_lookup = fuzzy
         
-        # Dictionnaire étendu avec scores pondérés
-        self.emotion_keywords = {
-            "Joie": {
-                "primary": ["heureux", "content", "joyeux", "rayonnant", "épanoui"], # Score: 3
-                "secondary": ["super", "génial", "parfait", "excellent", "formidable"], # Score: 2
-                "context": ["sourire", "rire", "célébrer", "victoire", "succès"] # Score: 1
-            },
-            "Tristesse": {
-                "primary": ["triste", "malheureux", "déprimé", "abattu", "mélancolique"],
-                "secondary": ["sombre", "morose", "désespéré", "découragé"],
-                "context": ["pleurer", "larmes", "chagrin", "peine", "deuil"]
-            },
-            "Colère": {
-                "primary": ["énervé", "furieux", "irrité", "fâché", "exaspéré"],
-                "secondary": ["agacé", "contrarié", "remonté", "ulcéré"],
-                "context": ["rage", "violence", "injustice", "révolte", "frustration"]
-            },
-            "Peur": {
-                "primary": ["peur", "anxieux", "stressé", "inquiet", "terrorisé"],
-                "secondary": ["nerveux", "angoissé", "préoccupé", "troublé"],
-                "context": ["panique", "phobique", "danger", "menace", "insécurité"]
-            },
-            "Amour": {
-                "primary": ["amour", "aimer", "adorer", "chérir", "passion"],
-                "secondary": ["affection", "tendresse", "attachement", "dévotion"],
-                "context": ["cœur", "romantique", "câlin", "bisou", "famille"]
-            },
-            "Espoir": {
-                "primary": ["espoir", "optimiste", "confiant", "positif", "encourageant"],
-                "secondary": ["perspective", "avenir", "amélioration", "projet"],
-                "context": ["rêver", "aspirer", "croire", "motivation", "ambition"]
-            },
-            "Présence": {
-                "primary": ["présent", "ici", "maintenant", "conscience", "attentif"],
-                "secondary": ["moment", "instant", "focus", "concentration"],
-                "context": ["méditation", "pleine conscience", "être", "existence"]
-            },
-            "Nostalgie": {
-                "primary": ["nostalgie", "passé", "souvenir", "autrefois", "jadis"],
-                "secondary": ["regret", "mélancolie", "hier", "avant"],
-                "context": ["enfance", "jeunesse", "époque", "temps", "mémoire"]
-            },
-            "Curiosité": {
-                "primary": ["curieux", "intéressé", "découvrir", "explorer", "questionner"],
-                "secondary": ["apprendre", "comprendre", "savoir", "étudier"],
-                "context": ["pourquoi", "comment", "recherche", "investigation"]
-            },
-            "Sérénité": {
-                "primary": ["serein", "calme", "paisible", "tranquille", "apaisé"],
-                "secondary": ["zen", "relaxé", "détendu", "équilibré"],
-                "context": ["paix", "harmonie", "quiétude", "repos", "silence"]
-            }
-        }
-        
-        # Modificateurs contextuels
-        self.intensity_modifiers = {
-            "très": 1.5, "vraiment": 1.3, "super": 1.4, "hyper": 1.6,
-            "un peu": 0.7, "légèrement": 0.6, "plutôt": 0.8,
-            "extrêmement": 2.0, "complètement": 1.8, "totalement": 1.8
-        }
+        # Lexique pondéré, modificateurs contextuels et négations
+        self.emotion_keywords = EMOTION_KEYWORDS
+        self.intensity_modifiers = INTENSITY_MODIFIERS
+        self.negations = NEGATIONS
         
-        # Négations
-        self.negations = ["ne", "pas", "plus", "jamais", "aucun", "sans", "ni"]
+        self._compile_lexicon()
     
-    def detect_emotion(self, text: str) -> str:
-        """Détection d'émotion avec scoring pondéré"""
-        text_lower = text.lower()
-        words = text_lower.split()
-        
-        emotion_scores = {}
-        
-        # Analyser chaque émotion
-        for emotion, categories in self.emotion_keywords.items():
-            score = 0
-            
-            # Mots primaires (score 3)
-            for word in categories["primary"]:
-                if word in text_lower:
-                    score += 3 * self._get_context_multiplier(text_lower, word)
-            
-            # Mots secondaires (score 2)
-            for word in categories["secondary"]:
-                if word in text_lower:
-                    score += 2 * self._get_context_multiplier(text_lower, word)
-            
-            # Mots contextuels (score 1)
-            for word in categories["context"]:
-                if word in text_lower:
-                    score += 1 * self._get_context_multiplier(text_lower, word)
-            
-            if score > 0:
-                emotion_scores[emotion] = score
+    def _compile_lexicon(self):
+        """Structures compilées : artefact de build si à jour, sinon compilation à la volée"""
+        lexicon = (self.emotion_keywords, self.intensity_modifiers, self.negations, self.fuzzy_lookup)
+        self.automaton, self._keyword_postings, self.scope_engine, self.fuzzy = load_or_build(
+            "emotion_lexicon", emotion_sources(*lexicon), lambda: compile_emotion_lexicon(*lexicon)
+        )
         
-        # Retourner l'émotion avec le score le plus élevé
-        if emotion_scores:
-            return max(emotion_scores, key=emotion_scores.get)
-        
-        return "Présence"  # Défaut
+        # Jeton de version pour le cache de détection
+        self.version = (
+            f"emotions:{fingerprint(self.emotion_keywords, self.intensity_modifiers, self.negations)}"
+            + (":fuzzy" if self.fuzzy_lookup else "")
+        )
     
-    def _get_context_multiplier(self, text: str, word: str) -> float:
-        """Calcule le multiplicateur basé sur le contexte"""
-        multiplier = 1.0
-        
-        # Chercher les modificateurs d'intensité
-        for modifier, value in self.intensity_modifiers.items():
-            if modifier in text and abs(text.index(modifier) - text.index(word)) < 20:
-                multiplier *= value
-        
-        # Vérifier les négations
-        for negation in self.negations:
-            if negation in text and abs(text.index(negation) - text.index(word)) < 15:
-                multiplier *= 0.3  # Réduire fortement le score
-        
-        return multiplier
+    def detect_emotion(self, text: MessageLike) -> str:
+        """Détection d'émotion avec scoring pondéré (via le cache LRU)"""
+        return detection_cache.get_or_compute(text, self.version, self._detect_uncached)
     
-    def get_emotion_confidence(self, text: str) -> Dict[str, float]:
-        """Retourne les scores de confiance pour toutes les émotions"""
-        text_lower = text.lower()
-        emotion_scores = {}
+    def _detect_uncached(self, text: MessageLike) -> str:
+        # Émotion avec le score le plus élevé, "Présence" par défaut
+        return self.score(text).primary
+    
+    def score(self, text: MessageLike) -> ScoreVector:
+        """Vecteur de scores bruts, calculé une seule fois par message"""
+        return ScoreVector.from_scores(self.emotion_keywords, self._score_emotions(as_message(text)))
+    
+    def _score_emotions(self, message: NormalizedMessage) -> Dict[str, float]:
+        """Scores bruts de toutes les émotions : le découpage en mots du message et une passe de l'automate"""
+        tokens = message.tokens
+        hits = list(self.automaton.iter_matches(message.folded))
+        # Les mots sans occurrence exacte sont corrigés ("anxieu" -> "anxieux")
+        if self.fuzzy is not None:
+            hits.extend(self.fuzzy.correct_tokens(tokens, [start for start, _ in hits]))
+        multipliers = self.scope_engine.multipliers(tokens, hits)
         
-        for emotion, categories in self.emotion_keywords.items():
+        emotion_scores = {}
+        for emotion, postings in self._keyword_postings.items():
             score = 0
-            
-            for word in categories["primary"]:
-                if word in text_lower:
-                    score += 3 * self._get_context_multiplier(text_lower, word)
-            
-            for word in categories["secondary"]:
-                if word in text_lower:
-                    score += 2 * self._get_context_multiplier(text_lower, word)
-            
-            for word in categories["context"]:
-                if word in text_lower:
-                    score += 1 * self._get_context_multiplier(text_lower, word)
-            
+            for pid, weight in postings:
+                multiplier = multipliers.get(pid)
+                if multiplier is not None:
+                    score += weight * multiplier
             emotion_scores[emotion] = score
         
+        return emotion_scores
+    
+    def get_emotion_confidence(self, text: MessageLike) -> Dict[str, float]:
+        """Retourne les scores de confiance pour toutes les émotions"""
         # Normaliser les scores (0-1)
-        max_score = max(emotion_scores.values()) if emotion_scores.values() else 1
-        return {emotion: score/max_score for emotion, score in emotion_scores.items()}
+        return self.score(text).confidences()
 
 
 # Exemple d'utilisation dans votre classe FlowMeStatesDetection
@@ -152,21 +115,147 @@ class FlowMeStatesDetection:
         self.enhanced_detector = EnhancedEmotionDetection(states_data)
         logger.info(f"✅ FlowMe initialisé - {len(states_data)} états - Source: {source}")
     
-    def detect_emotion(self, text: str) -> str:
+    def detect_emotion(self, text: MessageLike) -> str:
         return self.enhanced_detector.detect_emotion(text)
     
-    def get_emotion_analysis(self, text: str) -> Dict[str, Any]:
-        """Analyse complète avec scores de confiance"""
-        detected = self.enhanced_detector.detect_emotion(text)
-        confidence_scores = self.enhanced_detector.get_emotion_confidence(text)
+    def get_emotion_analysis(self, text: MessageLike) -> Dict[str, Any]:
+        """Analyse complète avec scores de confiance (un seul scoring du message)"""
+        vector = self.enhanced_detector.score(text)
+        detected = vector.primary
+        confidence_scores = vector.confidences()
         
         return {
             "primary_emotion": detected,
             "confidence_scores": confidence_scores,
             "confidence_level": confidence_scores.get(detected, 0),
-            "alternative_emotions": sorted(
-                [(emotion, score) for emotion, score in confidence_scores.items() 
-                 if emotion != detected and score > 0.3],
-                key=lambda x: x[1], reverse=True
-            )[:3]
+            "alternative_emotions": vector.top(3, min_confidence=0.3, exclude_primary=True)
+        }
+
+
+class CompiledStatesEngine:
+    """
+    API fonctionnelle des 64 états (utilisée par FlowMeCore) : détection via
+    l'index inversé compilé, métadonnées dans des tables indexées par
+    identifiant d'état, analyse de contexte en un seul parcours des mots.
+    """
+
+    def __init__(self, states: Dict[str, Dict[str, Any]] = FLOWME_64_STATES):
+        self.index, _ = load_or_build("states_64", states_sources(states), lambda: compile_states(states))
+        # Même jeton de version que Enhanced64StatesDetection : entrées du cache partagées
+        self.version = f"64:{fingerprint(states)}"
+        self.emotions = EnhancedEmotionDetection(states)
+        
+        self.default_id = next(iter(states.values()))["id"]
+        self.ids_by_name = {name: data["id"] for name, data in states.items()}
+        self.names = {data["id"]: name for name, data in states.items()}
+        self.advice = {
+            data["id"]: f"{FLOWME_STATE_STYLES.get(data['id'], DEFAULT_STATE_STYLE)[1]} {data['conseil_flowme']}"
+            for data in states.values()
+        }
+        # États compatibles ou séquentiels de chaque état
+        self.related: Dict[int, FrozenSet[int]] = {
+            data["id"]: frozenset(
+                int(value) for field in ("etats_compatibles", "etats_sequenciels")
+                for value in data[field].split(",") if value.strip().isdigit()
+            )
+            for data in states.values()
+        }
+        
+        self.context_markers: Dict[Tuple[str, ...], str] = {
+            tuple(normalize_message(marker).split()): flag
+            for flag, markers in CONTEXT_MARKERS.items() for marker in markers
+        }
+        self.modifiers: Dict[Tuple[str, ...], float] = {
+            tuple(normalize_message(modifier).split()): value
+            for modifier, value in INTENSITY_MODIFIERS.items()
         }
+    
+    def detect(self, message: MessageLike, context: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Identifiant de l'état détecté. Si le contexte donne l'état précédent
+        ("previous_state"), les égalités de score sont départagées en faveur
+        de ses états compatibles ou séquentiels.
+        """
+        message = as_message(message)
+        previous = (context or {}).get("previous_state")
+        if previous not in self.related:
+            name = detection_cache.get_or_compute(message, self.version, self._detect_uncached)
+            return self.ids_by_name[name]
+        
+        vector = ScoreVector.from_scores(self.index.state_names, self.index.score(message))
+        if vector.max_score <= 0:
+            return self.default_id
+        tied = [self.ids_by_name[name] for name, score in zip(vector.labels, vector.scores) if score == vector.max_score]
+        return next((state_id for state_id in tied if state_id in self.related[previous]), tied[0])
+    
+    def _detect_uncached(self, message: MessageLike) -> str:
+        return ScoreVector.from_scores(self.index.state_names, self.index.score(message)).primary
+    
+    def analyze_context(self, message: MessageLike) -> Dict[str, Any]:
+        """Indicateurs de contexte et intensité, en un parcours des mots du message"""
+        message = as_message(message)
+        flags = set()
+        intensity = 1.0
+        previous_word = None
+        for word in message.key_words:
+            for words in ((word,), (previous_word, word)):
+                flag = self.context_markers.get(words)
+                if flag:
+                    flags.add(flag)
+                intensity *= self.modifiers.get(words, 1.0)
+            previous_word = word
+        intensity *= 1.2 ** min(message.text.count("!"), 3)
+        
+        dominant = self.emotions.detect_emotion(message)
+        return {
+            "has_violence": "violence" in flags,
+            "has_love": "love" in flags,
+            "has_contradiction": "contradiction" in flags,
+            "dominant_emotion": dominant.lower(),
+            "intensity": (
+                "forte" if intensity >= STRONG_INTENSITY
+                else "faible" if intensity <= WEAK_INTENSITY
+                else "moyenne"
+            )
+        }
+
+
+_states_engine: Optional[CompiledStatesEngine] = None
+
+
+def get_states_engine() -> CompiledStatesEngine:
+    """Moteur partagé, compilé (ou chargé depuis l'artefact) au premier appel"""
+    global _states_engine
+    if _states_engine is None:
+        _states_engine = CompiledStatesEngine()
+    return _states_engine
+
+
+def detect_flowme_state_improved(message: MessageLike, context: Optional[Dict[str, Any]] = None) -> int:
+    """Identifiant (1-64) de l'état FlowMe détecté dans le message"""
+    return get_states_engine().detect(message, context)
+
+
+def get_state_description(state_id: int) -> str:
+    """Nom de l'état"""
+    engine = get_states_engine()
+    return engine.names.get(state_id, engine.names[engine.default_id])
+
+
+def get_state_advice(state_id: int) -> str:
+    """Conseil FlowMe de l'état, précédé de son icône"""
+    engine = get_states_engine()
+    return engine.advice.get(state_id, engine.advice[engine.default_id])
+
+
+def get_state_color(state_id: int) -> str:
+    return FLOWME_STATE_STYLES.get(state_id, DEFAULT_STATE_STYLE)[0]
+
+
+def get_state_icon(state_id: int) -> str:
+    return FLOWME_STATE_STYLES.get(state_id, DEFAULT_STATE_STYLE)[1]
+
+
+def analyze_message_context(message: MessageLike) -> Dict[str, Any]:
+    """Violence, amour, contradiction, émotion dominante et intensité du message"""
+    return get_states_engine().analyze_context(message)
@@ -1,729 +1,39 @@
 import os
 import json
-import httpx
+import codecs
+import asyncio
 import logging
 import time
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
-from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import AsyncIterator, Dict, Any, Optional, List, Tuple
 import uvicorn
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 from dataclasses import dataclass, asdict
 
+from core.states_table import FLOWME_64_STATES
+from core.artifact import compiled_artifact
+from core.detection_cache import detection_cache
+from core.detection_executor import detection_executor
+from core.http_pool import http_pool
+from core.incremental_detection import IncrementalStateDetector
+from core.message import NormalizedMessage
+from core.response_cache import response_cache
+from core.scoring import ScoreVector
+from core.sequence_smoothing import SEQUENCE_MODE, SequenceSmoother
+from core.shadow import ShadowDetection
+from core.single_flight import mistral_single_flight, payload_key
+from core.states_detection import Enhanced64StatesDetection
+from core.streaming_detection import STREAM_SEGMENT_WORDS, STREAM_WINDOW_WORDS, StreamingStateDetector
+from flowme_states_detection import EnhancedEmotionDetection
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# ========== 64 ÉTATS COMPLETS INTÉGRÉS ==========
-FLOWME_64_STATES = {
-    "Présence": {
-        "id": 1,
-        "famille_symbolique": "Écoute subtile",
-        "tension_dominante": "Latente, intérieure",
-        "mot_cle": "Perception",
-        "declencheurs": "Léger malaise",
-        "posture_adaptative": "Suspendre tout traitement analytique immédiat; Observer les signaux faibles",
-        "etats_compatibles": "8, 32, 45, 59, 64",
-        "etats_sequenciels": "2, 8, 10, 11",
-        "conseil_flowme": "Quand tout semble brumeux, c'est dans le silence que la clarté peut émerger"
-    },
-    "Éveil": {
-        "id": 2,
-        "famille_symbolique": "Fraîcheur neuve",
-        "tension_dominante": "Émergente, vivifiante",
-        "mot_cle": "Découverte",
-        "declencheurs": "Signal nouveau, révélation",
-        "posture_adaptative": "Accueillir sans précipitation; Laisser l'information se déployer",
-        "etats_compatibles": "1, 3, 16, 29, 41",
-        "etats_sequenciels": "3, 4, 14, 16",
-        "conseil_flowme": "Ce qui naît en vous cherche à être reconnu, pas analysé"
-    },
-    "Curiosité": {
-        "id": 3,
-        "famille_symbolique": "Élan vers l'inconnu",
-        "tension_dominante": "Orientée, exploratrice",
-        "mot_cle": "Investigation",
-        "declencheurs": "Question émergente, mystère",
-        "posture_adaptative": "Suivre l'élan sans forcer; Questionner avec délicatesse",
-        "etats_compatibles": "2, 9, 17, 26, 34",
-        "etats_sequenciels": "4, 5, 13, 17",
-        "conseil_flowme": "La vraie curiosité ne cherche pas de réponses immédiates, elle s'émerveille du questionnement"
-    },
-    "Étonnement": {
-        "id": 4,
-        "famille_symbolique": "Suspension admirative",
-        "tension_dominante": "Ouverte, réceptive",
-        "mot_cle": "Surprise",
-        "declencheurs": "Inattendu, révélation soudaine",
-        "posture_adaptative": "Rester dans la surprise; Ne pas immédiatement comprendre",
-        "etats_compatibles": "2, 3, 16, 24, 58",
-        "etats_sequenciels": "5, 14, 16, 24",
-        "conseil_flowme": "L'étonnement est la porte d'entrée vers une compréhension plus vaste"
-    },
-    "Analyse": {
-        "id": 5,
-        "famille_symbolique": "Dissection lucide",
-        "tension_dominante": "Focalisée, pénétrante",
-        "mot_cle": "Discernement",
-        "declencheurs": "Complexité à démêler",
-        "posture_adaptative": "Analyser sans perdre la vue d'ensemble; Garder la nuance",
-        "etats_compatibles": "6, 15, 23, 31, 58",
-        "etats_sequenciels": "6, 14, 15, 23",
-        "conseil_flowme": "Analyser c'est éclairer, pas réduire"
-    },
-    "Synthèse": {
-        "id": 6,
-        "famille_symbolique": "Unification créatrice",
-        "tension_dominante": "Rassembleuse, intégrative",
-        "mot_cle": "Cohérence",
-        "declencheurs": "Éléments dispersés à relier",
-        "posture_adaptative": "Laisser émerger les connexions; Ne pas forcer l'unification",
-        "etats_compatibles": "5, 7, 22, 29, 59",
-        "etats_sequenciels": "7, 14, 22, 30",
-        "conseil_flowme": "La synthèse authentique naît d'elle-même quand les éléments sont mûrs"
-    },
-    "Intuition": {
-        "id": 7,
-        "famille_symbolique": "Connaissance directe",
-        "tension_dominante": "Spontanée, révélatrice",
-        "mot_cle": "Évidence",
-        "declencheurs": "Savoir sans savoir pourquoi",
-        "posture_adaptative": "Faire confiance à ce qui se présente; Ne pas justifier immédiatement",
-        "etats_compatibles": "6, 8, 14, 29, 62",
-        "etats_sequenciels": "8, 14, 30, 62",
-        "conseil_flowme": "L'intuition parle d'abord, la raison comprend ensuite"
-    },
-    "Résonance": {
-        "id": 8,
-        "famille_symbolique": "Vibration accordée",
-        "tension_dominante": "Harmonisante, sympathique",
-        "mot_cle": "Accord",
-        "declencheurs": "Correspondance profonde",
-        "posture_adaptative": "S'accorder sans se perdre; Vibrer ensemble tout en restant soi",
-        "etats_compatibles": "1, 7, 12, 44, 60",
-        "etats_sequenciels": "12, 28, 44, 61",
-        "conseil_flowme": "Résonner c'est reconnaître ce qui en vous répond à ce qui vous touche"
-    },
-    "Doute": {
-        "id": 9,
-        "famille_symbolique": "Questionnement fertile",
-        "tension_dominante": "Interrogative, prudente",
-        "mot_cle": "Incertitude",
-        "declencheurs": "Remise en question nécessaire",
-        "posture_adaptative": "Accueillir l'incertitude; Ne pas précipiter les certitudes",
-        "etats_compatibles": "3, 10, 17, 25, 48",
-        "etats_sequenciels": "10, 11, 17, 25",
-        "conseil_flowme": "Le doute intelligent protège de l'erreur et ouvre à la découverte"
-    },
-    "Prudence": {
-        "id": 10,
-        "famille_symbolique": "Sage retenue",
-        "tension_dominante": "Mesurée, protectrice",
-        "mot_cle": "Circonspection",
-        "declencheurs": "Risque perçu, complexité",
-        "posture_adaptative": "Avancer pas à pas; Évaluer sans paralyser",
-        "etats_compatibles": "9, 11, 19, 26, 31",
-        "etats_sequenciels": "11, 19, 26, 27",
-        "conseil_flowme": "La prudence éclairée distingue la méfiance stérile de la précaution fertile"
-    },
-    "Retenue": {
-        "id": 11,
-        "famille_symbolique": "Force contenue",
-        "tension_dominante": "Contrôlée, concentrée",
-        "mot_cle": "Maîtrise",
-        "declencheurs": "Besoin de ne pas agir immédiatement",
-        "posture_adaptative": "Contenir sans réprimer; Garder la force disponible",
-        "etats_compatibles": "1, 10, 12, 45, 52",
-        "etats_sequenciels": "12, 19, 45, 52",
-        "conseil_flowme": "La retenue sage préserve l'énergie pour le moment juste"
-    },
-    "Écoute": {
-        "id": 12,
-        "famille_symbolique": "Réceptivité pure",
-        "tension_dominante": "Accueillante, disponible",
-        "mot_cle": "Réception",
-        "declencheurs": "Besoin de comprendre l'autre",
-        "posture_adaptative": "Écouter sans préparer sa réponse; Accueillir sans juger",
-        "etats_compatibles": "8, 11, 20, 28, 45",
-        "etats_sequenciels": "20, 28, 45, 56",
-        "conseil_flowme": "Écouter vraiment transforme autant celui qui écoute que celui qui parle"
-    },
-    "Créativité": {
-        "id": 13,
-        "famille_symbolique": "Élan créateur",
-        "tension_dominante": "Générative, innovante",
-        "mot_cle": "Innovation",
-        "declencheurs": "Inspiration, besoin de nouveauté",
-        "posture_adaptative": "Laisser créer à travers soi; Ne pas diriger le processus",
-        "etats_compatibles": "3, 16, 29, 39, 53",
-        "etats_sequenciels": "16, 29, 39, 53",
-        "conseil_flowme": "La créativité authentique surprend d'abord celui qui crée"
-    },
-    "Clarté": {
-        "id": 14,
-        "famille_symbolique": "Évidence lumineuse",
-        "tension_dominante": "Transparente, révélatrice",
-        "mot_cle": "Évidence",
-        "declencheurs": "Confusion qui se dissipe",
-        "posture_adaptative": "Accueillir la clarté sans la forcer; La laisser se déployer",
-        "etats_compatibles": "4, 6, 7, 15, 58",
-        "etats_sequenciels": "15, 22, 30, 58",
-        "conseil_flowme": "La vraie clarté n'éblouit pas, elle révèle"
-    },
-    "Discernement": {
-        "id": 15,
-        "famille_symbolique": "Vision ajustée",
-        "tension_dominante": "Discriminante, précise",
-        "mot_cle": "Distinction",
-        "declencheurs": "Besoin de différencier",
-        "posture_adaptative": "Distinguer sans séparer; Voir les nuances",
-        "etats_compatibles": "5, 14, 23, 31, 58",
-        "etats_sequenciels": "22, 23, 30, 31",
-        "conseil_flowme": "Discerner c'est voir la juste mesure de chaque chose"
-    },
-    "Émerveillement": {
-        "id": 16,
-        "famille_symbolique": "Enchantement authentique",
-        "tension_dominante": "Admirative, reconnaissante",
-        "mot_cle": "Admiration",
-        "declencheurs": "Beauté, grandeur perçue",
-        "posture_adaptative": "S'abandonner à l'émerveillement; Ne pas analyser immédiatement",
-        "etats_compatibles": "2, 4, 13, 24, 62",
-        "etats_sequenciels": "24, 29, 62, 64",
-        "conseil_flowme": "L'émerveillement nourrit l'âme et renouvelle la perception"
-    },
-    "Questionnement": {
-        "id": 17,
-        "famille_symbolique": "Recherche vivante",
-        "tension_dominante": "Interrogative, exploratrice",
-        "mot_cle": "Question",
-        "declencheurs": "Mystère à explorer",
-        "posture_adaptative": "Questionner sans attendre de réponse immédiate; Habiter la question",
-        "etats_compatibles": "3, 9, 25, 34, 48",
-        "etats_sequenciels": "3, 9, 25, 34",
-        "conseil_flowme": "Une vraie question transforme plus que mille réponses toutes faites"
-    },
-    "Équilibre": {
-        "id": 18,
-        "famille_symbolique": "Harmonie dynamique",
-        "tension_dominante": "Stabilisante, ajustée",
-        "mot_cle": "Harmonie",
-        "declencheurs": "Déséquilibre à corriger",
-        "posture_adaptative": "Chercher l'équilibre dans le mouvement; Ajuster en permanence",
-        "etats_compatibles": "19, 21, 22, 35, 60",
-        "etats_sequenciels": "21, 22, 35, 60",
-        "conseil_flowme": "L'équilibre véritable est un mouvement, pas une position"
-    },
-    "Patience": {
-        "id": 19,
-        "famille_symbolique": "Durée consentie",
-        "tension_dominante": "Persévérante, constante",
-        "mot_cle": "Persévérance",
-        "declencheurs": "Processus qui demande du temps",
-        "posture_adaptative": "Accepter le rythme naturel; Ne pas forcer la maturation",
-        "etats_compatibles": "10, 18, 27, 32, 52",
-        "etats_sequenciels": "27, 32, 52, 61",
-        "conseil_flowme": "La patience n'est pas de l'attente passive, c'est une présence active au temps nécessaire"
-    },
-    "Réceptivité": {
-        "id": 20,
-        "famille_symbolique": "Ouverture accueillante",
-        "tension_dominante": "Disponible, perméable",
-        "mot_cle": "Disponibilité",
-        "declencheurs": "Nouveau qui veut entrer",
-        "posture_adaptative": "S'ouvrir sans se perdre; Accueillir en restant centré",
-        "etats_compatibles": "12, 28, 36, 45, 56",
-        "etats_sequenciels": "12, 28, 45, 56",
-        "conseil_flowme": "Être réceptif c'est créer un espace où le nouveau peut advenir"
-    },
-    "Adaptation": {
-        "id": 21,
-        "famille_symbolique": "Souplesse intelligente",
-        "tension_dominante": "Flexible, responsive",
-        "mot_cle": "Ajustement",
-        "declencheurs": "Changement de contexte",
-        "posture_adaptative": "S'adapter sans se renier; Rester souple sans perdre son centre",
-        "etats_compatibles": "18, 35, 36, 57, 63",
-        "etats_sequenciels": "35, 36, 57, 63",
-        "conseil_flowme": "S'adapter c'est danser avec le changement sans perdre sa mélodie intérieure"
-    },
-    "Cohérence": {
-        "id": 22,
-        "famille_symbolique": "Unité vivante",
-        "tension_dominante": "Unifiante, intégrative",
-        "mot_cle": "Intégrité",
-        "declencheurs": "Éparpillement à unifier",
-        "posture_adaptative": "Rechercher l'unité sans rigidité; Intégrer les contradictions",
-        "etats_compatibles": "6, 14, 18, 30, 59",
-        "etats_sequenciels": "30, 59, 61, 64",
-        "conseil_flowme": "La cohérence authentique intègre même les contradictions apparentes"
-    },
-    "Précision": {
-        "id": 23,
-        "famille_symbolique": "Justesse affinée",
-        "tension_dominante": "Exacte, ajustée",
-        "mot_cle": "Exactitude",
-        "declencheurs": "Besoin de justesse",
-        "posture_adaptative": "Affiner sans rigidifier; Chercher la justesse, pas la perfection",
-        "etats_compatibles": "5, 15, 31, 36, 55",
-        "etats_sequenciels": "31, 36, 55, 56",
-        "conseil_flowme": "La précision véritable unit la rigueur et la souplesse"
-    },
-    "Stupéfaction": {
-        "id": 24,
-        "famille_symbolique": "Saisissement révélateur",
-        "tension_dominante": "Bouleversée, ouverte",
-        "mot_cle": "Bouleversement",
-        "declencheurs": "Révélation soudaine majeure",
-        "posture_adaptative": "Accueillir le bouleversement; Laisser se réorganiser",
-        "etats_compatibles": "4, 16, 33, 41, 46",
-        "etats_sequenciels": "33, 41, 46, 58",
-        "conseil_flowme": "La stupéfaction ouvre des espaces neufs en nous"
-    },
-    "Perplexité": {
-        "id": 25,
-        "famille_symbolique": "Questionnement dérouté",
-        "tension_dominante": "Déconcertée, cherchante",
-        "mot_cle": "Désorientation",
-        "declencheurs": "Situation incompréhensible",
-        "posture_adaptative": "Accepter de ne pas comprendre; Rester ouvert à l'émergence",
-        "etats_compatibles": "9, 17, 33, 47, 48",
-        "etats_sequenciels": "33, 47, 48, 49",
-        "conseil_flowme": "La perplexité fertile préfère l'inconnu authentique aux certitudes factices"
-    },
-    "Vigilance": {
-        "id": 26,
-        "famille_symbolique": "Attention soutenue",
-        "tension_dominante": "Alerte, attentive",
-        "mot_cle": "Vigilance",
-        "declencheurs": "Situation demandant attention",
-        "posture_adaptative": "Rester alerte sans tension; Surveiller sans crispation",
-        "etats_compatibles": "3, 10, 27, 37, 50",
-        "etats_sequenciels": "27, 37, 50, 51",
-        "conseil_flowme": "La vraie vigilance est détendue et précise à la fois"
-    },
-    "Persévérance": {
-        "id": 27,
-        "famille_symbolique": "Constance déterminée",
-        "tension_dominante": "Tenace, endurante",
-        "mot_cle": "Ténacité",
-        "declencheurs": "Résistance à surmonter",
-        "posture_adaptative": "Persévérer sans s'endurcir; Maintenir l'élan sans forcer",
-        "etats_compatibles": "10, 19, 26, 31, 38",
-        "etats_sequenciels": "31, 37, 38, 50",
-        "conseil_flowme": "Persévérer c'est maintenir la direction tout en restant souple sur les moyens"
-    },
-    "Compassion": {
-        "id": 28,
-        "famille_symbolique": "Bienveillance active",
-        "tension_dominante": "Aimante, compatissante",
-        "mot_cle": "Bienveillance",
-        "declencheurs": "Souffrance perçue",
-        "posture_adaptative": "Compatir sans s'identifier; Aider sans s'épuiser",
-        "etats_compatibles": "8, 12, 20, 56, 61",
-        "etats_sequenciels": "56, 61, 62, 64",
-        "conseil_flowme": "La compassion authentique guérit autant celui qui la donne que celui qui la reçoit"
-    },
-    "Inspiration": {
-        "id": 29,
-        "famille_symbolique": "Souffle créateur",
-        "tension_dominante": "Inspirée, porteuse",
-        "mot_cle": "Inspiration",
-        "declencheurs": "Élan créateur qui monte",
-        "posture_adaptative": "Laisser l'inspiration agir; Ne pas la diriger",
-        "etats_compatibles": "2, 6, 7, 13, 16",
-        "etats_sequenciels": "13, 39, 53, 62",
-        "conseil_flowme": "L'inspiration vraie traverse celui qui la reçoit pour toucher le monde"
-    },
-    "Sagesse": {
-        "id": 30,
-        "famille_symbolique": "Compréhension mûrie",
-        "tension_dominante": "Sage, intégrée",
-        "mot_cle": "Sagesse",
-        "declencheurs": "Intégration d'expériences multiples",
-        "posture_adaptative": "Partager sans imposer; Éclairer sans éblouir",
-        "etats_compatibles": "6, 14, 15, 22, 61",
-        "etats_sequenciels": "61, 62, 63, 64",
-        "conseil_flowme": "La sagesse se reconnaît à sa simplicité et à sa justesse"
-    },
-    "Rigueur": {
-        "id": 31,
-        "famille_symbolique": "Exigence féconde",
-        "tension_dominante": "Exigeante, structurante",
-        "mot_cle": "Exigence",
-        "declencheurs": "Besoin de structure et précision",
-        "posture_adaptative": "Être rigoureux sans être rigide; Structurer sans enfermer",
-        "etats_compatibles": "5, 10, 15, 23, 27",
-        "etats_sequenciels": "23, 36, 38, 55",
-        "conseil_flowme": "La rigueur authentique libère en donnant une forme juste"
-    },
-    "Contemplation": {
-        "id": 32,
-        "famille_symbolique": "Regard profond",
-        "tension_dominante": "Contemplative, absorbée",
-        "mot_cle": "Contemplation",
-        "declencheurs": "Beauté ou mystère à contempler",
-        "posture_adaptative": "Se laisser absorber sans se perdre; Contempler sans posséder",
-        "etats_compatibles": "1, 19, 45, 52, 61",
-        "etats_sequenciels": "45, 52, 61, 64",
-        "conseil_flowme": "Contempler c'est laisser être ce qui est dans toute sa richesse"
-    },
-    "Altération des repères": {
-        "id": 33,
-        "famille_symbolique": "Déstabilisation nécessaire",
-        "tension_dominante": "Désorientée, flottante",
-        "mot_cle": "Déstabilisation",
-        "declencheurs": "Perte de références habituelles",
-        "posture_adaptative": "Accepter la désorientation; Ne pas se raccrocher aux anciens repères",
-        "etats_compatibles": "24, 25, 34, 47, 49",
-        "etats_sequenciels": "34, 47, 49, 52",
-        "conseil_flowme": "Perdre ses repères peut être le prélude à en découvrir de plus vastes"
-    },
-    "Perception élargie": {
-        "id": 34,
-        "famille_symbolique": "Vision expansée",
-        "tension_dominante": "Élargie, panoramique",
-        "mot_cle": "Expansion",
-        "declencheurs": "Ouverture perceptuelle soudaine",
-        "posture_adaptative": "Accueillir l'élargissement; Ne pas se perdre dans l'immensité",
-        "etats_compatibles": "3, 17, 33, 39, 41",
-        "etats_sequenciels": "39, 41, 42, 58",
-        "conseil_flowme": "Une perception élargie demande un centre stable pour ne pas se disperser"
-    },
-    "Ajustement souple": {
-        "id": 35,
-        "famille_symbolique": "Adaptation fluide",
-        "tension_dominante": "Souple, adaptative",
-        "mot_cle": "Fluidité",
-        "declencheurs": "Nécessité d'adaptation fine",
-        "posture_adaptative": "S'ajuster en permanence; Rester fluide sans perdre la direction",
-        "etats_compatibles": "18, 21, 36, 57, 63",
-        "etats_sequenciels": "36, 57, 63, 64",
-        "conseil_flowme": "L'ajustement souple unit la fermeté de l'intention et la souplesse des moyens"
-    },
-    "Présence ajustée": {
-        "id": 36,
-        "famille_symbolique": "Présence calibrée",
-        "tension_dominante": "Ajustée, précise",
-        "mot_cle": "Calibrage",
-        "declencheurs": "Besoin de présence juste",
-        "posture_adaptative": "Calibrer sa présence; Ni trop ni trop peu",
-        "etats_compatibles": "20, 23, 31, 35, 55",
-        "etats_sequenciels": "55, 56, 59, 63",
-        "conseil_flowme": "La présence ajustée donne exactement ce qui est nécessaire"
-    },
-    "Volonté excessive": {
-        "id": 37,
-        "famille_symbolique": "Force mal dirigée",
-        "tension_dominante": "Tendue, forcée",
-        "mot_cle": "Excès",
-        "declencheurs": "Résistance qui durcit la volonté",
-        "posture_adaptative": "Reconnaître l'excès; Relâcher progressivement la tension",
-        "etats_compatibles": "26, 27, 38, 50, 51",
-        "etats_sequenciels": "38, 50, 51, 52",
-        "conseil_flowme": "Quand la volonté devient excessive, c'est qu'elle a perdu sa justesse"
-    },
-    "Rigidité fonctionnelle": {
-        "id": 38,
-        "famille_symbolique": "Structure durcie",
-        "tension_dominante": "Rigide, crispée",
-        "mot_cle": "Rigidité",
-        "declencheurs": "Peur du changement",
-        "posture_adaptative": "Reconnaître la rigidité; Introduire de la souplesse graduellement",
-        "etats_compatibles": "27, 31, 37, 50, 51",
-        "etats_sequenciels": "50, 51, 52, 53",
-        "conseil_flowme": "La rigidité protège momentanément mais limite l'évolution"
-    },
-    "Vol d'altitude": {
-        "id": 39,
-        "famille_symbolique": "Élévation panoramique",
-        "tension_dominante": "Élevée, surplombante",
-        "mot_cle": "Élévation",
-        "declencheurs": "Besoin de perspective globale",
-        "posture_adaptative": "Prendre de la hauteur sans perdre le contact; Observer sans juger",
-        "etats_compatibles": "13, 29, 34, 40, 42",
-        "etats_sequenciels": "40, 42, 43, 58",
-        "conseil_flowme": "Prendre de l'altitude permet de voir les connexions invisibles depuis le sol"
-    },
-    "Retour porteur": {
-        "id": 40,
-        "famille_symbolique": "Redescente enrichie",
-        "tension_dominante": "Descendante, porteuse",
-        "mot_cle": "Retour",
-        "declencheurs": "Retour après élévation",
-        "posture_adaptative": "Redescendre en gardant l'acquis; Intégrer l'expérience d'altitude",
-        "etats_compatibles": "39, 42, 43, 56, 63",
-        "etats_sequenciels": "43, 56, 63, 64",
-        "conseil_flowme": "Le retour authentique ramène les trésors de l'altitude dans la vie ordinaire"
-    },
-    "Éveil d'empreinte": {
-        "id": 41,
-        "famille_symbolique": "Réveil de mémoire",
-        "tension_dominante": "Éveillante, révélatrice",
-        "mot_cle": "Éveil",
-        "declencheurs": "Résonance avec une empreinte ancienne",
-        "posture_adaptative": "Accueillir ce qui s'éveille; Ne pas forcer la mémoire",
-        "etats_compatibles": "2, 24, 34, 48, 49",
-        "etats_sequenciels": "42, 48, 49, 58",
-        "conseil_flowme": "Certains éveils révèlent ce qui était déjà là, endormi"
-    },
-    "Précipitation du sens": {
-        "id": 42,
-        "famille_symbolique": "Cristallisation rapide",
-        "tension_dominante": "Précipitante, condensante",
-        "mot_cle": "Cristallisation",
-        "declencheurs": "Compréhension soudaine",
-        "posture_adaptative": "Laisser se cristalliser; Ne pas forcer la formulation",
-        "etats_compatibles": "34, 39, 40, 43, 58",
-        "etats_sequenciels": "43, 44, 58, 59",
-        "conseil_flowme": "Quand le sens précipite, c'est que la solution était déjà présente"
-    },
-    "Retombée harmonique": {
-        "id": 43,
-        "famille_symbolique": "Résonance apaisée",
-        "tension_dominante": "Apaisante, harmonisante",
-        "mot_cle": "Harmonie",
-        "declencheurs": "Résolution d'une tension",
-        "posture_adaptative": "Accueillir l'apaisement; Laisser l'harmonie s'installer",
-        "etats_compatibles": "40, 42, 44, 60, 61",
-        "etats_sequenciels": "44, 60, 61, 64",
-        "conseil_flowme": "Après l'intensité, la retombée harmonique permet l'intégration"
-    },
-    "Geste résonant": {
-        "id": 44,
-        "famille_symbolique": "Action accordée",
-        "tension_dominante": "Accordée, juste",
-        "mot_cle": "Justesse",
-        "declencheurs": "Moment d'action juste",
-        "posture_adaptative": "Agir dans la justesse; Laisser le geste naître de l'accord",
-        "etats_compatibles": "8, 42, 43, 55, 56",
-        "etats_sequenciels": "55, 56, 59, 63",
-        "conseil_flowme": "Le geste résonant unit parfaitement l'intention et l'action"
-    },
-    "Disponibilité nue": {
-        "id": 45,
-        "famille_symbolique": "Ouverture totale",
-        "tension_dominante": "Nue, disponible",
-        "mot_cle": "Disponibilité",
-        "declencheurs": "Lâcher-prise total",
-        "posture_adaptative": "Être disponible sans attente; S'ouvrir sans se perdre",
-        "etats_compatibles": "1, 11, 12, 20, 32",
-        "etats_sequenciels": "52, 56, 61, 64",
-        "conseil_flowme": "La disponibilité nue est l'état le plus réceptif et le plus créateur"
-    },
-    "Choc d'ombre": {
-        "id": 46,
-        "famille_symbolique": "Révélation brutale",
-        "tension_dominante": "Choquante, révélatrice",
-        "mot_cle": "Révélation",
-        "declencheurs": "Découverte de ce qui était caché",
-        "posture_adaptative": "Accueillir le choc; Ne pas fuir ce qui se révèle",
-        "etats_compatibles": "24, 47, 49, 51, 53",
-        "etats_sequenciels": "47, 49, 51, 53",
-        "conseil_flowme": "Le choc d'ombre révèle ce que la lumière seule ne peut montrer"
-    },
-    "Dérive intérieure": {
-        "id": 47,
-        "famille_symbolique": "Errance interne",
-        "tension_dominante": "Dérivante, flottante",
-        "mot_cle": "Dérive",
-        "declencheurs": "Perte de direction interne",
-        "posture_adaptative": "Accepter la dérive; Faire confiance au courant profond",
-        "etats_compatibles": "25, 33, 46, 48, 49",
-        "etats_sequenciels": "48, 49, 52, 53",
-        "conseil_flowme": "Parfois il faut dériver pour découvrir des rivages inconnus"
-    },
-    "Remontée de mémoire ancienne": {
-        "id": 48,
-        "famille_symbolique": "Résurgence du passé",
-        "tension_dominante": "Remontante, révélatrice",
-        "mot_cle": "Mémoire",
-        "declencheurs": "Réactivation d'une mémoire profonde",
-        "posture_adaptative": "Accueillir ce qui remonte; Ne pas rejuger le passé",
-        "etats_compatibles": "9, 17, 25, 41, 47",
-        "etats_sequenciels": "41, 49, 52, 58",
-        "conseil_flowme": "Ce qui remonte du passé vient éclairer le présent"
-    },
-    "Résurgence incontrôlée": {
-        "id": 49,
-        "famille_symbolique": "Émergence chaotique",
-        "tension_dominante": "Incontrôlée, débordante",
-        "mot_cle": "Chaos",
-        "declencheurs": "Débordement émotionnel ou mental",
-        "posture_adaptative": "Ne pas lutter contre le chaos; Attendre que ça se pose",
-        "etats_compatibles": "25, 33, 41, 46, 47",
-        "etats_sequenciels": "50, 51, 52, 53",
-        "conseil_flowme": "Même le chaos porte en lui les germes d'un nouvel ordre"
-    },
-    "Saturation et perte d'adhérence": {
-        "id": 50,
-        "famille_symbolique": "Surcharge critique",
-        "tension_dominante": "Saturée, glissante",
-        "mot_cle": "Saturation",
-        "declencheurs": "Dépassement des capacités",
-        "posture_adaptative": "Reconnaître la saturation; Alléger progressivement",
-        "etats_compatibles": "26, 37, 38, 49, 51",
-        "etats_sequenciels": "51, 52, 53, 54",
-        "conseil_flowme": "La saturation signale qu'il est temps de simplifier et d'alléger"
-    },
-    "Fracture identitaire": {
-        "id": 51,
-        "famille_symbolique": "Rupture intérieure",
-        "tension_dominante": "Fracturée, divisée",
-        "mot_cle": "Fracture",
-        "declencheurs": "Contradiction interne majeure",
-        "posture_adaptative": "Accepter la fracture; Ne pas forcer l'unité prématurément",
-        "etats_compatibles": "37, 38, 46, 49, 50",
-        "etats_sequenciels": "52, 53, 54, 55",
-        "conseil_flowme": "Parfois il faut se briser pour se reconstruire plus authentiquement"
-    },
-    "Silence matriciel": {
-        "id": 52,
-        "famille_symbolique": "Silence créateur",
-        "tension_dominante": "Silencieuse, matricielle",
-        "mot_cle": "Silence",
-        "declencheurs": "Besoin de silence profond",
-        "posture_adaptative": "Habiter le silence; Laisser naître de la vacuité",
-        "etats_compatibles": "11, 19, 32, 45, 47",
-        "etats_sequenciels": "53, 54, 55, 61",
-        "conseil_flowme": "Le silence matriciel est le ventre où naissent les nouvelles formes"
-    },
-    "Tension du renouveau": {
-        "id": 53,
-        "famille_symbolique": "Poussée créatrice",
-        "tension_dominante": "Tendue, créatrice",
-        "mot_cle": "Renouveau",
-        "declencheurs": "Élan de renouvellement",
-        "posture_adaptative": "Accompagner la poussée; Ne pas précipiter la naissance",
-        "etats_compatibles": "13, 29, 46, 49, 52",
-        "etats_sequenciels": "54, 55, 56, 62",
-        "conseil_flowme": "Le renouveau authentique naît de la destruction créatrice de l'ancien"
-    },
-    "Première inclinaison": {
-        "id": 54,
-        "famille_symbolique": "Mouvement naissant",
-        "tension_dominante": "Naissante, orientée",
-        "mot_cle": "Orientation",
-        "declencheurs": "Première direction qui se dessine",
-        "posture_adaptative": "Suivre l'inclinaison; Ne pas forcer la direction",
-        "etats_compatibles": "50, 51, 52, 53, 55",
-        "etats_sequenciels": "55, 56, 57, 63",
-        "conseil_flowme": "La première inclinaison indique la direction naturelle du renouveau"
-    },
-    "Geste ténu": {
-        "id": 55,
-        "famille_symbolique": "Action délicate",
-        "tension_dominante": "Ténue, précise",
-        "mot_cle": "Délicatesse",
-        "declencheurs": "Situation demandant finesse",
-        "posture_adaptative": "Agir avec délicatesse; Doser finement l'intervention",
-        "etats_compatibles": "23, 36, 44, 52, 54",
-        "etats_sequenciels": "56, 57, 59, 63",
-        "conseil_flowme": "Les gestes les plus ténus peuvent avoir les effets les plus profonds"
-    },
-    "Reprise accordée": {
-        "id": 56,
-        "famille_symbolique": "Recommencement harmonieux",
-        "tension_dominante": "Accordée, renouvelée",
-        "mot_cle": "Reprise",
-        "declencheurs": "Nouveau départ possible",
-        "posture_adaptative": "Reprendre en gardant l'acquis; Recommencer autrement",
-        "etats_compatibles": "20, 28, 40, 44, 55",
-        "etats_sequenciels": "57, 59, 63, 64",
-        "conseil_flowme": "La reprise accordée unit l'expérience passée et l'élan nouveau"
-    },
-    "Dualité vivante": {
-        "id": 57,
-        "famille_symbolique": "Opposition créatrice",
-        "tension_dominante": "Duelle, créatrice",
-        "mot_cle": "Polarité",
-        "declencheurs": "Tensions opposées à intégrer",
-        "posture_adaptative": "Tenir les deux pôles; Ne pas choisir prématurément",
-        "etats_compatibles": "21, 35, 54, 55, 58",
-        "etats_sequenciels": "58, 59, 60, 63",
-        "conseil_flowme": "La dualité vivante génère une dynamique créatrice"
-    },
-    "Clarté paradoxale": {
-        "id": 58,
-        "famille_symbolique": "Évidence contradictoire",
-        "tension_dominante": "Claire, paradoxale",
-        "mot_cle": "Paradoxe",
-        "declencheurs": "Vérité paradoxale qui se révèle",
-        "posture_adaptative": "Accepter le paradoxe; Ne pas forcer la logique",
-        "etats_compatibles": "4, 14, 34, 42, 57",
-        "etats_sequenciels": "59, 60, 61, 64",
-        "conseil_flowme": "La clarté paradoxale révèle que la vérité dépasse souvent la logique"
-    },
-    "Inclusion active": {
-        "id": 59,
-        "famille_symbolique": "Intégration dynamique",
-        "tension_dominante": "Inclusive, active",
-        "mot_cle": "Inclusion",
-        "declencheurs": "Besoin d'intégrer tous les éléments",
-        "posture_adaptative": "Inclure sans diluer; Intégrer en gardant les spécificités",
-        "etats_compatibles": "1, 6, 22, 36, 56",
-        "etats_sequenciels": "60, 61, 63, 64",
-        "conseil_flowme": "L'inclusion active crée une unité qui respecte la diversité"
-    },
-    "Rythme paradoxal": {
-        "id": 60,
-        "famille_symbolique": "Tempo complexe",
-        "tension_dominante": "Rythmée, paradoxale",
-        "mot_cle": "Rythme",
-        "declencheurs": "Synchronisation complexe nécessaire",
-        "posture_adaptative": "Suivre le rythme paradoxal; Accepter les tempos contradictoires",
-        "etats_compatibles": "8, 18, 43, 57, 58",
-        "etats_sequenciels": "61, 62, 63, 64",
-        "conseil_flowme": "Le rythme paradoxal unit les contraires dans une danse unique"
-    },
-    "Plénitude tranquille": {
-        "id": 61,
-        "famille_symbolique": "Accomplissement serein",
-        "tension_dominante": "Pleine, tranquille",
-        "mot_cle": "Plénitude",
-        "declencheurs": "Sentiment d'accomplissement",
-        "posture_adaptative": "Habiter la plénitude; Goûter sans s'attacher",
-        "etats_compatibles": "19, 28, 30, 32, 43",
-        "etats_sequenciels": "62, 63, 64, 1",
-        "conseil_flowme": "La plénitude tranquille est un repos dans l'être"
-    },
-    "Rayonnement discret": {
-        "id": 62,
-        "famille_symbolique": "Influence subtile",
-        "tension_dominante": "Rayonnante, discrète",
-        "mot_cle": "Rayonnement",
-        "declencheurs": "Qualité qui veut se partager",
-        "posture_adaptative": "Rayonner sans ostentation; Influencer par l'être",
-        "etats_compatibles": "7, 16, 28, 29, 30",
-        "etats_sequenciels": "63, 64, 1, 2",
-        "conseil_flowme": "Le rayonnement discret touche sans forcer"
-    },
-    "Passage vivant": {
-        "id": 63,
-        "famille_symbolique": "Transition créatrice",
-        "tension_dominante": "Transitoire, créatrice",
-        "mot_cle": "Passage",
-        "declencheurs": "Moment de transition",
-        "posture_adaptative": "Habiter le passage; Ne pas précipiter l'arrivée",
-        "etats_compatibles": "21, 35, 40, 56, 60",
-        "etats_sequenciels": "64, 1, 2, 3",
-        "conseil_flowme": "Le passage vivant transforme en reliant"
-    },
-    "Porte ouverte": {
-        "id": 64,
-        "famille_symbolique": "Ouverture totale",
-        "tension_dominante": "Ouverte, accueillante",
-        "mot_cle": "Ouverture",
-        "declencheurs": "Disponibilité complète",
-        "posture_adaptative": "Être une porte ouverte; Accueillir tout ce qui vient",
-        "etats_compatibles": "1, 16, 22, 28, 30",
-        "etats_sequenciels": "1, 2, 3, 16",
-        "conseil_flowme": "Être porte ouverte, c'est offrir un passage entre les mondes"
-    }
-}
-
 # ========== SYSTÈME DE MONITORING ==========
 @dataclass
 class ConversationMetrics:
@@ -749,6 +59,7 @@ class FlowMeAnalytics:
         self.conversations: Dict[str, ConversationMetrics] = {}
         self.health_history = []
         self.emotion_stats = Counter()
+        self.message_tokens = 0
         self.error_log = []
         self.system_start_time = datetime.now()
         
@@ -763,10 +74,11 @@ class FlowMeAnalytics:
             average_response_time=0.0
         )
         
-    def log_message(self, session_id: str, emotion: str, response_time: float):
+    def log_message(self, session_id: str, emotion: str, response_time: float, token_count: int = 0):
         if session_id in self.conversations:
             conv = self.conversations[session_id]
             conv.message_count += 1
+            self.message_tokens += token_count
             conv.emotions_detected.append(emotion)
             
             current_avg = conv.average_response_time
@@ -819,11 +131,14 @@ class FlowMeAnalytics:
             response_times = [c.average_response_time for c in self.conversations.values() if c.average_response_time > 0]
             avg_response_time = sum(response_times) / len(response_times) if response_times else 0.0
         
+        total_messages = sum(c.message_count for c in self.conversations.values())
+        
         return {
             "uptime_seconds": uptime,
             "total_conversations": len(self.conversations),
             "active_conversations": len([c for c in self.conversations.values() if c.end_time is None]),
-            "total_messages": sum(c.message_count for c in self.conversations.values()),
+            "total_messages": total_messages,
+            "average_message_tokens": round(self.message_tokens / total_messages, 1) if total_messages else 0.0,
             "system_uptime_percent": round(system_uptime, 2),
             "average_response_time": round(avg_response_time, 2),
             "top_emotions": dict(self.emotion_stats.most_common(5)),
@@ -832,7 +147,17 @@ class FlowMeAnalytics:
 
 # ========== APPLICATION PRINCIPALE ==========
 
-app = FastAPI(title="FlowMe v3 - 64 États", version="3.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Cycle de vie : le pool HTTP partagé est ouvert au démarrage et fermé à l'arrêt"""
+    async with http_pool:
+        await startup_event()
+        try:
+            yield
+        finally:
+            await shutdown_event()
+
+app = FastAPI(title="FlowMe v3 - 64 États", version="3.1.0", lifespan=lifespan)
 
 # Variables d'environnement
 MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
@@ -841,115 +166,104 @@ NOCODB_API_KEY = os.getenv("NOCODB_API_KEY")
 NOCODB_STATES_TABLE_ID = os.getenv("NOCODB_STATES_TABLE_ID", "mpcze1flcb4x64x")
 NOCODB_REACTIONS_TABLE_ID = os.getenv("NOCODB_REACTIONS_TABLE_ID", "m8lwhj640ohzg7m")
 
+# Détecteurs candidats exécutés en mode shadow (ex: "emotions,64_matrix")
+SHADOW_CANDIDATES = [name.strip() for name in os.getenv("FLOWME_SHADOW_CANDIDATES", "").split(",") if name.strip()]
+SHADOW_MAX_PENDING = int(os.getenv("FLOWME_SHADOW_MAX_PENDING", "64"))
+
+# Taille maximale d'un lot pour /detect/batch
+BATCH_MAX_MESSAGES = int(os.getenv("BATCH_MAX_MESSAGES", "50000"))
+
+# Fenêtre maximale (en mots) acceptée par /detect/stream
+STREAM_MAX_WINDOW_WORDS = int(os.getenv("STREAM_MAX_WINDOW_WORDS", "5000"))
+# Taille maximale (en octets) du texte envoyé à /detect/stream
+STREAM_MAX_BODY_BYTES = int(os.getenv("STREAM_MAX_BODY_BYTES", str(10 * 1024 * 1024)))
+
+# Détection pendant la saisie (/ws/detect) : regroupement des envois et limites par connexion
+WS_DEBOUNCE_SECONDS = int(os.getenv("WS_DEBOUNCE_MS", "120")) / 1000
+WS_MAX_BUFFER_CHARS = int(os.getenv("WS_MAX_BUFFER_CHARS", "20000"))
+WS_MAX_DELTAS_PER_SECOND = int(os.getenv("WS_MAX_DELTAS_PER_SECOND", "50"))
+
+# Longueur maximale d'un message analysée par /chat (le prompt et la sauvegarde restent limités à 500 caractères)
+CHAT_MAX_DETECTION_CHARS = int(os.getenv("CHAT_MAX_DETECTION_CHARS", "20000"))
+CHAT_PROMPT_CHARS = 500
+
 class ChatMessage(BaseModel):
     message: str
     user_id: Optional[str] = "anonymous"
 
-class Enhanced64StatesDetection:
-    def __init__(self, source: str = "integrated"):
-        self.states = FLOWME_64_STATES
-        self.source = source
-        # Stockage des données NocoDB additionnelles
-        self.nocodb_additional_data = {}
-        logger.info(f"✅ FlowMe initialisé avec 64 états intégrés - Source: {source}")
-    
-    def add_nocodb_data(self, nocodb_data: Dict[str, Any]):
-        """Ajoute les données NocoDB aux 64 états de base"""
-        self.nocodb_additional_data = nocodb_data
-        logger.info(f"📊 Données NocoDB additionnelles ajoutées: {len(nocodb_data)} états")
-    
-    def detect_emotion(self, text: str) -> str:
-        """Détection d'émotion sophistiquée sur les 64 états"""
-        text_lower = text.lower()
-        
-        # Scoring pour tous les 64 états basé sur leurs caractéristiques
-        emotion_scores = {}
-        
-        for state_name, state_data in self.states.items():
-            score = 0
-            
-            # Analyse basée sur le mot-clé principal
-            if state_data["mot_cle"].lower() in text_lower:
-                score += 5
-            
-            # Analyse des déclencheurs
-            declencheurs = state_data["declencheurs"].lower()
-            declencheur_words = declencheurs.split()
-            for word in declencheur_words:
-                if len(word) > 3 and word in text_lower:
-                    score += 3
-            
-            # Analyse de la famille symbolique
-            famille_words = state_data["famille_symbolique"].lower().split()
-            for word in famille_words:
-                if len(word) > 3 and word in text_lower:
-                    score += 2
-            
-            # Analyse de la tension dominante
-            tension_words = state_data["tension_dominante"].lower().split()
-            for word in tension_words:
-                if len(word) > 3 and word in text_lower:
-                    score += 2
-            
-            # Mots-clés spéciaux par catégories d'états
-            if "joie" in text_lower or "heur" in text_lower or "content" in text_lower:
-                if "émerveille" in state_name.lower() or "rayonne" in state_name.lower():
-                    score += 4
-            
-            if "trist" in text_lower or "mélan" in text_lower or "sombre" in text_lower:
-                if "silence" in state_name.lower() or "contempla" in state_name.lower():
-                    score += 4
-            
-            if "peur" in text_lower or "anxie" in text_lower or "stress" in text_lower:
-                if "vigilance" in state_name.lower() or "prudence" in state_name.lower():
-                    score += 4
-            
-            if "colère" in text_lower or "énervé" in text_lower or "frustré" in text_lower:
-                if "tension" in state_name.lower() or "excessive" in state_name.lower():
-                    score += 4
-            
-            if "confusion" in text_lower or "perdu" in text_lower or "comprend pas" in text_lower:
-                if "perplexité" in state_name.lower() or "altération" in state_name.lower():
-                    score += 4
-            
-            if "émerveil" in text_lower or "fascin" in text_lower or "découvr" in text_lower:
-                if "éveil" in state_name.lower() or "émerveillement" in state_name.lower():
-                    score += 4
-            
-            if score > 0:
-                emotion_scores[state_name] = score
-        
-        # Retourner l'état avec le score le plus élevé
-        if emotion_scores:
-            return max(emotion_scores, key=emotion_scores.get)
-        
-        return "Présence"  # Défaut
-    
-    def get_state_for_mistral(self, detected_state: str) -> Dict[str, Any]:
-        """Récupère les données complètes d'un état pour Mistral"""
-        if detected_state in self.states:
-            state_data = self.states[detected_state].copy()
-            
-            # Ajouter les données NocoDB si disponibles
-            if detected_state in self.nocodb_additional_data:
-                state_data.update(self.nocodb_additional_data[detected_state])
-            
-            return state_data
-        
-        return self.states.get("Présence", {})
+class BatchDetectionRequest(BaseModel):
+    messages: List[str]
+    top_k: int = Field(3, ge=1, le=64)
+    engine: Optional[str] = "keywords"  # "keywords" ou "tfidf"
 
 # Instances globales
 flowme_states = None
+shadow_detection = None
+sequence_smoother = None
 analytics = FlowMeAnalytics()
 
+# Fabriques des détecteurs candidats : nom -> (détection, étiquettes comparables aux 64 états)
+SHADOW_CANDIDATE_FACTORIES = {
+    "emotions": lambda states: (
+        lambda text, detector=EnhancedEmotionDetection(states.states): detector.score(text).primary,
+        False
+    ),
+    "64_matrix": lambda states: (
+        lambda text: states.batch_scorer.score_vectors([text])[0].primary,
+        True
+    ),
+    "tfidf": lambda states: (states.tfidf.detect_emotion, True),
+}
+
+def configure_shadow_detection(states: Enhanced64StatesDetection) -> Optional[ShadowDetection]:
+    """Active le mode shadow pour les candidats configurés (aucun par défaut)"""
+    if not SHADOW_CANDIDATES:
+        return None
+    
+    # Référence recalculée sans alimenter les mesures de la cascade (déjà comptée pour la requête servie)
+    shadow = ShadowDetection(
+        lambda text: states._detect_uncached(text, record=False), max_pending=SHADOW_MAX_PENDING
+    )
+    for name in SHADOW_CANDIDATES:
+        factory = SHADOW_CANDIDATE_FACTORIES.get(name)
+        if factory is None:
+            logger.warning(f"⚠️ Détecteur shadow inconnu ignoré: {name}")
+            continue
+        detect, comparable = factory(states)
+        shadow.add_candidate(name, detect, comparable)
+    return shadow
+
+def configure_sequence_smoother(states: Enhanced64StatesDetection) -> Optional[SequenceSmoother]:
+    """Lissage séquentiel par session si FLOWME_SEQUENCE_SMOOTHING vaut "forward" ou "viterbi" """
+    if SEQUENCE_MODE == "off":
+        return None
+    try:
+        smoother = SequenceSmoother(states.states, states.index.state_names, SEQUENCE_MODE)
+    except ValueError as e:
+        logger.warning(f"⚠️ Lissage séquentiel désactivé: {e}")
+        return None
+    logger.info(f"🔗 Lissage séquentiel des sessions activé (mode {SEQUENCE_MODE})")
+    return smoother
+
 async def load_complete_states():
-    global flowme_states
+    global flowme_states, shadow_detection, sequence_smoother
     
     logger.info("🔍 Chargement du système FlowMe complet...")
     
     # Initialiser avec les 64 états intégrés
     flowme_states = Enhanced64StatesDetection("64_états_intégrés")
     
+    # Mode shadow : détecteurs candidats hors du chemin de la requête
+    if shadow_detection:
+        shadow_detection.shutdown()
+    shadow_detection = configure_shadow_detection(flowme_states)
+    
+    # Lissage séquentiel : nouvelles croyances de session avec la nouvelle table
+    sequence_smoother = configure_sequence_smoother(flowme_states)
+    
+    # Les réponses en cache ont été générées avec les données d'états précédentes
+    response_cache.clear()
+    
     nocodb_status = False
     
     # Essayer de charger des données additionnelles depuis NocoDB
@@ -958,30 +272,29 @@ async def load_complete_states():
             headers = {"accept": "application/json", "xc-token": NOCODB_API_KEY}
             url = f"{NOCODB_URL}/api/v2/tables/{NOCODB_STATES_TABLE_ID}/records"
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, headers=headers)
+            response = await http_pool.client.get(url, headers=headers, timeout=10.0)
+            
+            if response.status_code == 200:
+                data = response.json()
+                records = data.get("list", []) if isinstance(data, dict) else data
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    records = data.get("list", []) if isinstance(data, dict) else data
+                if records:
+                    nocodb_additional = {}
                     
-                    if records:
-                        nocodb_additional = {}
-                        
-                        for record in records:
-                            if isinstance(record, dict):
-                                name = record.get("Nom_État")
-                                if name and name in FLOWME_64_STATES:
-                                    # Données additionnelles NocoDB
-                                    nocodb_additional[name] = {
-                                        "nocodb_id": record.get("ID_État", ""),
-                                        "nocodb_data": record
-                                    }
-                        
-                        if nocodb_additional:
-                            flowme_states.add_nocodb_data(nocodb_additional)
-                            nocodb_status = True
-                            logger.info(f"✅ Données NocoDB additionnelles ajoutées pour {len(nocodb_additional)} états")
+                    for record in records:
+                        if isinstance(record, dict):
+                            name = record.get("Nom_État")
+                            if name and name in FLOWME_64_STATES:
+                                # Données additionnelles NocoDB
+                                nocodb_additional[name] = {
+                                    "nocodb_id": record.get("ID_État", ""),
+                                    "nocodb_data": record
+                                }
+                    
+                    if nocodb_additional:
+                        flowme_states.add_nocodb_data(nocodb_additional)
+                        nocodb_status = True
+                        logger.info(f"✅ Données NocoDB additionnelles ajoutées pour {len(nocodb_additional)} états")
                         
         except Exception as e:
             logger.warning(f"⚠️ Erreur NocoDB (non critique): {e}")
@@ -1014,76 +327,68 @@ async def save_to_nocodb(user_message: str, ai_response: str, detected_state: st
             "timestamp": datetime.now().isoformat()
         }
         
-        async with httpx.AsyncClient(timeout=8.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            return response.status_code in [200, 201]
+        response = await http_pool.client.post(url, headers=headers, json=payload, timeout=8.0)
+        return response.status_code in [200, 201]
     except Exception as e:
         analytics.log_error("nocodb_save", str(e))
         return False
 
+MISTRAL_CHAT_URL = "https://api.mistral.ai/v1/chat/completions"
+
+def build_mistral_request(message: str, detected_state: str, stream: bool = False) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """En-têtes et corps de la requête Mistral enrichie avec les données complètes de l'état"""
+    # Prompt pré-compilé de l'état détecté (données complètes des 64 états)
+    system_prompt = flowme_states.prompts.system_prompt(detected_state, message)
+
+    headers = {
+        "Authorization": f"Bearer {MISTRAL_API_KEY}",
+        "Content-Type": "application/json"
+    }
+    
+    payload = {
+        "model": "mistral-small-latest",
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": message}
+        ],
+        "temperature": 0.7,
+        "max_tokens": 200
+    }
+    if stream:
+        payload["stream"] = True
+    return headers, payload
+
+async def request_mistral_completion(headers: Dict[str, str], payload: Dict[str, Any]) -> Optional[str]:
+    """Appel Mistral non streamé : texte de la réponse, None si l'API répond en erreur"""
+    response = await http_pool.client.post(MISTRAL_CHAT_URL, headers=headers, json=payload, timeout=15.0)
+    if response.status_code == 200:
+        return response.json()["choices"][0]["message"]["content"].strip()
+    logger.error(f"Erreur Mistral API: {response.status_code}")
+    return None
+
 async def generate_mistral_response(message: str, detected_state: str) -> tuple[str, bool]:
     mistral_status = False
     
     if not MISTRAL_API_KEY:
         return f"Je comprends que vous ressentez '{detected_state}'. Comment puis-je vous accompagner ?", mistral_status
     
+    # Réponse déjà générée pour un message quasi identique avec le même état
+    cached = response_cache.lookup(detected_state, message)
+    if cached is not None:
+        return cached, True
+    
     try:
-        # RÉCUPÉRER LES DONNÉES COMPLÈTES de l'état (64 états)
-        state_data = flowme_states.get_state_for_mistral(detected_state)
+        headers, payload = build_mistral_request(message, detected_state)
         
-        # Construire le prompt enrichi avec TOUTES les données des 64 états
-        system_prompt = f"""Tu es FlowMe, un compagnon IA empathique spécialisé dans l'accompagnement émotionnel basé sur 64 états de conscience spécifiques.
-
-ÉTAT DÉTECTÉ: {detected_state} (ID: {state_data.get('id', '')})
-
-DONNÉES COMPLÈTES DE L'ÉTAT:
-- Famille symbolique: {state_data.get('famille_symbolique', '')}
-- Tension dominante: {state_data.get('tension_dominante', '')}
-- Mot-clé: {state_data.get('mot_cle', '')}
-- Déclencheurs: {state_data.get('declencheurs', '')}
-- Posture adaptative: {state_data.get('posture_adaptative', '')}
-- États compatibles: {state_data.get('etats_compatibles', '')}
-- États séquenciels: {state_data.get('etats_sequenciels', '')}
-- Conseil FlowMe: {state_data.get('conseil_flowme', '')}
-
-INSTRUCTIONS POUR MISTRAL:
-1. Utilise la "Famille symbolique" pour créer une atmosphère poétique appropriée
-2. Utilise la "Tension dominante" pour comprendre l'énergie spécifique de l'état
-3. Intègre le "Conseil FlowMe" de manière naturelle et sage
-4. Propose la "Posture adaptative" comme guidance pratique concrète
-5. Valide l'expérience en référence aux "Déclencheurs"
-6. Si approprié, mentionne discrètement les "États compatibles" ou "séquenciels"
-7. Reste empathique, sage et bienveillant (max 150 mots)
-8. Parle comme un guide expérimenté qui connaît intimement ces 64 états
-
-Message de l'utilisateur: {message}"""
-
-        headers = {
-            "Authorization": f"Bearer {MISTRAL_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": "mistral-small-latest",
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": message}
-            ],
-            "temperature": 0.7,
-            "max_tokens": 200
-        }
+        # Prompts identiques simultanés : un seul appel Mistral, les autres requêtes attendent son résultat
+        ai_response = await mistral_single_flight.run(
+            payload_key(payload), lambda: request_mistral_completion(headers, payload)
+        )
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.post(
-                "https://api.mistral.ai/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                mistral_status = True
-                return result["choices"][0]["message"]["content"].strip(), mistral_status
+        if ai_response is not None:
+            mistral_status = True
+            response_cache.store(detected_state, message, ai_response)
+            return ai_response, mistral_status
                 
     except Exception as e:
         analytics.log_error("mistral_api", str(e))
@@ -1091,7 +396,54 @@ Message de l'utilisateur: {message}"""
     
     return f"Je comprends votre état de '{detected_state}'. Parlons de ce qui vous préoccupe.", mistral_status
 
-@app.on_event("startup")
+async def stream_mistral_response(message: str, detected_state: str, outcome: Dict[str, Any]) -> AsyncIterator[str]:
+    """Fragments de la réponse Mistral au fil de la génération ; outcome["mistral_status"] indique si Mistral a répondu"""
+    outcome["mistral_status"] = False
+    
+    if not MISTRAL_API_KEY:
+        yield f"Je comprends que vous ressentez '{detected_state}'. Comment puis-je vous accompagner ?"
+        return
+    
+    cached = response_cache.lookup(detected_state, message)
+    if cached is not None:
+        outcome["mistral_status"] = True
+        yield cached
+        return
+    
+    received = []
+    complete = False
+    try:
+        headers, payload = build_mistral_request(message, detected_state, stream=True)
+        
+        async with http_pool.client.stream("POST", MISTRAL_CHAT_URL, headers=headers, json=payload, timeout=15.0) as response:
+            if response.status_code == 200:
+                # Réponse Mistral en Server-Sent Events : "data: {...}" puis "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        complete = True
+                        break
+                    delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        received.append(delta)
+                        outcome["mistral_status"] = True
+                        yield delta
+            else:
+                logger.error(f"Erreur Mistral API (flux): {response.status_code}")
+        
+        # Réponse complète seulement : un flux interrompu n'est pas mis en cache
+        if complete and received:
+            response_cache.store(detected_state, message, "".join(received).strip())
+                
+    except Exception as e:
+        analytics.log_error("mistral_stream", str(e))
+        logger.error(f"Erreur Mistral API (flux): {e}")
+    
+    if not received:
+        yield f"Je comprends votre état de '{detected_state}'. Parlons de ce qui vous préoccupe."
+
 async def startup_event():
     nocodb_status = await load_complete_states()
     
@@ -1105,6 +457,11 @@ async def startup_event():
     
     logger.info("🚀 FlowMe v3 démarré avec 64 ÉTATS COMPLETS + intégration Mistral")
 
+async def shutdown_event():
+    if shadow_detection:
+        shadow_detection.shutdown()
+    detection_executor.shutdown()
+
 @app.get("/", response_class=HTMLResponse)
 async def home():
     return HTMLResponse("""
@@ -1214,17 +571,29 @@ async def home():
                 input.value = '';
                 
                 try {
-                    const response = await fetch('/chat', {
+                    // Réponse en flux : l'état détecté arrive d'abord, puis le texte de FlowMe au fil de la génération
+                    const response = await fetch('/chat/stream', {
                         method: 'POST',
                         headers: {'Content-Type': 'application/json'},
                         body: JSON.stringify({message: message})
                     });
                     
-                    if (response.ok) {
-                        const data = await response.json();
-                        addMessage(data.response, 'ai');
-                        const responseTime = data.response_time ? ` (${data.response_time}s)` : '';
-                        document.getElementById('status').textContent = `État détecté: "${data.detected_state}" • 64 États${responseTime}`;
+                    if (response.ok && response.body) {
+                        let aiText = null;
+                        let detectedState = '';
+                        await readEvents(response, (event, data) => {
+                            if (event === 'state') {
+                                detectedState = data.detected_state;
+                                aiText = addMessage('', 'ai');
+                                document.getElementById('status').textContent = `État détecté: "${detectedState}" • FlowMe répond...`;
+                            } else if (event === 'token' && aiText) {
+                                aiText.textContent += data.text;
+                                const chat = document.getElementById('chat');
+                                chat.scrollTop = chat.scrollHeight;
+                            } else if (event === 'done') {
+                                document.getElementById('status').textContent = `État détecté: "${detectedState}" • 64 États (${data.response_time}s)`;
+                            }
+                        });
                     } else {
                         addMessage('Erreur de connexion.', 'ai');
                     }
@@ -1235,13 +604,38 @@ async def home():
                 }
             }
             
+            // Lecture d'une réponse Server-Sent Events (EventSource ne permet pas les requêtes POST)
+            async function readEvents(response, onEvent) {
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+                while (true) {
+                    const {value, done} = await reader.read();
+                    if (done) break;
+                    buffer += decoder.decode(value, {stream: true});
+                    let boundary;
+                    while ((boundary = buffer.indexOf('\\n\\n')) >= 0) {
+                        const block = buffer.slice(0, boundary);
+                        buffer = buffer.slice(boundary + 2);
+                        let event = 'message';
+                        let data = '';
+                        for (const line of block.split('\\n')) {
+                            if (line.startsWith('event:')) event = line.slice(6).trim();
+                            else if (line.startsWith('data:')) data += line.slice(5).trim();
+                        }
+                        if (data) onEvent(event, JSON.parse(data));
+                    }
+                }
+            }
+            
             function addMessage(text, sender) {
                 const chat = document.getElementById('chat');
                 const div = document.createElement('div');
                 div.className = `message ${sender}-message`;
-                div.innerHTML = `<strong>${sender === 'user' ? 'Vous' : 'FlowMe'}:</strong> ${text}`;
+                div.innerHTML = `<strong>${sender === 'user' ? 'Vous' : 'FlowMe'}:</strong> <span>${text}</span>`;
                 chat.appendChild(div);
                 chat.scrollTop = chat.scrollHeight;
+                return div.querySelector('span');
             }
             
             document.getElementById('input').addEventListener('keypress', function(e) {
@@ -1252,6 +646,55 @@ async def home():
     </html>
     """)
 
+def score_chat_message(text: str, smoothed: bool) -> Tuple[NormalizedMessage, Any]:
+    """Scoring d'un message de /chat, sans effet de bord : vecteur de scores (mode séquentiel) ou état détecté"""
+    # Normalisation et découpage en mots faits une seule fois pour tout le pipeline
+    message = NormalizedMessage.from_text(text)
+    if smoothed:
+        return message, flowme_states.score_cached(message)
+    return message, flowme_states.detect_emotion(message)
+
+def apply_chat_detection(detection: Any, smoothed_session: Optional[str]) -> Tuple[str, str, Dict[str, Any]]:
+    """(état retenu, état brut, infos de lissage) ; en mode séquentiel, met à jour la croyance de la session"""
+    if isinstance(detection, ScoreVector):
+        detected_state, probability = sequence_smoother.update(smoothed_session, detection)
+        return detected_state, detection.primary, {
+            "raw_state": detection.primary,
+            "sequence_probability": round(probability, 4)
+        }
+    return detection, detection, {}
+
+async def run_chat_detection(
+    chat_message: ChatMessage,
+    session_id: str
+) -> Tuple[str, NormalizedMessage, str, Dict[str, Any], str]:
+    """Détection commune à /chat et /chat/stream : (message pour le prompt, message normalisé, état, infos de lissage, chemin)"""
+    detection_text = chat_message.message.strip()[:CHAT_MAX_DETECTION_CHARS]
+    clean_message = detection_text[:CHAT_PROMPT_CHARS]
+    smoothed_session = (
+        session_id if sequence_smoother and chat_message.user_id and chat_message.user_id != "anonymous" else None
+    )
+    
+    # Scoring sur les 64 états : hors boucle d'événements pour les messages longs,
+    # repli sur le début du message si le délai est dépassé
+    (message, detection), detection_path = await detection_executor.run(
+        len(detection_text),
+        lambda: score_chat_message(detection_text, smoothed_session is not None),
+        lambda: score_chat_message(clean_message, False)
+    )
+    
+    # Croyance de la session mise à jour sur la boucle, seulement avec un résultat obtenu dans le délai :
+    # un calcul abandonné qui termine en arrière-plan ne modifie pas la session
+    detected_state, raw_state, sequence_info = apply_chat_detection(
+        detection, smoothed_session if detection_path in ("inline", "offloop") else None
+    )
+    
+    # Comparaison shadow planifiée hors du chemin de la requête
+    if shadow_detection:
+        shadow_detection.observe(message, raw_state)
+    
+    return clean_message, message, detected_state, sequence_info, detection_path
+
 @app.post("/chat")
 async def chat_endpoint(chat_message: ChatMessage):
     start_time = time.time()
@@ -1265,10 +708,9 @@ async def chat_endpoint(chat_message: ChatMessage):
         if session_id not in analytics.conversations:
             analytics.start_conversation(session_id, chat_message.user_id)
         
-        clean_message = chat_message.message.strip()[:500]
-        
-        # Détection d'émotion sur les 64 états
-        detected_state = flowme_states.detect_emotion(clean_message)
+        clean_message, message, detected_state, sequence_info, detection_path = await run_chat_detection(
+            chat_message, session_id
+        )
         
         # Génération de réponse avec données des 64 états
         ai_response, mistral_status = await generate_mistral_response(clean_message, detected_state)
@@ -1277,7 +719,7 @@ async def chat_endpoint(chat_message: ChatMessage):
         response_time = time.time() - start_time
         
         # Log des métriques
-        analytics.log_message(session_id, detected_state, response_time)
+        analytics.log_message(session_id, detected_state, response_time, message.token_count)
         
         # Log de la santé système
         analytics.log_system_health(
@@ -1297,7 +739,9 @@ async def chat_endpoint(chat_message: ChatMessage):
             "timestamp": datetime.now().isoformat(),
             "response_time": round(response_time, 2),
             "total_states_available": 64,
-            "state_id": flowme_states.states[detected_state]["id"] if detected_state in flowme_states.states else None
+            "state_id": flowme_states.states[detected_state]["id"] if detected_state in flowme_states.states else None,
+            **sequence_info,
+            **({"detection_fallback": True} if detection_path in ("fallback", "saturated") else {})
         })
         
     except Exception as e:
@@ -1309,8 +753,249 @@ async def chat_endpoint(chat_message: ChatMessage):
             "error": "Service indisponible"
         }, status_code=500)
 
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Événement Server-Sent Events nommé, données en JSON"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(chat_message: ChatMessage):
+    """Conversation en flux SSE : état détecté immédiatement, puis la réponse Mistral fragment par fragment"""
+    start_time = time.time()
+    session_id = chat_message.user_id or "anonymous"
+    
+    try:
+        if not flowme_states:
+            raise HTTPException(status_code=503, detail="Service non disponible")
+        
+        if session_id not in analytics.conversations:
+            analytics.start_conversation(session_id, chat_message.user_id)
+        
+        clean_message, message, detected_state, sequence_info, detection_path = await run_chat_detection(
+            chat_message, session_id
+        )
+        
+    except Exception as e:
+        analytics.log_error("chat_stream_error", str(e), session_id)
+        logger.error(f"Erreur chat (flux): {e}")
+        return JSONResponse({
+            "response": "Je rencontre une difficulté technique. Pouvez-vous réessayer ?",
+            "detected_state": "Présence",
+            "error": "Service indisponible"
+        }, status_code=500)
+    
+    fragments: List[str] = []
+    outcome: Dict[str, Any] = {}
+    
+    async def finalize():
+        # Métriques et sauvegarde de la réponse reçue (complète ou interrompue)
+        response_time = time.time() - start_time
+        analytics.log_message(session_id, detected_state, response_time, message.token_count)
+        analytics.log_system_health(
+            nocodb_status=True,
+            mistral_status=outcome.get("mistral_status", False),
+            response_times={"chat_stream": response_time, "time_to_first_token": outcome.get("time_to_first_token", 0.0)},
+            error_count=0
+        )
+        # Le flux peut être annulé (client déconnecté) : la sauvegarde se termine quand même
+        await asyncio.shield(save_to_nocodb(clean_message, "".join(fragments).strip(), detected_state, session_id))
+    
+    async def events():
+        try:
+            yield sse_event("state", {
+                "detected_state": detected_state,
+                "state_id": flowme_states.states[detected_state]["id"] if detected_state in flowme_states.states else None,
+                "source": "64_états_intégrés",
+                **sequence_info,
+                **({"detection_fallback": True} if detection_path in ("fallback", "saturated") else {})
+            })
+            
+            async for fragment in stream_mistral_response(clean_message, detected_state, outcome):
+                if not fragments:
+                    outcome["time_to_first_token"] = time.time() - start_time
+                fragments.append(fragment)
+                yield sse_event("token", {"text": fragment})
+            
+            yield sse_event("done", {
+                "response_time": round(time.time() - start_time, 2),
+                "time_to_first_token": round(outcome.get("time_to_first_token", 0.0), 3),
+                "timestamp": datetime.now().isoformat()
+            })
+        except Exception as e:
+            analytics.log_error("chat_stream_error", str(e), session_id)
+            logger.error(f"Erreur chat (flux): {e}")
+        finally:
+            # Exécuté aussi quand le client se déconnecte avant la fin du flux
+            await finalize()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Pas de mise en tampon par les proxys : chaque fragment part dès qu'il est produit
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Endpoint synchrone : FastAPI l'exécute dans son pool de threads, le scoring
+# d'un gros lot (calcul pur) ne bloque pas la boucle d'événements
+@app.post("/detect/batch")
+def detect_batch_endpoint(batch: BatchDetectionRequest):
+    """Reclassification vectorisée d'un lot de messages sur les 64 états"""
+    if not flowme_states:
+        raise HTTPException(status_code=503, detail="Service non disponible")
+    
+    if len(batch.messages) > BATCH_MAX_MESSAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Lot trop volumineux ({len(batch.messages)} > {BATCH_MAX_MESSAGES} messages)"
+        )
+    
+    engine = batch.engine or "keywords"
+    if engine not in ("keywords", "tfidf"):
+        raise HTTPException(status_code=400, detail=f"Moteur de détection inconnu: {engine}")
+    
+    start_time = time.time()
+    results = flowme_states.detect_batch(batch.messages, batch.top_k, engine)
+    
+    return JSONResponse({
+        "results": results,
+        "total_messages": len(results),
+        "top_k": batch.top_k,
+        "engine": engine,
+        "processing_time": round(time.time() - start_time, 4)
+    })
+
 # ========== ENDPOINTS SPÉCIAUX 64 ÉTATS ==========
 
+@app.post("/detect/stream")
+async def detect_stream_endpoint(
+    request: Request,
+    window: int = STREAM_WINDOW_WORDS,
+    segment: int = STREAM_SEGMENT_WORDS
+):
+    """Détection en flux d'un texte long (corps brut UTF-8) : trajectoire d'états par segment et état global"""
+    if not flowme_states:
+        raise HTTPException(status_code=503, detail="Service non disponible")
+    if not (1 <= window <= STREAM_MAX_WINDOW_WORDS and segment >= 1):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Paramètres invalides: window entre 1 et {STREAM_MAX_WINDOW_WORDS}, segment >= 1"
+        )
+    
+    declared_size = request.headers.get("content-length")
+    if declared_size and declared_size.isdigit() and int(declared_size) > STREAM_MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail=f"Texte trop volumineux (> {STREAM_MAX_BODY_BYTES} octets)")
+    
+    start_time = time.time()
+    detector = StreamingStateDetector(flowme_states.index, window, segment)
+    # Décodage incrémental : un caractère peut être coupé entre deux morceaux
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    loop = asyncio.get_running_loop()
+    
+    # Le corps est consommé morceau par morceau, sans jamais être gardé en entier ;
+    # le scoring de chaque morceau quitte la boucle d'événements
+    segments = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > STREAM_MAX_BODY_BYTES:
+            raise HTTPException(status_code=413, detail=f"Texte trop volumineux (> {STREAM_MAX_BODY_BYTES} octets)")
+        segments.extend(await loop.run_in_executor(None, detector.feed, decoder.decode(chunk)))
+    segments.extend(detector.feed(decoder.decode(b"", final=True)))
+    remaining, summary = await loop.run_in_executor(None, detector.finish)
+    segments.extend(remaining)
+    
+    return JSONResponse({
+        "segments": segments,
+        "summary": summary,
+        "window_words": window,
+        "segment_words": segment,
+        "processing_time": round(time.time() - start_time, 4)
+    })
+
+@app.websocket("/ws/detect")
+async def detect_websocket(websocket: WebSocket):
+    """
+    Détection pendant la saisie. Le client envoie des modifications du texte
+    ({"op": "replace", "start", "end", "text", "seq"} en caractères, ou
+    {"op": "reset", "text", "seq"}) ; le serveur renvoie l'état courant.
+    Les modifications rapprochées sont regroupées : un seul envoi par
+    intervalle de debounce, et jamais plus d'un envoi en cours (si le client
+    lit lentement, seul l'état le plus récent lui parvient).
+    """
+    await websocket.accept()
+    if not flowme_states:
+        await websocket.close(code=1013)
+        return
+    
+    detector = IncrementalStateDetector(flowme_states.index)
+    changed = asyncio.Event()
+    last_seq = 0
+    
+    async def push_states():
+        while True:
+            await changed.wait()
+            await asyncio.sleep(WS_DEBOUNCE_SECONDS)
+            changed.clear()
+            vector = detector.vector()
+            await websocket.send_json({
+                "type": "state",
+                "seq": last_seq,
+                "state": vector.primary,
+                "score": vector.max_score,
+                "top_states": [{"state": name, "score": score} for name, score in vector.ranked(3)],
+                "words": detector.word_count
+            })
+    
+    sender = asyncio.create_task(push_states())
+    window_start = time.monotonic()
+    window_deltas = 0
+    try:
+        while True:
+            delta = await websocket.receive_json()
+            
+            now = time.monotonic()
+            if now - window_start >= 1.0:
+                window_start, window_deltas = now, 0
+            window_deltas += 1
+            if window_deltas > WS_MAX_DELTAS_PER_SECOND:
+                await websocket.send_json({"type": "error", "detail": "Trop de modifications par seconde"})
+                await websocket.close(code=1008)
+                break
+            
+            if not isinstance(delta, dict):
+                raise ValueError("La modification doit être un objet JSON")
+            # Modification entièrement validée avant d'être appliquée au tampon
+            seq = int(delta["seq"]) if "seq" in delta else last_seq + 1
+            op = delta.get("op")
+            text = delta.get("text", "")
+            if op == "reset":
+                start, end = 0, len(detector.text)
+            elif op == "replace":
+                start, end = int(delta["start"]), int(delta["end"])
+            else:
+                raise ValueError(f"Opération inconnue: {op}")
+            if not isinstance(text, str):
+                raise ValueError("Le champ text doit être une chaîne")
+            
+            if len(detector.text) - max(0, min(end, len(detector.text)) - max(0, start)) + len(text) > WS_MAX_BUFFER_CHARS:
+                await websocket.send_json({"type": "error", "detail": f"Texte limité à {WS_MAX_BUFFER_CHARS} caractères"})
+                await websocket.close(code=1009)
+                break
+            
+            detector.replace(start, end, text)
+            last_seq = seq
+            changed.set()
+    except WebSocketDisconnect:
+        pass
+    except (KeyError, TypeError, ValueError) as e:
+        await websocket.send_json({"type": "error", "detail": f"Modification invalide: {e}"})
+        await websocket.close(code=1003)
+    finally:
+        # Tâche d'envoi attendue : une erreur d'envoi (client parti) est récupérée et journalisée
+        sender.cancel()
+        (outcome,) = await asyncio.gather(sender, return_exceptions=True)
+        if isinstance(outcome, Exception):
+            logger.warning(f"⚠️ Envoi /ws/detect interrompu: {outcome}")
+
 @app.get("/states/list")
 async def list_all_states():
     """Liste complète des 64 états"""
@@ -1361,6 +1046,8 @@ async def debug_64_states():
         "total_states": len(flowme_states.states),
         "source": flowme_states.source,
         "nocodb_additional": len(flowme_states.nocodb_additional_data),
+        "compiled_artifact": compiled_artifact.stats(),
+        "fuzzy_lexicon": flowme_states.index.fuzzy.stats() if flowme_states.index.fuzzy else "désactivé",
         "states_categories": {}
     }
     
@@ -1410,6 +1097,20 @@ async def get_analytics():
         })
     
     summary["recent_conversations"] = recent_conversations
+    summary["detection_cache"] = detection_cache.stats()
+    summary["shadow_detection"] = shadow_detection.stats() if shadow_detection else {"enabled": False}
+    summary["sequence_smoothing"] = sequence_smoother.stats() if sequence_smoother else {"mode": "off"}
+    summary["detection_executor"] = detection_executor.stats()
+    summary["http_pool"] = http_pool.stats()
+    summary["response_cache"] = response_cache.stats()
+    summary["mistral_single_flight"] = mistral_single_flight.stats()
+    summary["hierarchical_detection"] = (
+        flowme_states.clusters.stats() if flowme_states and flowme_states.clusters else {"enabled": False}
+    )
+    summary["mistral_prompts"] = flowme_states.prompts.stats() if flowme_states else {}
+    summary["detection_cascade"] = (
+        flowme_states.cascade.stats() if flowme_states and flowme_states.cascade else {"enabled": False}
+    )
     summary["error_log"] = [
         {
             "timestamp": err["timestamp"].isoformat(),
@@ -5,10 +5,12 @@ Génère des réponses empathiques basées sur les 64 états de conscience
 
 import os
 import asyncio
-import aiohttp
+from functools import lru_cache
 from typing import Dict, Any, Optional
 import logging
 
+from core.http_pool import http_pool
+
 logger = logging.getLogger(__name__)
 
 class MistralService:
@@ -37,28 +39,27 @@ class MistralService:
             system_prompt = self._build_system_prompt(detected_state)
             messages = self._build_messages(system_prompt, user_message, conversation_context)
             
-            # Appel API Mistral
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                payload = {
-                    "model": self.model,
-                    "messages": messages,
-                    "temperature": 0.7,  # Créativité empathique
-                    "max_tokens": 300,   # Réponses concises
-                    "top_p": 0.9
-                }
-                
-                async with session.post(self.base_url, json=payload, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data['choices'][0]['message']['content'].strip()
-                    else:
-                        logger.error(f"Erreur API Mistral: {response.status}")
-                        return self._get_fallback_response(detected_state)
+            # Appel API Mistral (pool de connexions partagé)
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": 0.7,  # Créativité empathique
+                "max_tokens": 300,   # Réponses concises
+                "top_p": 0.9
+            }
+            
+            response = await http_pool.client.post(self.base_url, json=payload, headers=headers, timeout=30.0)
+            if response.status_code == 200:
+                data = response.json()
+                return data['choices'][0]['message']['content'].strip()
+            else:
+                logger.error(f"Erreur API Mistral: {response.status_code}")
+                return self._get_fallback_response(detected_state)
                         
         except Exception as e:
             logger.error(f"Erreur service Mistral: {e}")
@@ -68,26 +69,11 @@ class MistralService:
         """
         Construit le prompt système basé sur l'état détecté
         """
-        state_id = detected_state.get('state_id', 1)
-        state_name = detected_state.get('state_name', 'Émerveillement')
-        advice = detected_state.get('advice', '')
-        
-        return f"""Tu es un coach empathique spécialisé dans les 64 états de conscience selon Stefan Hoareau.
-
-L'utilisateur exprime actuellement l'État {state_id}: {state_name}.
-
-Conseils contextuels: {advice}
-
-DIRECTIVES IMPORTANTES:
-- Réponds avec empathie et bienveillance
-- Évite tout jugement ou critique
-- Utilise un ton chaleureux et compréhensif
-- Propose des perspectives constructives
-- Reste dans l'état émotionnel détecté
-- Maximum 2-3 phrases courtes
-- Utilise "tu" pour créer la proximité
-
-Objectif: Accompagner l'utilisateur avec sagesse et compassion selon l'approche Stefan Hoareau."""
+        return _system_prompt(
+            detected_state.get('state_id', 1),
+            detected_state.get('state_name', 'Émerveillement'),
+            detected_state.get('advice', '')
+        )
 
     def _build_messages(self, system_prompt: str, user_message: str, context: list = None) -> list:
         """
@@ -120,5 +106,25 @@ Objectif: Accompagner l'utilisateur avec sagesse et compassion selon l'approche
         
         return fallbacks.get(state_id, "Je t'entends et je respecte ce que tu traverses. Tu n'es pas seul(e).")
 
+@lru_cache(maxsize=256)
+def _system_prompt(state_id: int, state_name: str, advice: str) -> str:
+    """Prompt système d'un état, rendu une seule fois par (état, conseil)"""
+    return f"""Tu es un coach empathique spécialisé dans les 64 états de conscience selon Stefan Hoareau.
+
+L'utilisateur exprime actuellement l'État {state_id}: {state_name}.
+
+Conseils contextuels: {advice}
+
+DIRECTIVES IMPORTANTES:
+- Réponds avec empathie et bienveillance
+- Évite tout jugement ou critique
+- Utilise un ton chaleureux et compréhensif
+- Propose des perspectives constructives
+- Reste dans l'état émotionnel détecté
+- Maximum 2-3 phrases courtes
+- Utilise "tu" pour créer la proximité
+
+Objectif: Accompagner l'utilisateur avec sagesse et compassion selon l'approche Stefan Hoareau."""
+
 # Instance globale
 mistral_service = MistralService()
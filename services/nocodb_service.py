@@ -5,12 +5,13 @@ Adapté aux structures de tables existantes
 
 import os
 import asyncio
-import aiohttp
 import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 import logging
 
+from core.http_pool import http_pool
+
 logger = logging.getLogger(__name__)
 
 class NocoDBService:
@@ -62,17 +63,15 @@ class NocoDBService:
                 "Content-Type": "application/json"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=record, headers=headers) as response:
-                    if response.status in [200, 201]:
-                        result = await response.json()
-                        record_id = result.get('Id') or result.get('id', 'N/A')
-                        logger.info(f"Interaction sauvegardée: {record_id}")
-                        return True
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Erreur NocoDB {response.status}: {error_text}")
-                        return False
+            response = await http_pool.client.post(url, json=record, headers=headers)
+            if response.status_code in [200, 201]:
+                result = response.json()
+                record_id = result.get('Id') or result.get('id', 'N/A')
+                logger.info(f"Interaction sauvegardée: {record_id}")
+                return True
+            else:
+                logger.error(f"Erreur NocoDB {response.status_code}: {response.text}")
+                return False
                         
         except Exception as e:
             logger.error(f"Erreur sauvegarde NocoDB: {e}")
@@ -97,26 +96,25 @@ class NocoDBService:
                 "Content-Type": "application/json"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        states = data.get('list', [])
-                        if states:
-                            state = states[0]
-                            return {
-                                'id': state.get('ID_État'),
-                                'nom': state.get('Nom_État'),
-                                'famille': state.get('Famille_Symbolique'),
-                                'tension': state.get('Tension_Dominante'),
-                                'mot_cle': state.get('Mot_Clé'),
-                                'declencheurs': state.get('Déclencheurs'),
-                                'posture': state.get('Posture_Adaptative'),
-                                'compatibles': state.get('États_Compatibles'),
-                                'sequentiels': state.get('États_Séquenciels'),
-                                'conseil': state.get('Conseil_Flowme')
-                            }
-                    return {}
+            response = await http_pool.client.get(url, params=params, headers=headers)
+            if response.status_code == 200:
+                data = response.json()
+                states = data.get('list', [])
+                if states:
+                    state = states[0]
+                    return {
+                        'id': state.get('ID_État'),
+                        'nom': state.get('Nom_État'),
+                        'famille': state.get('Famille_Symbolique'),
+                        'tension': state.get('Tension_Dominante'),
+                        'mot_cle': state.get('Mot_Clé'),
+                        'declencheurs': state.get('Déclencheurs'),
+                        'posture': state.get('Posture_Adaptative'),
+                        'compatibles': state.get('États_Compatibles'),
+                        'sequentiels': state.get('États_Séquenciels'),
+                        'conseil': state.get('Conseil_Flowme')
+                    }
+            return {}
                     
         except Exception as e:
             logger.error(f"Erreur récupération état {state_id}: {e}")
@@ -146,26 +144,25 @@ class NocoDBService:
                 "Content-Type": "application/json"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        conversations = []
-                        
-                        for record in data.get('list', []):
-                            conversations.append({
-                                'timestamp': record.get('timestamp'),
-                                'etat_nom': record.get('etat_nom'),
-                                'etat_id': record.get('etat_id_flowme'),
-                                'recommandations': record.get('recommandations'),
-                                'score_bien_etre': record.get('score_bien_etre'),
-                                'session_id': record.get('session_id')
-                            })
-                        
-                        return conversations
-                    else:
-                        logger.error(f"Erreur récupération historique: {response.status}")
-                        return []
+            response = await http_pool.client.get(url, params=params, headers=headers)
+            if response.status_code == 200:
+                data = response.json()
+                conversations = []
+                
+                for record in data.get('list', []):
+                    conversations.append({
+                        'timestamp': record.get('timestamp'),
+                        'etat_nom': record.get('etat_nom'),
+                        'etat_id': record.get('etat_id_flowme'),
+                        'recommandations': record.get('recommandations'),
+                        'score_bien_etre': record.get('score_bien_etre'),
+                        'session_id': record.get('session_id')
+                    })
+                
+                return conversations
+            else:
+                logger.error(f"Erreur récupération historique: {response.status_code}")
+                return []
                         
         except Exception as e:
             logger.error(f"Erreur historique NocoDB: {e}")
@@ -193,54 +190,53 @@ class NocoDBService:
                 "Content-Type": "application/json"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        records = data.get('list', [])
-                        
-                        # Calculs d'analytics
-                        total_interactions = len(records)
-                        
-                        # États les plus fréquents
-                        state_counts = {}
-                        scores = []
-                        sessions = set()
-                        
-                        for record in records:
-                            # Compter les états
-                            etat = record.get('etat_nom')
-                            if etat and etat not in ['test_detection', 'test_nom', 'direct_test']:  # Exclure les tests
-                                state_counts[etat] = state_counts.get(etat, 0) + 1
-                            
-                            # Collecter scores de bien-être
-                            score = record.get('score_bien_etre')
-                            if score is not None and isinstance(score, (int, float)):
-                                scores.append(score)
-                            
-                            # Compter sessions uniques
-                            session_id = record.get('session_id')
-                            if session_id:
-                                sessions.add(session_id)
-                        
-                        # Top 5 des états
-                        top_states = sorted(state_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-                        
-                        # Score moyen de bien-être
-                        avg_score = sum(scores) / len(scores) if scores else 0
-                        
-                        return {
-                            "period_days": days,
-                            "total_interactions": total_interactions,
-                            "unique_sessions": len(sessions),
-                            "top_states": [{"state": state, "count": count} for state, count in top_states],
-                            "average_wellbeing_score": round(avg_score, 2),
-                            "wellbeing_scores_count": len(scores),
-                            "generated_at": datetime.utcnow().isoformat()
-                        }
-                    else:
-                        return {}
-                        
+            response = await http_pool.client.get(url, params=params, headers=headers)
+            if response.status_code == 200:
+                data = response.json()
+                records = data.get('list', [])
+                
+                # Calculs d'analytics
+                total_interactions = len(records)
+                
+                # États les plus fréquents
+                state_counts = {}
+                scores = []
+                sessions = set()
+                
+                for record in records:
+                    # Compter les états
+                    etat = record.get('etat_nom')
+                    if etat and etat not in ['test_detection', 'test_nom', 'direct_test']:  # Exclure les tests
+                        state_counts[etat] = state_counts.get(etat, 0) + 1
+                    
+                    # Collecter scores de bien-être
+                    score = record.get('score_bien_etre')
+                    if score is not None and isinstance(score, (int, float)):
+                        scores.append(score)
+                    
+                    # Compter sessions uniques
+                    session_id = record.get('session_id')
+                    if session_id:
+                        sessions.add(session_id)
+                
+                # Top 5 des états
+                top_states = sorted(state_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+                
+                # Score moyen de bien-être
+                avg_score = sum(scores) / len(scores) if scores else 0
+                
+                return {
+                    "period_days": days,
+                    "total_interactions": total_interactions,
+                    "unique_sessions": len(sessions),
+                    "top_states": [{"state": state, "count": count} for state, count in top_states],
+                    "average_wellbeing_score": round(avg_score, 2),
+                    "wellbeing_scores_count": len(scores),
+                    "generated_at": datetime.utcnow().isoformat()
+                }
+            else:
+                return {}
+                
         except Exception as e:
             logger.error(f"Erreur analytics NocoDB: {e}")
             return {}
@@ -271,26 +267,25 @@ class NocoDBService:
             
             params = {"where": where_clause}
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        test_records = data.get('list', [])
-                        
-                        logger.info(f"Trouvé {len(test_records)} enregistrements de test à nettoyer")
-                        
-                        # Suppression des enregistrements de test
-                        deleted_count = 0
-                        for record in test_records:
-                            record_id = record.get('Id') or record.get('id')
-                            if record_id:
-                                delete_url = f"{url}/{record_id}"
-                                async with session.delete(delete_url, headers=headers) as del_response:
-                                    if del_response.status == 200:
-                                        deleted_count += 1
-                        
-                        logger.info(f"Supprimé {deleted_count} enregistrements de test")
-                        return deleted_count > 0
+            response = await http_pool.client.get(url, params=params, headers=headers)
+            if response.status_code == 200:
+                data = response.json()
+                test_records = data.get('list', [])
+                
+                logger.info(f"Trouvé {len(test_records)} enregistrements de test à nettoyer")
+                
+                # Suppression des enregistrements de test
+                deleted_count = 0
+                for record in test_records:
+                    record_id = record.get('Id') or record.get('id')
+                    if record_id:
+                        delete_url = f"{url}/{record_id}"
+                        del_response = await http_pool.client.delete(delete_url, headers=headers)
+                        if del_response.status_code == 200:
+                            deleted_count += 1
+                
+                logger.info(f"Supprimé {deleted_count} enregistrements de test")
+                return deleted_count > 0
                         
             return False
                         
@@ -320,27 +315,26 @@ class NocoDBService:
             url = f"{self.base_url}/api/v1/db/data/v1/{self.reactions_table_id}"
             headers = {"xc-token": self.api_key}
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params={"limit": 1}, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        total_records = len(data.get('list', []))
-                        
-                        return {
-                            "status": "healthy",
-                            "message": "Connexion NocoDB OK",
-                            "configured": True,
-                            "reactions_table_accessible": True,
-                            "total_interactions": total_records,
-                            "states_table_configured": bool(self.states_table_id)
-                        }
-                    else:
-                        return {
-                            "status": "error",
-                            "message": f"Erreur connexion: {response.status}",
-                            "configured": True,
-                            "reactions_table_accessible": False
-                        }
+            response = await http_pool.client.get(url, params={"limit": 1}, headers=headers)
+            if response.status_code == 200:
+                data = response.json()
+                total_records = len(data.get('list', []))
+                
+                return {
+                    "status": "healthy",
+                    "message": "Connexion NocoDB OK",
+                    "configured": True,
+                    "reactions_table_accessible": True,
+                    "total_interactions": total_records,
+                    "states_table_configured": bool(self.states_table_id)
+                }
+            else:
+                return {
+                    "status": "error",
+                    "message": f"Erreur connexion: {response.status_code}",
+                    "configured": True,
+                    "reactions_table_accessible": False
+                }
                         
         except Exception as e:
             return {
@@ -350,5 +344,58 @@ class NocoDBService:
                 "reactions_table_accessible": False
             }
 
-# Instance globale
+class NocoDBCoreAdapter:
+    """
+    Interface attendue par core/flowme_core.py (identifiants d'états 1-64,
+    résultats simples) au-dessus de NocoDBService
+    """
+    
+    def __init__(self, service: NocoDBService):
+        self.service = service
+    
+    async def get_all_states_briefs(self) -> Dict[int, str]:
+        """Aucun chargement global : les descriptions sont récupérées état par état (get_state_brief)"""
+        return {}
+    
+    async def get_state_brief(self, state_id: int) -> Optional[str]:
+        details = await self.service.get_state_details(state_id)
+        if not details.get('nom'):
+            return None
+        return f"{details['nom']} - {details['famille']}" if details.get('famille') else details['nom']
+    
+    async def get_session_history(self, session_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Historique au format de FlowMeCore (le message utilisateur n'est pas stocké dans les réactions)"""
+        history = await self.service.get_conversation_history(session_id, limit)
+        return [
+            {
+                "timestamp": item.get('timestamp'),
+                "state_name": item.get('etat_nom') or "",
+                "detected_state": int(item['etat_id']) if str(item.get('etat_id') or "").isdigit() else None,
+                "user_message": ""
+            }
+            for item in history
+        ]
+    
+    async def save_reaction(
+        self,
+        session_id: str,
+        user_message: str,
+        detected_state: int,
+        state_name: str,
+        mistral_reply: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        return await self.service.save_reaction(
+            session_id=session_id,
+            user_message=user_message,
+            detected_state={"state_id": detected_state, "state_name": state_name},
+            ai_response=mistral_reply
+        )
+    
+    async def health_check(self) -> bool:
+        status = await self.service.health_check()
+        return status.get("status") == "healthy"
+
+# Instances globales
 nocodb_service = NocoDBService()
+nocodb_client = NocoDBCoreAdapter(nocodb_service)
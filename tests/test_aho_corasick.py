@@ -0,0 +1,56 @@
+"""
+Automate Aho-Corasick : mêmes occurrences que la recherche motif par motif ("in" / str.find)
+"""
+
+import random
+
+from core.aho_corasick import AhoCorasickAutomaton
+from core.lexicon import EMOTION_KEYWORDS, INTENSITY_MODIFIERS, NEGATIONS
+
+LEXICON = (
+    [word for categories in EMOTION_KEYWORDS.values() for words in categories.values() for word in words]
+    + list(INTENSITY_MODIFIERS) + NEGATIONS
+)
+FILLERS = ["je", "suis", "aujourd'hui", "avec", "plusieurs", "nenni", "ça", "va", "du", "tout"]
+
+
+def find_all(text, pattern):
+    """Toutes les positions de pattern dans text, chevauchements compris"""
+    positions = []
+    position = text.find(pattern)
+    while position != -1:
+        positions.append(position)
+        position = text.find(pattern, position + 1)
+    return positions
+
+
+def random_text(rng):
+    pieces = []
+    for _ in range(rng.randint(0, 20)):
+        word = rng.choice(LEXICON) if rng.random() < 0.5 else rng.choice(FILLERS)
+        if rng.random() < 0.2:
+            # Motifs collés ou tronqués : occurrences à l'intérieur des mots et chevauchantes
+            word = word[rng.randint(0, len(word) - 1):] + rng.choice(LEXICON)
+        pieces.append(word + rng.choice(["", "", ",", ".", "!", "'"]))
+    return rng.choice([" ", "  ", "\n"]).join(pieces).lower()
+
+
+def test_automaton_matches_substring_scanner():
+    automaton = AhoCorasickAutomaton(LEXICON)
+    rng = random.Random(20240606)
+
+    for _ in range(5000):
+        text = random_text(rng)
+        found = sorted(automaton.iter_matches(text))
+        expected = sorted(
+            (position, pid) for pid, pattern in enumerate(automaton.patterns)
+            for position in find_all(text, pattern)
+        )
+        assert found == expected, text
+
+        # Sémantique de l'ancien scorer : motifs présents ("in") et première occurrence (str.index)
+        first = {}
+        for position, pid in found:
+            first.setdefault(pid, position)
+        assert set(first) == {pid for pid, pattern in enumerate(automaton.patterns) if pattern in text}
+        assert all(text.index(automaton.patterns[pid]) == position for pid, position in first.items())
@@ -0,0 +1,17 @@
+"""
+Artefact compilé : réutilisé tel quel, périmé dès que les sources ou le code changent
+"""
+
+import core.artifact as artifact
+from core.artifact import CompiledArtifact, build_artifact, source_hash, states_sources
+from core.states_table import FLOWME_64_STATES
+
+
+def test_artifact_is_stale_after_code_change(tmp_path, monkeypatch):
+    path = str(tmp_path / "flowme_compiled.pkl")
+    build_artifact(path)
+    expected = source_hash(states_sources(FLOWME_64_STATES))
+    assert CompiledArtifact(path).get("states_64", expected) is not None
+
+    monkeypatch.setattr(artifact, "_code_hash", "code modifié")
+    assert CompiledArtifact(path).get("states_64", source_hash(states_sources(FLOWME_64_STATES))) is None
@@ -0,0 +1,44 @@
+"""
+Parité du scoring par lots avec le scoring message par message de l'index inversé
+"""
+
+import random
+
+import pytest
+
+from core.batch_scorer import BatchStateScorer
+from core.scoring import ScoreVector
+from core.state_index import StateInvertedIndex
+from core.states_table import FLOWME_64_STATES
+from tests.test_state_index import random_message, vocabulary
+
+
+@pytest.fixture(scope="module")
+def batch():
+    index = StateInvertedIndex(FLOWME_64_STATES, fuzzy=False)
+    rng = random.Random(20240602)
+    words = vocabulary(FLOWME_64_STATES)
+    texts = [random_message(rng, words) for _ in range(3000)] + ["", "   ", "Présence"]
+    return index, BatchStateScorer(index, chunk_size=512), texts
+
+
+def test_score_matrix_matches_index(batch):
+    index, scorer, texts = batch
+    for text, vector in zip(texts, scorer.score_vectors(texts)):
+        assert vector == ScoreVector.from_scores(index.state_names, index.score(text)), text
+
+
+@pytest.mark.parametrize("k", [1, 3, 64])
+def test_top_k_matches_ranked_scores(batch, k):
+    index, scorer, texts = batch
+    ties = 0
+    for text, top_states in zip(texts, scorer.top_k(texts, k)):
+        scores = index.score(text)
+        # Ordre de detect_emotion : score décroissant, ordre de la table en cas d'égalité
+        expected = ScoreVector.from_scores(index.state_names, scores).ranked(k)
+        assert top_states == expected, text
+        if top_states:
+            assert top_states[0][0] == max(scores, key=scores.get)
+            ties += list(scores.values()).count(top_states[0][1]) > 1
+    # Le lot contient bien des égalités à départager pour l'état principal
+    assert ties > 0
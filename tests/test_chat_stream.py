@@ -0,0 +1,55 @@
+"""
+/chat/stream : métriques et sauvegarde même si le client se déconnecte, erreurs journalisées comme /chat
+"""
+
+import asyncio
+
+import pytest
+
+import main
+from core.states_detection import Enhanced64StatesDetection
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    calls = []
+
+    async def fake_save(user_message, ai_response, detected_state, user_id):
+        calls.append((user_message, ai_response, detected_state, user_id))
+        return True
+
+    monkeypatch.setattr(main, "MISTRAL_API_KEY", None)
+    monkeypatch.setattr(main, "flowme_states", Enhanced64StatesDetection("test"))
+    monkeypatch.setattr(main, "sequence_smoother", None)
+    monkeypatch.setattr(main, "shadow_detection", None)
+    monkeypatch.setattr(main, "analytics", main.FlowMeAnalytics())
+    monkeypatch.setattr(main, "save_to_nocodb", fake_save)
+    return calls
+
+
+def test_disconnect_still_finalizes(saved):
+    async def disconnect_after_first_event():
+        response = await main.chat_stream_endpoint(main.ChatMessage(message="je suis stressé", user_id="u1"))
+        events = response.body_iterator
+        first = await events.__anext__()
+        # Client parti après l'état détecté : le flux est fermé sans être consommé
+        await events.aclose()
+        return first
+
+    first = asyncio.run(disconnect_after_first_event())
+
+    assert first.startswith("event: state")
+    assert main.analytics.conversations["u1"].message_count == 1
+    assert saved == [("je suis stressé", "", "Prudence", "u1")]
+
+
+def test_detection_error_is_logged(saved, monkeypatch):
+    async def failing_detection(chat_message, session_id):
+        raise RuntimeError("détection impossible")
+
+    monkeypatch.setattr(main, "run_chat_detection", failing_detection)
+    response = asyncio.run(main.chat_stream_endpoint(main.ChatMessage(message="bonjour", user_id="u2")))
+
+    assert response.status_code == 500
+    assert main.analytics.error_log[-1]["type"] == "chat_stream_error"
+    assert saved == []
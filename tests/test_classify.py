@@ -0,0 +1,32 @@
+"""
+Classification hors ligne : une ligne de sortie par ligne d'entrée, sans l'application web
+"""
+
+import os
+import subprocess
+import sys
+
+import classify
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_invalid_lines_give_error_records(monkeypatch):
+    monkeypatch.setattr(classify, "_worker_detectors", {})
+    classify._init_worker("both")
+    lines = ['{"message": "je suis stressé", "id": "a"}\n', "{pas du json\n", "\n", '"texte brut"\n']
+
+    messages = list(classify.read_messages(lines, "ndjson", "message", "id"))
+    results = classify._classify_chunk(messages)
+
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[0]["id"] == "a" and results[0]["state_64"] == "Prudence" and "error" not in results[0]
+    assert results[1]["error"].startswith("JSON invalide") and "state_64" not in results[1]
+    assert results[2]["error"] == "Ligne vide"
+    assert "state_64" in results[3] and "emotion" in results[3]
+
+
+def test_worker_does_not_import_web_app():
+    check = "import classify, sys; classify._init_worker('both'); print('main' in sys.modules, 'fastapi' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ["False", "False"]
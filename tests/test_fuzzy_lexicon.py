@@ -0,0 +1,70 @@
+"""
+Recherche tolérante aux fautes : mots mal orthographiés retrouvés, mots courants jamais corrigés
+"""
+
+import os
+
+import pytest
+
+from core.fuzzy_lexicon import DeletionIndex
+from core.state_index import StateInvertedIndex
+from core.states_table import FLOWME_64_STATES
+from flowme_states_detection import EnhancedEmotionDetection
+
+MISSPELLED = [
+    ("je suis stréssé", "Peur"),
+    ("je suis anxieu", "Peur"),
+    ("ça m'enerve", "Colère"),
+]
+
+# Mots courants proches d'un terme du lexique ("passe" / "passé", "passer" / "passé")
+COMMON_PHRASES = [
+    "comment ça se passe au travail",
+    "je vais passer te voir demain",
+]
+
+
+@pytest.fixture(scope="module")
+def emotions():
+    return EnhancedEmotionDetection(FLOWME_64_STATES, fuzzy=True), EnhancedEmotionDetection(FLOWME_64_STATES, fuzzy=False)
+
+
+@pytest.fixture(scope="module")
+def indexes():
+    return StateInvertedIndex(FLOWME_64_STATES, fuzzy=True), StateInvertedIndex(FLOWME_64_STATES, fuzzy=False)
+
+
+@pytest.mark.parametrize("text,emotion", MISSPELLED)
+def test_misspelled_keywords_are_found(emotions, text, emotion):
+    fuzzy, exact = emotions
+    assert fuzzy.score(text).primary == emotion
+    assert exact.score(text).primary == "Présence"
+
+
+@pytest.mark.parametrize("text", ["je suis stréssé", "ça m'enerve"])
+def test_misspelled_keywords_score_states(indexes, text):
+    fuzzy, exact = indexes
+    assert fuzzy.score(text)
+    assert not exact.score(text)
+
+
+@pytest.mark.parametrize("text", COMMON_PHRASES)
+def test_common_words_are_not_corrected(emotions, indexes, text):
+    fuzzy, exact = emotions
+    assert fuzzy.score(text) == exact.score(text)
+    assert fuzzy.score(text).primary != "Nostalgie"
+    fuzzy_index, exact_index = indexes
+    assert fuzzy_index.score(text) == exact_index.score(text)
+
+
+def test_short_words_need_exact_accents():
+    index = DeletionIndex([("passé", 0), ("calme", 1), ("anxieux", 2)])
+    assert index.lookup("passe") == ()
+    assert index.lookup("calmé") == ()
+    assert index.lookup("anxieu") == (2,)
+
+
+@pytest.mark.skipif("FLOWME_FUZZY_LOOKUP" in os.environ, reason="mode fixé par l'environnement")
+def test_fuzzy_lookup_is_off_by_default():
+    assert EnhancedEmotionDetection(FLOWME_64_STATES).fuzzy is None
+    assert StateInvertedIndex(FLOWME_64_STATES).fuzzy is None
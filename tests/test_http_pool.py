@@ -0,0 +1,33 @@
+"""
+Pool HTTP partagé : ouvert et fermé par le lifespan de l'application
+"""
+
+import asyncio
+
+import pytest
+
+import main
+from core.http_pool import http_pool
+
+
+def test_lifespan_owns_the_client(monkeypatch):
+    events = []
+
+    async def fake_startup():
+        events.append(("startup", http_pool._client is not None))
+
+    async def fake_shutdown():
+        events.append(("shutdown", http_pool._client is not None))
+
+    monkeypatch.setattr(main, "startup_event", fake_startup)
+    monkeypatch.setattr(main, "shutdown_event", fake_shutdown)
+
+    async def run():
+        async with main.lifespan(main.app):
+            assert not http_pool.client.is_closed
+
+    asyncio.run(run())
+
+    assert events == [("startup", True), ("shutdown", True)]
+    with pytest.raises(RuntimeError):
+        http_pool.client
@@ -0,0 +1,68 @@
+"""
+Détection incrémentale pendant la saisie : mêmes scores qu'un nouveau scoring du texte complet
+"""
+
+import random
+
+from core.incremental_detection import IncrementalStateDetector
+from core.scoring import ScoreVector
+from core.state_index import StateInvertedIndex
+from core.states_table import FLOWME_64_STATES
+from tests.test_state_index import random_message, vocabulary
+
+
+def full_vector(index, text):
+    return ScoreVector.from_scores(index.state_names, index.score(text))
+
+
+def test_casefold_expansion_does_not_shift_phrases():
+    states = {
+        "Calme": {"mot_cle": "mer calme", "declencheurs": "", "famille_symbolique": "", "tension_dominante": ""},
+        "Autre": {"mot_cle": "autre", "declencheurs": "", "famille_symbolique": "", "tension_dominante": ""},
+    }
+    index = StateInvertedIndex(states, fuzzy=False)
+    detector = IncrementalStateDetector(index)
+    text = "ß mer calme yy zz"
+    for position, char in enumerate(text):
+        detector.replace(position, position, char)
+    assert detector.vector() == full_vector(index, text)
+
+    # "ß" devient "ss" : la phrase ne doit pas être comptée une seconde fois dans la région de "yy",
+    # sinon elle survit à la modification de "mer" (qui ne redécoupe pas "yy")
+    detector.replace(2, 5, "mur")
+    assert detector.text == "ß mur calme yy zz"
+    assert detector.vector() == full_vector(index, detector.text)
+
+
+def random_edit(rng, words, text):
+    """Modification de saisie : frappe, collage, suppression, remplacement ou remise à zéro"""
+    roll = rng.random()
+    if roll < 0.03:
+        return "reset", 0, len(text), random_message(rng, words)
+    start = rng.randint(0, len(text))
+    if roll < 0.45:
+        # Frappe d'un caractère, espace compris
+        return "replace", start, start, rng.choice("abcdeéèsprt ,.!'ß")
+    if roll < 0.65:
+        return "replace", start, start, rng.choice([" ", ""]) + random_message(rng, words)[:30]
+    end = min(len(text), start + rng.randint(1, 15))
+    if roll < 0.85:
+        return "replace", start, end, ""
+    return "replace", start, end, rng.choice(words) + rng.choice(["", " ", " comprend pas "])
+
+
+def test_incremental_matches_full_rescoring():
+    index = StateInvertedIndex(FLOWME_64_STATES, fuzzy=False)
+    words = vocabulary(FLOWME_64_STATES)
+    rng = random.Random(20240604)
+
+    for _ in range(60):
+        detector = IncrementalStateDetector(index)
+        for _ in range(80):
+            op, start, end, new_text = random_edit(rng, words, detector.text)
+            if op == "reset":
+                detector.reset(new_text)
+            else:
+                detector.replace(start, end, new_text)
+            assert detector.vector() == full_vector(index, detector.text), detector.text
+            assert detector.word_count == len(detector.text.split())
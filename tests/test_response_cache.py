@@ -0,0 +1,56 @@
+"""
+Cache des réponses Mistral : quasi-doublons réutilisés, négations jamais servies depuis la forme positive
+"""
+
+import asyncio
+
+import main
+from core.response_cache import ResponseCache, message_polarity, minhash_signature, signature_similarity
+from core.states_detection import Enhanced64StatesDetection
+
+POSITIVE = "je suis vraiment heureux aujourd'hui avec ma famille, on a passé une très belle journée ensemble"
+NEGATED = "je ne suis vraiment pas heureux aujourd'hui avec ma famille, on a passé une très belle journée ensemble"
+
+
+def test_near_duplicate_is_served():
+    cache = ResponseCache(enabled=True)
+    cache.store("Émerveillement", POSITIVE, "Quelle belle journée !")
+    assert cache.lookup("Émerveillement", POSITIVE + " !") == "Quelle belle journée !"
+
+
+def test_negation_changes_polarity():
+    assert message_polarity(POSITIVE) == "positive"
+    assert message_polarity(NEGATED) == "negative"
+    assert message_polarity("ça n'est plus pareil") == "negative"
+
+
+def test_negated_message_is_not_served_from_cache():
+    # Au-dessus du seuil de similarité : seule la polarité les distingue
+    assert signature_similarity(minhash_signature(POSITIVE), minhash_signature(NEGATED)) >= 0.8
+    cache = ResponseCache(enabled=True)
+    cache.store("Émerveillement", POSITIVE, "Quelle belle journée !")
+    assert cache.lookup("Émerveillement", NEGATED) is None
+
+
+def test_chat_does_not_reuse_positive_reply_for_negated_message(monkeypatch):
+    # Table d'états locale : aucun appel NocoDB, même si NOCODB_API_KEY est défini
+    monkeypatch.setattr(main, "flowme_states", Enhanced64StatesDetection("test"))
+    assert main.flowme_states.detect_emotion(POSITIVE) == main.flowme_states.detect_emotion(NEGATED)
+
+    calls = []
+
+    async def fake_completion(headers, payload):
+        calls.append(payload["messages"][-1]["content"])
+        return f"réponse {len(calls)}"
+
+    monkeypatch.setattr(main, "MISTRAL_API_KEY", "test")
+    monkeypatch.setattr(main, "request_mistral_completion", fake_completion)
+    monkeypatch.setattr(main, "response_cache", ResponseCache(enabled=True))
+
+    state = main.flowme_states.detect_emotion(POSITIVE)
+    first, _ = asyncio.run(main.generate_mistral_response(POSITIVE, state))
+    second, _ = asyncio.run(main.generate_mistral_response(NEGATED, state))
+
+    assert first == "réponse 1"
+    assert second == "réponse 2"
+    assert calls == [POSITIVE, NEGATED]
@@ -0,0 +1,41 @@
+"""
+Détection hiérarchique : l'élagage par groupes retient le même état que le scoring exhaustif
+"""
+
+import random
+
+from core.state_clusters import ClusteredStateIndex
+from core.state_index import StateInvertedIndex
+from core.states_table import FLOWME_64_STATES
+from tests.test_state_index import random_message, vocabulary
+
+
+def detected_state(scores):
+    """Sélection de Enhanced64StatesDetection : premier meilleur score dans l'ordre de la table"""
+    return max(scores, key=scores.get) if scores else "Présence"
+
+
+def test_pruning_matches_exhaustive_scoring():
+    index = StateInvertedIndex(FLOWME_64_STATES, fuzzy=False)
+    clusters = ClusteredStateIndex(index, FLOWME_64_STATES)
+    words = vocabulary(FLOWME_64_STATES)
+    rng = random.Random(20240605)
+
+    messages = 3000
+    for _ in range(messages):
+        message = random_message(rng, words)
+        exhaustive = index.score(message)
+        pruned = clusters.score(message)
+
+        assert detected_state(pruned) == detected_state(exhaustive), message
+        # Les états scorés ont leur score complet ; les états élagués ne peuvent pas dépasser le meilleur
+        assert all(exhaustive[name] == score for name, score in pruned.items()), message
+        assert max(pruned.values(), default=0) == max(exhaustive.values(), default=0), message
+
+    stats = clusters.stats()
+    assert stats["requests"] == messages
+    assert stats["states_pruned"] > 0
+
+    # Recalcul hors requête servie (mode shadow) : compteurs inchangés
+    clusters.score(random_message(rng, words), record=False)
+    assert clusters.stats()["requests"] == messages
@@ -0,0 +1,84 @@
+"""
+Parité de l'index inversé des 64 états avec l'ancien scorer (boucle sur chaque état)
+"""
+
+import random
+
+from core.state_index import StateInvertedIndex
+from core.states_table import FLOWME_64_STATES
+
+THEMATIC_CHECKS = [
+    (("joie", "heur", "content"), ("émerveille", "rayonne")),
+    (("trist", "mélan", "sombre"), ("silence", "contempla")),
+    (("peur", "anxie", "stress"), ("vigilance", "prudence")),
+    (("colère", "énervé", "frustré"), ("tension", "excessive")),
+    (("confusion", "perdu", "comprend pas"), ("perplexité", "altération")),
+    (("émerveil", "fascin", "découvr"), ("éveil", "émerveillement")),
+]
+
+FILLERS = ["je", "suis", "vraiment", "aujourd'hui", "avec", "ma", "famille", "le", "travail", "et", "mais", "ça", "va"]
+PUNCTUATION = ["", "", "", ".", ",", "!", "?", "…"]
+
+
+def baseline_scores(states, text):
+    """Scorer historique de Enhanced64StatesDetection.detect_emotion, état par état"""
+    text_lower = text.lower()
+    emotion_scores = {}
+    for state_name, state_data in states.items():
+        score = 0
+        if state_data["mot_cle"].lower() in text_lower:
+            score += 5
+        for field, weight in (("declencheurs", 3), ("famille_symbolique", 2), ("tension_dominante", 2)):
+            for word in state_data[field].lower().split():
+                if len(word) > 3 and word in text_lower:
+                    score += weight
+        for triggers, fragments in THEMATIC_CHECKS:
+            if any(trigger in text_lower for trigger in triggers):
+                if any(fragment in state_name.lower() for fragment in fragments):
+                    score += 4
+        if score > 0:
+            emotion_scores[state_name] = score
+    return emotion_scores
+
+
+def vocabulary(states):
+    words = set()
+    for data in states.values():
+        for field in ("mot_cle", "declencheurs", "famille_symbolique", "tension_dominante"):
+            words.update(data[field].lower().split())
+    words.update(trigger for triggers, _ in THEMATIC_CHECKS for trigger in triggers)
+    return sorted(words)
+
+
+def random_message(rng, words):
+    pieces = []
+    for _ in range(rng.randint(0, 25)):
+        roll = rng.random()
+        if roll < 0.45:
+            word = rng.choice(words)
+        elif roll < 0.65:
+            # Fragment ou mot composé : sous-chaînes et motifs à cheval sur deux mots
+            word = rng.choice(words)
+            start = rng.randint(0, max(0, len(word) - 2))
+            word = word[start:start + rng.randint(1, len(word))] + rng.choice(["", rng.choice(words)])
+        else:
+            word = rng.choice(FILLERS)
+        if rng.random() < 0.15:
+            word = word.capitalize()
+        pieces.append(word + rng.choice(PUNCTUATION))
+    if rng.random() < 0.2:
+        pieces.insert(rng.randint(0, len(pieces)), "comprend pas")
+    return rng.choice([" ", "  ", " \n"]).join(pieces)
+
+
+def test_inverted_index_matches_baseline_scorer():
+    index = StateInvertedIndex(FLOWME_64_STATES, fuzzy=False)
+    words = vocabulary(FLOWME_64_STATES)
+    rng = random.Random(20240601)
+
+    for _ in range(2000):
+        message = random_message(rng, words)
+        expected = baseline_scores(FLOWME_64_STATES, message)
+        scores = index.score(message)
+        assert scores == expected, message
+        assert list(scores) == list(expected), message
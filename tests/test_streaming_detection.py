@@ -0,0 +1,54 @@
+"""
+Détection en flux : découpage quelconque du texte, mêmes scores que index.score sur le texte complet
+"""
+
+import random
+
+import pytest
+
+from core.scoring import ScoreVector
+from core.state_index import StateInvertedIndex
+from core.states_table import FLOWME_64_STATES
+from core.streaming_detection import StreamingStateDetector
+from tests.test_state_index import random_message, vocabulary
+
+
+@pytest.fixture(scope="module")
+def index():
+    return StateInvertedIndex(FLOWME_64_STATES, fuzzy=False)
+
+
+def random_document(rng, words):
+    # Plusieurs messages collés, avec les cas de bord du découpage : ponctuation, retours à la ligne, "ß"
+    parts = [random_message(rng, words) for _ in range(rng.randint(1, 6))]
+    extras = ["", "", "straße", "je ne comprend pas.", "comprend\npas", "  "]
+    return rng.choice([" ", "\n", ". ", "  "]).join(parts + [rng.choice(extras)])
+
+
+def random_chunks(rng, text):
+    chunks = []
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, 12)
+        chunks.append(text[position:position + size])
+        position += size
+    return chunks
+
+
+def test_streaming_matches_full_scoring(index):
+    words = vocabulary(FLOWME_64_STATES)
+    rng = random.Random(20240603)
+
+    for _ in range(400):
+        text = random_document(rng, words)
+        expected = ScoreVector.from_scores(index.state_names, index.score(text))
+        # Fenêtre plus large que le document : la fenêtre couvre tout le texte
+        detector = StreamingStateDetector(index, window_words=10_000, segment_words=rng.randint(1, 40))
+        for chunk in random_chunks(rng, text):
+            detector.feed(chunk)
+        segments, summary = detector.finish()
+
+        assert detector.window_vector() == expected, text
+        assert summary["overall_state"] == expected.primary, text
+        assert summary["overall_top_states"] == [{"state": name, "score": score} for name, score in expected.ranked(3)]
+        assert summary["total_words"] == len(text.split()), text